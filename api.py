@@ -0,0 +1,244 @@
+"""
+API local de solo lectura - Los mismos números del dashboard en JSON
+Club Atlético Colón - Para herramientas de rendimiento y scouting
+
+Uso:
+	python api.py [--host 127.0.0.1] [--puerto 8502]
+
+Rutas (GET):
+	/jugadores                  Jugadores con al menos una lesión
+	/kpis?jugador=<nombre>      KPIs del jugador (los valores de las cards mostrar_kpi_*)
+	/evolucion                  Lesiones por mes (calendario completo)
+	/ranking?n=10               Top n de jugadores por cantidad de lesiones
+	/regiones                   Lesiones por región corporal, de mayor a menor
+
+Todas aceptan ?temporada=AAAA&categoria=<clave> para leer una partición del archivo
+histórico (por defecto, la misma que abre el dashboard). Cada respuesta lleva un ETag
+derivado de la versión del dataset: un cliente que repite la consulta con If-None-Match
+recibe 304 sin que se recalcule nada, y las respuestas ya armadas se sirven desde memoria
+hasta que cambia el archivo. Cada pedido se atiende en su propio hilo.
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import traceback
+from collections import OrderedDict
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from config.settings import DATA_PATH, API_HOST, API_PUERTO
+from utils.data_utils import obtener_version_dataset
+from utils.fuente_utils import (
+	listar_jugadores,
+	obtener_kpis_jugador,
+	obtener_conteos_mensuales,
+	obtener_conteos_region,
+	obtener_ranking_jugadores,
+)
+from utils.particiones_utils import listar_particiones, particion_por_defecto
+
+# Respuestas ya serializadas: {(ruta, path, versión, parámetros, hoy): (etag, cuerpo)}
+_respuestas = OrderedDict()
+_lock_respuestas = threading.Lock()
+_MAX_RESPUESTAS = 256
+
+class ErrorApi(Exception):
+	"""Error de la consulta con su código HTTP (se responde como {"error": mensaje})"""
+
+	def __init__(self, estado, mensaje):
+		super().__init__(mensaje)
+		self.estado = estado
+
+# ========= CONSULTAS ==========
+
+def _entero(parametros, nombre, defecto):
+	"""Parámetro entero de la query (400 si no es un número)"""
+	valor = parametros.get(nombre, defecto)
+	try:
+		return int(valor)
+	except (TypeError, ValueError):
+		raise ErrorApi(HTTPStatus.BAD_REQUEST, f"'{nombre}' debe ser un entero")
+
+def resolver_path(parametros):
+	"""
+	CSV a consultar: la partición (temporada, categoría) pedida, o la que abre el
+	dashboard por defecto; DATA_PATH si no hay archivo particionado.
+	"""
+	particiones = listar_particiones()
+	if not particiones:
+		if "temporada" in parametros or "categoria" in parametros:
+			raise ErrorApi(HTTPStatus.NOT_FOUND, "No hay archivo particionado")
+		return DATA_PATH
+
+	temporada, categoria = particion_por_defecto(particiones)
+	clave = (_entero(parametros, "temporada", temporada), parametros.get("categoria", categoria))
+	if clave not in particiones:
+		raise ErrorApi(HTTPStatus.NOT_FOUND, f"No existe la partición temporada={clave[0]} categoria={clave[1]}")
+	return particiones[clave]
+
+def _kpis(path, parametros):
+	"""KPIs del jugador: cantidad_lesiones, dias_lesionado, lesiones_activas y dias_por_evento"""
+	jugador = parametros.get("jugador")
+	if not jugador:
+		raise ErrorApi(HTTPStatus.BAD_REQUEST, "Falta el parámetro 'jugador'")
+	if jugador not in listar_jugadores(path):
+		raise ErrorApi(HTTPStatus.NOT_FOUND, f"Jugador sin lesiones registradas: {jugador}")
+
+	kpis = obtener_kpis_jugador(jugador, path)
+	return {
+		"jugador": jugador,
+		"cantidad_lesiones": kpis["cantidad_lesiones"],
+		"dias_lesionado": kpis["dias_lesionado"],
+		"lesiones_activas": kpis["lesiones_activas"],
+		"dias_por_evento": [int(dias) for dias in kpis["dias_por_evento"]],
+	}
+
+def _evolucion(path, parametros):
+	"""Lesiones por mes, con los meses sin lesiones en cero"""
+	conteos = obtener_conteos_mensuales(path)
+	return [
+		{"mes": mes.strftime("%Y-%m"), "cantidad_lesiones": int(cantidad)}
+		for mes, cantidad in conteos.items()
+	]
+
+def _ranking(path, parametros):
+	"""Top n de jugadores (mismo orden y desempate que el gráfico de ranking)"""
+	n = _entero(parametros, "n", 10)
+	if n < 1:
+		raise ErrorApi(HTTPStatus.BAD_REQUEST, "'n' debe ser mayor que cero")
+	return [
+		{"jugador": jugador, "cantidad_lesiones": int(cantidad)}
+		for jugador, cantidad in obtener_ranking_jugadores(path, n).items()
+	]
+
+def _regiones(path, parametros):
+	"""Lesiones por región corporal, de mayor a menor (como el gráfico por región)"""
+	conteos = obtener_conteos_region(path).sort_values(ascending=False, kind="stable")
+	return [{"region": region, "cantidad_lesiones": int(cantidad)} for region, cantidad in conteos.items()]
+
+# Parámetros de la partición, que leen todas las rutas
+PARAMETROS_PARTICION = ("temporada", "categoria")
+
+# Ruta -> (consulta, parámetros propios que lee, depende de la fecha de hoy: las
+# lesiones activas suman días hasta hoy)
+RUTAS = {
+	"/jugadores": (lambda path, parametros: listar_jugadores(path), (), False),
+	"/kpis": (_kpis, ("jugador",), True),
+	"/evolucion": (_evolucion, (), False),
+	"/ranking": (_ranking, ("n",), False),
+	"/regiones": (_regiones, (), False),
+}
+
+# ========= CACHE DE RESPUESTAS ==========
+
+def parametros_ruta(ruta, parametros):
+	"""Solo los parámetros que lee la ruta: otros (?x=1) no cambian la clave ni el ETag"""
+	_, propios, _ = RUTAS[ruta]
+	return {nombre: valor for nombre, valor in parametros.items() if nombre in PARAMETROS_PARTICION + propios}
+
+def _clave_respuesta(ruta, parametros):
+	"""
+	Clave de la respuesta y su ETag. Solo necesita la versión del dataset (un os.stat por
+	pedido), por lo que un 304 no toca los datos.
+	"""
+	path = resolver_path(parametros)
+	hoy = date.today().isoformat() if RUTAS[ruta][2] else None
+	clave = (ruta, path, obtener_version_dataset(path), tuple(sorted(parametros.items())), hoy)
+	etag = '"' + hashlib.sha1(repr(clave).encode("utf-8")).hexdigest()[:20] + '"'
+	return clave, etag
+
+def obtener_respuesta(ruta, parametros):
+	"""Cuerpo JSON de la consulta: desde memoria si ya se armó para esta versión del dataset"""
+	parametros = parametros_ruta(ruta, parametros)
+	clave, etag = _clave_respuesta(ruta, parametros)
+	with _lock_respuestas:
+		if clave in _respuestas:
+			_respuestas.move_to_end(clave)
+			return etag, _respuestas[clave]
+
+	consulta, _, _ = RUTAS[ruta]
+	cuerpo = json.dumps(consulta(clave[1], parametros), ensure_ascii=False).encode("utf-8")
+
+	with _lock_respuestas:
+		_respuestas[clave] = cuerpo
+		while len(_respuestas) > _MAX_RESPUESTAS:
+			_respuestas.popitem(last=False)
+	return etag, cuerpo
+
+# ========= SERVIDOR ==========
+
+class ManejadorApi(BaseHTTPRequestHandler):
+	"""Atiende los GET de RUTAS; cualquier otro método queda sin implementar"""
+
+	server_version = "LesionesAPI/1.0"
+
+	def _enviar(self, estado, cuerpo=b"", etag=None):
+		self.send_response(estado)
+		if etag:
+			self.send_header("ETag", etag)
+		# El cliente puede guardar la respuesta, pero revalida siempre con el ETag
+		self.send_header("Cache-Control", "no-cache")
+		if cuerpo:
+			self.send_header("Content-Type", "application/json; charset=utf-8")
+		self.send_header("Content-Length", str(len(cuerpo)))
+		self.end_headers()
+		if cuerpo:
+			self.wfile.write(cuerpo)
+
+	def do_GET(self):
+		url = urlsplit(self.path)
+		parametros = {nombre: valores[-1] for nombre, valores in parse_qs(url.query).items()}
+		ruta = url.path.rstrip("/") or "/"
+
+		try:
+			if ruta not in RUTAS:
+				raise ErrorApi(HTTPStatus.NOT_FOUND, f"Ruta desconocida: {ruta} (disponibles: {', '.join(RUTAS)})")
+
+			_, etag = _clave_respuesta(ruta, parametros_ruta(ruta, parametros))
+			if etag in self.headers.get("If-None-Match", ""):
+				self._enviar(HTTPStatus.NOT_MODIFIED, etag=etag)
+				return
+
+			etag, cuerpo = obtener_respuesta(ruta, parametros)
+			self._enviar(HTTPStatus.OK, cuerpo, etag)
+		except ErrorApi as error:
+			self._enviar(error.estado, json.dumps({"error": str(error)}, ensure_ascii=False).encode("utf-8"))
+		except Exception as error:
+			# Dataset faltante o corrupto, error de pandas o de serialización: se registra y
+			# el cliente recibe igual una respuesta HTTP
+			self.log_error("Error interno en %s: %r", self.path, error)
+			traceback.print_exc()
+			self._enviar(
+				HTTPStatus.INTERNAL_SERVER_ERROR,
+				json.dumps({"error": "Error interno del servidor"}, ensure_ascii=False).encode("utf-8"),
+			)
+
+def crear_servidor(host=API_HOST, puerto=API_PUERTO):
+	"""Servidor HTTP con un hilo por pedido (los hilos no bloquean el cierre)"""
+	servidor = ThreadingHTTPServer((host, puerto), ManejadorApi)
+	servidor.daemon_threads = True
+	return servidor
+
+def main(argv=None):
+	"""Punto de entrada de línea de comandos"""
+	parser = argparse.ArgumentParser(description="API local de solo lectura con los KPIs y agregados de lesiones.")
+	parser.add_argument("--host", default=API_HOST, help="Interfaz de escucha (por defecto, solo local)")
+	parser.add_argument("--puerto", type=int, default=API_PUERTO, help="Puerto HTTP")
+	args = parser.parse_args(argv)
+
+	servidor = crear_servidor(args.host, args.puerto)
+	print(f"✅ API de lesiones en http://{args.host}:{args.puerto} ({', '.join(RUTAS)})")
+	try:
+		servidor.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		servidor.server_close()
+
+
+if __name__ == "__main__":
+	main()
@@ -3,13 +3,22 @@ Aplicación principal - Reporte de lesiones - Atlético Colón
 Club Atlético Colón - Base limpia para desarrollo
 """
 
+from datetime import date
+
 import streamlit as st
-from utils.ui_utils import aplicar_estilos_css, crear_header_principal, crear_footer, configurar_tema_oscuro
-from components.filters_ui import mostrar_filtros_principales
+from utils.ui_utils import crear_header_principal, crear_separador, crear_footer, configurar_tema_oscuro
+from components.filters_ui import mostrar_selector_particion, mostrar_filtros_principales
 from modules.kpi_cards import mostrar_kpi_cantidad_lesiones, mostrar_kpi_dias_lesionado, mostrar_kpi_dias_lesion_seleccionada, mostrar_kpi_lesiones_activas
-from modules.grafico_evolutivo import mostrar_grafico_evolutivo
-from modules.grafico_ranking_lesionados import mostrar_grafico_ranking_lesionados
-from modules.grafico_region_lesiones import mostrar_grafico_region_lesiones
+from modules.grafico_evolutivo import construir_figura_evolutivo, mostrar_grafico_evolutivo
+from modules.grafico_disponibilidad import construir_figura_disponibilidad, mostrar_grafico_disponibilidad
+from modules.grafico_carga import construir_figura_carga, construir_figura_franja_jugador, mostrar_grafico_carga, mostrar_franja_carga_jugador
+from modules.grafico_ranking_lesionados import construir_figura_ranking_lesionados, leer_filtros_ranking, mostrar_grafico_ranking_lesionados
+from modules.grafico_region_lesiones import construir_figura_region_lesiones, mostrar_grafico_region_lesiones
+from modules.plantel_disponible import mostrar_plantel_disponible
+from utils.fuente_utils import listar_jugadores, obtener_kpis_jugador
+from utils.intervalos_utils import obtener_indice_intervalos
+from utils.profiling_utils import iniciar_perfil, medir, finalizar_perfil, mostrar_perfil_sidebar
+from utils.render_utils import lanzar_calculos, crear_hueco, mostrar_al_completar
 
 # ========= CONFIGURACIÓN DE PÁGINA ==========
 st.set_page_config(
@@ -19,74 +28,57 @@ st.set_page_config(
 	initial_sidebar_state="expanded"
 )
 
-def main():
-	"""Función principal de la aplicación - Base limpia"""
-	
-	# Header principal - Lo más arriba posible para ganar espacio
-	crear_header_principal()
-	
-	# Configurar tema oscuro
-	configurar_tema_oscuro()
-	aplicar_estilos_css()
-	
-	# ===== GRÁFICO EVOLUTIVO (PRIMERO) =====
-	# Separador visual para el gráfico evolutivo
-	st.markdown(
-		"""
-		<p style='
-			color:#9ca3af;
-			font-size:13px;
-			text-transform:uppercase;
-			letter-spacing:1px;
-			margin-top:10px;
-			margin-bottom:4px;
-			text-align:left;
-		'>
-			Análisis temporal
-		</p>
-		<hr style='
-			border:none;
-			height:2px;
-			background:linear-gradient(to right, #dc2626, #1f2937);
-			margin:8px 0 25px 0;
-			border-radius:2px;
-		'>
-		""",
-		unsafe_allow_html=True
-	)
-	
-	# Gráfico evolutivo de lesiones (sin depender de filtros)
-	mostrar_grafico_evolutivo()
+@st.fragment
+def mostrar_seccion_evolutivo(path):
+	"""
+	Gráfico evolutivo como fragmento: cambiar la resolución (día, semana, mes,
+	temporada) solo re-ejecuta este gráfico.
+	"""
+	perfil = iniciar_perfil("seccion_evolutivo", anidar=True)
+	with medir(perfil, "mostrar_grafico_evolutivo"):
+		mostrar_grafico_evolutivo(path)
+	finalizar_perfil(perfil, "seccion_evolutivo")
+
+@st.fragment
+def mostrar_seccion_disponibilidad(path):
+	"""
+	Línea de tiempo de indisponibilidad como fragmento: alternar el desglose por
+	región solo re-ejecuta este gráfico.
+	"""
+	perfil = iniciar_perfil("seccion_disponibilidad", anidar=True)
+	with medir(perfil, "mostrar_grafico_disponibilidad"):
+		mostrar_grafico_disponibilidad(path)
+	finalizar_perfil(perfil, "seccion_disponibilidad")
+
+@st.fragment
+def mostrar_seccion_ranking(path):
+	"""
+	Ranking de jugadores como fragmento: cambiar la métrica, el N o los filtros de
+	región, tipo y fechas solo re-ejecuta este gráfico.
+	"""
+	perfil = iniciar_perfil("seccion_ranking", anidar=True)
+	with medir(perfil, "mostrar_grafico_ranking_lesionados"):
+		mostrar_grafico_ranking_lesionados(path)
+	finalizar_perfil(perfil, "seccion_ranking")
+
+@st.fragment
+def mostrar_seccion_jugador(path):
+	"""
+	Filtros principales y KPIs del jugador (de la partición `path`) como fragmento independiente.
+	Cambiar el jugador o el evento re-ejecuta solo este bloque: el header y los
+	gráficos generales no se recalculan ni se reenvían al navegador.
+	"""
+	# Profiling: dentro de un rerun completo se anida en el perfil de main()
+	perfil = iniciar_perfil("seccion_jugador", anidar=True)
 	
 	# ===== FILTROS (DESPUÉS DEL GRÁFICO) =====
 	# Mostrar filtros principales (jugador, evento de lesión y tipo informativo)
-	selected_player, selected_event, tipo_lesion, fecha_inicio, fecha_fin = mostrar_filtros_principales()
+	with medir(perfil, "mostrar_filtros_principales"):
+		selected_player, selected_event, tipo_lesion, fecha_inicio, fecha_fin = mostrar_filtros_principales(path)
 	
 	# ===== INDICADORES DEL JUGADOR =====
 	# Separador visual entre filtros y KPIs
-	st.markdown(
-		"""
-		<p style='
-			color:#9ca3af;
-			font-size:13px;
-			text-transform:uppercase;
-			letter-spacing:1px;
-			margin-top:30px;
-			margin-bottom:4px;
-			text-align:left;
-		'>
-			Indicadores del jugador
-		</p>
-		<hr style='
-			border:none;
-			height:2px;
-			background:linear-gradient(to right, #dc2626, #1f2937);
-			margin:8px 0 25px 0;
-			border-radius:2px;
-		'>
-		""",
-		unsafe_allow_html=True
-	)
+	crear_separador("Indicadores del jugador", margen_superior=30)
 	
 	# Mostrar nombre del jugador seleccionado centrado y más grande
 	if selected_player:
@@ -98,62 +90,139 @@ def main():
 	# Primera fila de KPIs (2 columnas)
 	col1, col2 = st.columns(2)
 	
-	with col1:
-		mostrar_kpi_cantidad_lesiones(selected_player)
+	with col1, medir(perfil, "mostrar_kpi_cantidad_lesiones"):
+		mostrar_kpi_cantidad_lesiones(selected_player, path)
 	
-	with col2:
-		mostrar_kpi_dias_lesionado(selected_player)
+	with col2, medir(perfil, "mostrar_kpi_dias_lesionado"):
+		mostrar_kpi_dias_lesionado(selected_player, path)
 	
 	# Segunda fila de KPIs (2 columnas)
 	col3, col4 = st.columns(2)
 	
-	with col3:
-		mostrar_kpi_dias_lesion_seleccionada(selected_player, selected_event)
-	
-	with col4:
-		mostrar_kpi_lesiones_activas(selected_player)
-	
-	# ===== GRÁFICOS COMPARATIVOS =====
-	# Separador visual para gráficos comparativos
-	st.markdown(
-		"""
-		<p style='
-			color:#9ca3af;
-			font-size:13px;
-			text-transform:uppercase;
-			letter-spacing:1px;
-			margin-top:40px;
-			margin-bottom:4px;
-			text-align:left;
-		'>
-			Comparativa general de lesiones
-		</p>
-		<hr style='
-			border:none;
-			height:2px;
-			background:linear-gradient(to right, #dc2626, #1f2937);
-			margin:8px 0 25px 0;
-			border-radius:2px;
-		'>
-		""",
-		unsafe_allow_html=True
+	with col3, medir(perfil, "mostrar_kpi_dias_lesion_seleccionada"):
+		mostrar_kpi_dias_lesion_seleccionada(selected_player, selected_event, path)
+	
+	with col4, medir(perfil, "mostrar_kpi_lesiones_activas"):
+		mostrar_kpi_lesiones_activas(selected_player, path)
+	
+	# Franja de carga: días perdidos por mes del jugador
+	with medir(perfil, "mostrar_franja_carga_jugador"):
+		mostrar_franja_carga_jugador(selected_player, path)
+	
+	# En un rerun parcial del fragmento el perfil es propio: se cierra y se registra
+	finalizar_perfil(perfil, "seccion_jugador")
+
+@st.fragment
+def mostrar_seccion_plantel(path):
+	"""
+	Plantel disponible en fecha como fragmento independiente: cambiar la fecha o el
+	rango solo re-ejecuta esta vista.
+	"""
+	perfil = iniciar_perfil("seccion_plantel", anidar=True)
+	
+	# Separador visual de la vista de plantel
+	crear_separador("Plantel disponible en fecha")
+	
+	with medir(perfil, "mostrar_plantel_disponible"):
+		mostrar_plantel_disponible(path)
+	
+	finalizar_perfil(perfil, "seccion_plantel")
+
+def _precalcular_jugador(jugador, path, hoy):
+	"""
+	KPIs y franja de carga del jugador que va a mostrar el selector (el de la sesión, o
+	el primero de la lista en la primera visita). Corre en un hilo del render progresivo.
+	"""
+	jugador = jugador or next(iter(listar_jugadores(path)), None)
+	if jugador:
+		obtener_kpis_jugador(jugador, path)
+		construir_figura_franja_jugador(path, jugador, hoy)
+
+def main():
+	"""Función principal de la aplicación - Base limpia"""
+	
+	# Profiling opcional por sección (LESIONES_PROFILING o ?profiling=1)
+	perfil = iniciar_perfil("main")
+	
+	# Header principal - Lo más arriba posible para ganar espacio
+	with medir(perfil, "crear_header_principal"):
+		crear_header_principal()
+	
+	# Configurar tema oscuro (los estilos CSS llegan con el header, como hoja estática)
+	with medir(perfil, "estilos"):
+		configurar_tema_oscuro()
+	
+	# Temporada y categoría (sidebar): todo el dashboard lee solo esa partición
+	with medir(perfil, "mostrar_selector_particion"):
+		path = mostrar_selector_particion()
+	
+	# ===== CÁLCULOS EN PARALELO =====
+	# Carga del dataset y, detrás de ella, cada figura/KPI independiente en un pool de hilos.
+	# Los argumentos son los mismos con que los mostrar_* consultan sus caches.
+	hoy = date.today()
+	jugador = st.session_state.get("filtro_jugador")
+	futuros = lanzar_calculos(
+		(listar_jugadores, (path,)),
+		{
+			"evolutivo": (construir_figura_evolutivo, (path, st.session_state.get("evolutivo_resolucion", "mes"))),
+			"disponibilidad": (construir_figura_disponibilidad, (path, st.session_state.get("disponibilidad_por_region", False), hoy)),
+			"carga": (construir_figura_carga, (path, hoy)),
+			"jugador": (_precalcular_jugador, (jugador, path, hoy)),
+			"plantel": (obtener_indice_intervalos, (path,)),
+			"ranking": (construir_figura_ranking_lesionados, (path, *leer_filtros_ranking())),
+			"region": (construir_figura_region_lesiones, (path,)),
+		},
+		perfil,
 	)
 	
-	# Gráficos en dos columnas
-	col1, col2 = st.columns(2)
+	# ===== LAYOUT CON HUECOS =====
+	# Cada sección ocupa su lugar ya mismo y se dibuja cuando terminan sus cálculos
+	crear_separador("Análisis temporal", margen_superior=10)
 	
-	with col1:
-		mostrar_grafico_ranking_lesionados()
+	# Gráfico evolutivo (día, semana, mes o temporada) y, a su lado, la indisponibilidad diaria del plantel
+	col_evolutivo, col_disponibilidad = st.columns(2)
+	with col_evolutivo:
+		hueco_evolutivo = crear_hueco(500)
+	with col_disponibilidad:
+		hueco_disponibilidad = crear_hueco(500)
 	
-	with col2:
-		mostrar_grafico_region_lesiones()
+	# Carga lesional: días perdidos por mes, repartidos entre los meses que abarca cada lesión
+	hueco_carga = crear_hueco()
 	
-	# Sidebar vacío
-	with st.sidebar:
-		pass
+	# Filtros e indicadores del jugador, y plantel disponible en fecha (fragmentos)
+	hueco_jugador = crear_hueco(600)
+	hueco_plantel = crear_hueco(300)
+	
+	# Gráficos comparativos en dos columnas
+	crear_separador("Comparativa general de lesiones")
+	col1, col2 = st.columns(2)
+	with col1:
+		hueco_ranking = crear_hueco(620)
+	with col2:
+		hueco_region = crear_hueco(500)
 	
 	# Footer
-	crear_footer()
+	with medir(perfil, "crear_footer"):
+		crear_footer()
+	
+	# ===== RENDER PROGRESIVO =====
+	# Al cambiar un control de una sección solo se re-ejecuta su fragmento
+	mostrar_al_completar(
+		[
+			("seccion_evolutivo", hueco_evolutivo, ["evolutivo"], lambda: mostrar_seccion_evolutivo(path)),
+			("seccion_disponibilidad", hueco_disponibilidad, ["disponibilidad"], lambda: mostrar_seccion_disponibilidad(path)),
+			("mostrar_grafico_carga", hueco_carga, ["carga"], lambda: mostrar_grafico_carga(path)),
+			("seccion_jugador", hueco_jugador, ["jugador"], lambda: mostrar_seccion_jugador(path)),
+			("seccion_plantel", hueco_plantel, ["plantel"], lambda: mostrar_seccion_plantel(path)),
+			("seccion_ranking", hueco_ranking, ["ranking"], lambda: mostrar_seccion_ranking(path)),
+			("mostrar_grafico_region_lesiones", hueco_region, ["region"], lambda: mostrar_grafico_region_lesiones(path)),
+		],
+		futuros,
+		perfil,
+	)
+	
+	# Sidebar: desglose de tiempos del modo profiling (debajo del selector de partición)
+	mostrar_perfil_sidebar(finalizar_perfil(perfil, "main"))
 
 if __name__ == "__main__":
 	main()
@@ -0,0 +1,134 @@
+"""
+Benchmark de arranque en frío del dashboard (presupuesto de cold start)
+
+Uso:
+	python -m benchmarks.arranque [--data lesiones_clean.csv] [--repeticiones 3]
+	                              [--presupuesto-ms 4000] [--salida arranque.json]
+
+Cada repetición lanza un proceso limpio (como tras un deploy o un scale-up) que mide:
+- importacion_ms: import de app.py (Streamlit, pandas y los módulos del dashboard)
+- primer_render_ms: primera ejecución completa de la página con AppTest (dataset,
+  figuras y caches vacíos)
+- total_ms: ambos sumados
+- modulos_mas_pesados: los imports de mayor tiempo propio (python -X importtime)
+Se informa la mediana de las repeticiones. Con --presupuesto-ms el comando termina
+con código 1 si la mediana de total_ms lo supera, para usarlo como control en CI.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from config.settings import BASE_DIR, DATA_PATH
+
+# Cantidad de módulos más pesados que se informan por repetición
+_MODULOS_INFORMADOS = 10
+
+def medir_arranque():
+	"""
+	Mide import y primer render en el proceso actual, que debe estar recién iniciado
+	(sin app.py ni sus dependencias importadas todavía).
+	"""
+	inicio = time.perf_counter()
+	importlib.import_module("app")
+	importacion = time.perf_counter() - inicio
+
+	from streamlit.testing.v1 import AppTest
+
+	pagina = AppTest.from_file(os.path.join(BASE_DIR, "app.py"), default_timeout=600)
+	inicio = time.perf_counter()
+	pagina.run()
+	primer_render = time.perf_counter() - inicio
+	if pagina.exception:
+		raise RuntimeError(f"app.py: {pagina.exception[0].message}")
+
+	return {
+		"importacion_ms": round(importacion * 1000, 2),
+		"primer_render_ms": round(primer_render * 1000, 2),
+		"total_ms": round((importacion + primer_render) * 1000, 2),
+	}
+
+def _modulos_mas_pesados(traza):
+	"""Módulos de mayor tiempo propio según la salida de python -X importtime"""
+	modulos = []
+	for linea in traza.splitlines():
+		if not linea.startswith("import time:") or "self [us]" in linea:
+			continue
+		propio, _, nombre = linea[len("import time:"):].split("|")
+		modulos.append({"modulo": nombre.strip(), "ms": round(int(propio) / 1000, 2)})
+	return sorted(modulos, key=lambda modulo: modulo["ms"], reverse=True)[:_MODULOS_INFORMADOS]
+
+def _medir_en_proceso_limpio(path):
+	"""Lanza un proceso nuevo (con -X importtime) apuntando el dashboard a `path`"""
+	entorno = dict(os.environ, LESIONES_DATA_PATH=path, PYTHONPATH=BASE_DIR)
+	comando = [sys.executable, "-X", "importtime", "-m", "benchmarks.arranque", "--medir"]
+	salida = subprocess.run(comando, cwd=BASE_DIR, env=entorno, capture_output=True, text=True, check=True)
+	medicion = json.loads(salida.stdout.strip().splitlines()[-1])
+	medicion["modulos_mas_pesados"] = _modulos_mas_pesados(salida.stderr)
+	return medicion
+
+def correr_arranque(path=DATA_PATH, repeticiones=3):
+	"""Mide el arranque en `repeticiones` procesos limpios; devuelve el reporte como diccionario"""
+	mediciones = []
+	for repeticion in range(repeticiones):
+		medicion = _medir_en_proceso_limpio(path)
+		mediciones.append(medicion)
+		print(
+			f"#{repeticion + 1}  import {medicion['importacion_ms']:>8.1f} ms"
+			f"  primer render {medicion['primer_render_ms']:>8.1f} ms"
+			f"  total {medicion['total_ms']:>8.1f} ms",
+			file=sys.stderr,
+		)
+
+	return {
+		"generado": datetime.now().isoformat(timespec="seconds"),
+		"python": platform.python_version(),
+		"plataforma": platform.platform(),
+		"data": path,
+		"mediana": {
+			clave: round(statistics.median(medicion[clave] for medicion in mediciones), 2)
+			for clave in ("importacion_ms", "primer_render_ms", "total_ms")
+		},
+		"repeticiones": mediciones,
+	}
+
+def main(argv=None):
+	"""Punto de entrada de línea de comandos"""
+	parser = argparse.ArgumentParser(description="Benchmark de arranque en frío del dashboard de lesiones.")
+	parser.add_argument("--data", default=DATA_PATH, help="CSV de lesiones que abre el dashboard")
+	parser.add_argument("--repeticiones", type=int, default=3, help="Procesos limpios a medir")
+	parser.add_argument("--presupuesto-ms", type=float, help="Máximo admitido para la mediana de total_ms")
+	parser.add_argument("--salida", help="Archivo JSON de salida (por defecto, stdout)")
+	parser.add_argument("--medir", action="store_true", help=argparse.SUPPRESS)
+	args = parser.parse_args(argv)
+
+	if args.medir:
+		# Proceso hijo: un único arranque en frío
+		print(json.dumps(medir_arranque()))
+		return
+
+	reporte = correr_arranque(args.data, args.repeticiones)
+	texto = json.dumps(reporte, indent=2, ensure_ascii=False)
+	if args.salida:
+		with open(args.salida, "w", encoding="utf-8") as archivo:
+			archivo.write(texto)
+	else:
+		print(texto)
+
+	if args.presupuesto_ms is not None and reporte["mediana"]["total_ms"] > args.presupuesto_ms:
+		print(
+			f"⚠️ Arranque fuera de presupuesto: {reporte['mediana']['total_ms']:.0f} ms > {args.presupuesto_ms:.0f} ms",
+			file=sys.stderr,
+		)
+		sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
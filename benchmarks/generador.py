@@ -0,0 +1,84 @@
+"""
+Generador de datasets sintéticos con el mismo esquema que lesiones_clean.csv
+
+Las combinaciones (tipo_de_lesion, region, diagnostico, lateralidad) se muestrean de la
+distribución conjunta del dataset real, las fechas cubren varias temporadas y solo las
+lesiones recientes pueden quedar abiertas (sin fecha_de_alta), como en la planilla.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_DIR, CATEGORIAS
+
+MUESTRA_PATH = os.path.join(DATA_DIR, "lesiones_clean.csv")
+COLUMNAS = [
+	"jugador", "fecha", "fecha_de_alta", "tipo_de_lesion", "region",
+	"diagnostico", "lateralidad", "dias_fuera", "jugador_original",
+]
+
+def generar_dataset(n_filas, n_jugadores=10_000, temporadas=10, hoy=None, semilla=0, muestra_path=MUESTRA_PATH):
+	"""
+	Genera un DataFrame de `n_filas` lesiones repartidas entre hasta `n_jugadores`
+	jugadores a lo largo de `temporadas` años hasta `hoy`.
+	"""
+	rng = np.random.default_rng(semilla)
+	hoy = pd.Timestamp(hoy or pd.Timestamp.today()).normalize()
+	n_jugadores = max(1, min(n_jugadores, n_filas))
+
+	# Perfiles de lesión reales (distribución conjunta, sin filas vacías)
+	muestra = pd.read_csv(muestra_path).dropna(subset=["tipo_de_lesion", "region"])
+	perfiles = muestra[["tipo_de_lesion", "region", "diagnostico", "lateralidad"]].reset_index(drop=True)
+	elegidos = perfiles.iloc[rng.integers(0, len(perfiles), n_filas)].reset_index(drop=True)
+
+	# Jugadores con frecuencia de lesión desigual (unos pocos se lesionan mucho más)
+	nombres = np.array([f"Jugador {i:05d}" for i in range(n_jugadores)], dtype=object)
+	pesos = rng.pareto(2.0, n_jugadores) + 1
+	jugadores = nombres[rng.choice(n_jugadores, n_filas, p=pesos / pesos.sum())]
+
+	# Fechas a lo largo de las temporadas y duraciones con cola larga (mediana ~10 días)
+	dias_archivo = 365 * temporadas
+	fecha = hoy - pd.to_timedelta(rng.integers(0, dias_archivo, n_filas), unit="D")
+	duracion = np.clip(np.rint(rng.lognormal(2.3, 1.0, n_filas)), 1, 400).astype("int64")
+	alta = fecha + pd.to_timedelta(duracion, unit="D")
+
+	# Lesiones que seguirían abiertas hoy: la mitad aún sin alta cargada
+	abierta = (alta > hoy) & (rng.random(n_filas) < 0.5)
+	alta = pd.Series(alta).mask(abierta)
+	alta = alta.mask(alta > hoy, hoy)
+
+	df = pd.DataFrame({
+		"jugador": jugadores,
+		"fecha": fecha,
+		"fecha_de_alta": alta.to_numpy(),
+		"tipo_de_lesion": elegidos["tipo_de_lesion"],
+		"region": elegidos["region"],
+		"diagnostico": elegidos["diagnostico"],
+		"lateralidad": elegidos["lateralidad"],
+	})
+	df["dias_fuera"] = (df["fecha_de_alta"].fillna(hoy) - df["fecha"]).dt.days.astype("float64")
+	df["jugador_original"] = df["jugador"].str.upper()
+	return df[COLUMNAS]
+
+def escribir_dataset(path, n_filas, **kwargs):
+	"""Genera el dataset y lo guarda como CSV en `path` (mismo formato que lesiones_clean.csv)"""
+	df = generar_dataset(n_filas, **kwargs)
+	df.to_csv(path, index=False, date_format="%Y-%m-%d")
+	return df
+
+def escribir_archivo_particionado(base, n_filas, temporadas=10, categorias=None, **kwargs):
+	"""
+	Genera un archivo histórico particionado por temporada y categoría en `base`:
+	`n_filas` lesiones por categoría repartidas en `temporadas` años.
+	Devuelve {(temporada, categoría): ruta} de las particiones escritas.
+	"""
+	from etl.pipeline import exportar_particiones
+
+	rutas = {}
+	for semilla, categoria in enumerate(categorias or list(CATEGORIAS)):
+		df = generar_dataset(n_filas, temporadas=temporadas, semilla=semilla, **kwargs)
+		for temporada, ruta in exportar_particiones(df, categoria, base).items():
+			rutas[(temporada, categoria)] = ruta
+	return rutas
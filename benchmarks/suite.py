@@ -0,0 +1,169 @@
+"""
+Suite de benchmarks del dashboard sobre datasets sintéticos
+
+Uso:
+	python -m benchmarks.suite [--filas 1000 100000 1000000] [--jugadores 10000] [--salida resultados.json]
+
+Para cada tamaño de dataset y cada función del dashboard se lanza un proceso limpio
+que ejecuta la función de forma headless con AppTest de Streamlit y mide:
+- latencia_fria_ms: primera ejecución (incluye carga del dataset y caches vacíos)
+- latencia_caliente_ms: mediana de las ejecuciones siguientes (reruns con caches)
+- memoria_pico_mb: aumento del pico de memoria residente del proceso
+El resultado se emite como JSON para comparar corridas y detectar regresiones.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from config.settings import BASE_DIR
+
+# Funciones medidas: nombre -> (módulo, función, argumentos que necesita)
+FUNCIONES = {
+	"mostrar_filtros_principales": ("components.filters_ui", "mostrar_filtros_principales", ()),
+	"mostrar_kpi_cantidad_lesiones": ("modules.kpi_cards", "mostrar_kpi_cantidad_lesiones", ("jugador",)),
+	"mostrar_kpi_dias_lesionado": ("modules.kpi_cards", "mostrar_kpi_dias_lesionado", ("jugador",)),
+	"mostrar_kpi_dias_lesion_seleccionada": ("modules.kpi_cards", "mostrar_kpi_dias_lesion_seleccionada", ("jugador", "evento")),
+	"mostrar_kpi_lesiones_activas": ("modules.kpi_cards", "mostrar_kpi_lesiones_activas", ("jugador",)),
+	"mostrar_grafico_evolutivo": ("modules.grafico_evolutivo", "mostrar_grafico_evolutivo", ()),
+	"mostrar_grafico_ranking_lesionados": ("modules.grafico_ranking_lesionados", "mostrar_grafico_ranking_lesionados", ()),
+	"mostrar_grafico_region_lesiones": ("modules.grafico_region_lesiones", "mostrar_grafico_region_lesiones", ()),
+}
+
+def _script_benchmark(modulo, funcion, argumentos):
+	"""Script mínimo que AppTest ejecuta: importa y llama a la función medida"""
+	import importlib
+	getattr(importlib.import_module(modulo), funcion)(*argumentos)
+
+def _pico_memoria_mb():
+	"""Pico de memoria residente del proceso en MB (None si la plataforma no lo expone)"""
+	try:
+		import resource
+	except ImportError:
+		return None
+	pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return pico / 1024 if sys.platform != "darwin" else pico / (1024 * 1024)
+
+def medir_funcion(nombre, valores, repeticiones=5, timeout=600):
+	"""
+	Mide una función del dashboard en el proceso actual (que debe estar recién iniciado
+	para que la primera ejecución sea realmente en frío).
+	`valores` resuelve los argumentos de la función ({"jugador": ..., "evento": ...}).
+	"""
+	from streamlit.testing.v1 import AppTest
+
+	modulo, funcion, parametros = FUNCIONES[nombre]
+	argumentos = tuple(valores[parametro] for parametro in parametros)
+	app = AppTest.from_function(_script_benchmark, args=(modulo, funcion, argumentos), default_timeout=timeout)
+
+	memoria_inicial = _pico_memoria_mb()
+	inicio = time.perf_counter()
+	app.run()
+	latencia_fria = time.perf_counter() - inicio
+	if app.exception:
+		raise RuntimeError(f"{nombre}: {app.exception[0].message}")
+
+	latencias = []
+	for _ in range(repeticiones):
+		inicio = time.perf_counter()
+		app.run()
+		latencias.append(time.perf_counter() - inicio)
+
+	memoria_final = _pico_memoria_mb()
+	return {
+		"funcion": nombre,
+		"latencia_fria_ms": round(latencia_fria * 1000, 2),
+		"latencia_caliente_ms": round(statistics.median(latencias) * 1000, 2),
+		"memoria_pico_mb": round(memoria_final - memoria_inicial, 1) if memoria_final is not None else None,
+	}
+
+def _argumentos_dataset(path):
+	"""Jugador con más lesiones y su evento más reciente, para las funciones que los necesitan"""
+	from utils.data_utils import obtener_indice_jugadores
+
+	df, indice = obtener_indice_jugadores(path)
+	jugador = max(indice, key=lambda nombre: indice[nombre][1] - indice[nombre][0])
+	# El evento se identifica por su id_evento (huella de la fila), no por su posición
+	evento = int(df["id_evento"].iat[indice[jugador][1] - 1])
+	return {"jugador": jugador, "evento": evento, "jugadores": len(indice)}
+
+def _medir_en_proceso_limpio(path, nombre, valores, repeticiones):
+	"""Lanza un proceso nuevo apuntando el dashboard al dataset sintético"""
+	entorno = dict(os.environ, LESIONES_DATA_PATH=path, PYTHONPATH=BASE_DIR)
+	comando = [
+		sys.executable, "-m", "benchmarks.suite", "--medir", nombre,
+		"--valores", json.dumps(valores), "--repeticiones", str(repeticiones),
+	]
+	salida = subprocess.run(comando, cwd=BASE_DIR, env=entorno, capture_output=True, text=True)
+	if salida.returncode != 0:
+		raise RuntimeError(f"{nombre}: el proceso de medición terminó con código {salida.returncode}\n{salida.stderr.strip()}")
+	return json.loads(salida.stdout.strip().splitlines()[-1])
+
+def correr_suite(tamanos, n_jugadores=10_000, repeticiones=5, funciones=None, directorio=None):
+	"""Genera los datasets y mide cada función; devuelve el reporte como diccionario"""
+	from benchmarks.generador import escribir_dataset
+
+	funciones = funciones or list(FUNCIONES)
+	directorio = directorio or tempfile.mkdtemp(prefix="bench_lesiones_")
+	os.makedirs(directorio, exist_ok=True)
+	resultados = []
+
+	for n_filas in tamanos:
+		path = os.path.join(directorio, f"lesiones_{n_filas}.csv")
+		if not os.path.exists(path):
+			escribir_dataset(path, n_filas, n_jugadores=n_jugadores)
+		valores = _argumentos_dataset(path)
+
+		for nombre in funciones:
+			medicion = _medir_en_proceso_limpio(path, nombre, valores, repeticiones)
+			medicion.update({"filas": n_filas, "jugadores": valores["jugadores"]})
+			resultados.append(medicion)
+			print(
+				f"{n_filas:>9} filas  {nombre:<38} frío {medicion['latencia_fria_ms']:>10.1f} ms"
+				f"  caliente {medicion['latencia_caliente_ms']:>8.1f} ms",
+				file=sys.stderr,
+			)
+
+	return {
+		"generado": datetime.now().isoformat(timespec="seconds"),
+		"python": platform.python_version(),
+		"plataforma": platform.platform(),
+		"resultados": resultados,
+	}
+
+def main(argv=None):
+	"""Punto de entrada de línea de comandos"""
+	parser = argparse.ArgumentParser(description="Benchmarks del dashboard de lesiones sobre datos sintéticos.")
+	parser.add_argument("--filas", type=int, nargs="+", default=[1_000, 100_000, 1_000_000], help="Tamaños de dataset")
+	parser.add_argument("--jugadores", type=int, default=10_000, help="Cantidad máxima de jugadores")
+	parser.add_argument("--repeticiones", type=int, default=5, help="Reruns en caliente por función")
+	parser.add_argument("--funciones", nargs="+", choices=list(FUNCIONES), help="Subconjunto de funciones a medir")
+	parser.add_argument("--directorio", help="Directorio donde generar (y reutilizar) los datasets")
+	parser.add_argument("--salida", help="Archivo JSON de salida (por defecto, stdout)")
+	parser.add_argument("--medir", help=argparse.SUPPRESS)
+	parser.add_argument("--valores", help=argparse.SUPPRESS)
+	args = parser.parse_args(argv)
+
+	if args.medir:
+		# Proceso hijo: una sola función, en frío
+		print(json.dumps(medir_funcion(args.medir, json.loads(args.valores), args.repeticiones)))
+		return
+
+	reporte = correr_suite(args.filas, args.jugadores, args.repeticiones, args.funciones, args.directorio)
+	texto = json.dumps(reporte, indent=2, ensure_ascii=False)
+	if args.salida:
+		with open(args.salida, "w", encoding="utf-8") as archivo:
+			archivo.write(texto)
+	else:
+		print(texto)
+
+
+if __name__ == "__main__":
+	main()
@@ -2,44 +2,54 @@
 
 import streamlit as st
 import pandas as pd
+from config.settings import DATA_PATH, CATEGORIAS
+from utils.fuente_utils import listar_jugadores, obtener_lesiones_jugador, obtener_evento, obtener_etiqueta_evento
+from utils.particiones_utils import listar_particiones, particion_por_defecto
 
-# 🔹 Ruta al dataset limpio
-DATA_PATH = "data/lesiones_clean.csv"
+def mostrar_selector_particion():
+    """
+    Muestra en el sidebar el selector de temporada y categoría del archivo particionado.
+    Retorna la ruta de la partición elegida (solo esa se lee), o DATA_PATH si no hay
+    particiones y el dashboard trabaja con el dataset plano.
+    """
+    particiones = listar_particiones()
+    if not particiones:
+        return DATA_PATH
+
+    temporada_defecto, categoria_defecto = particion_por_defecto(particiones)
+    temporadas = list(dict.fromkeys(temporada for temporada, _ in particiones))
+
+    with st.sidebar:
+        temporada = st.selectbox(
+            "Temporada",
+            temporadas,
+            index=temporadas.index(temporada_defecto),
+            key="filtro_temporada",
+            help="Temporada del archivo histórico a analizar."
+        )
+
+        categorias = [categoria for (anio, categoria) in particiones if anio == temporada]
+        categoria = st.selectbox(
+            "Categoría",
+            categorias,
+            index=categorias.index(categoria_defecto) if categoria_defecto in categorias else 0,
+            format_func=lambda clave: CATEGORIAS.get(clave, clave.title()),
+            key="filtro_categoria",
+            help="Categoría del plantel (primera, reserva, inferiores)."
+        )
+
+    return particiones[(temporada, categoria)]
 
-def mostrar_filtros_principales():
+def mostrar_filtros_principales(path=DATA_PATH):
     """
     Muestra los filtros principales: Jugador, evento de lesión y tipo informativo.
-    Retorna el jugador, evento seleccionados, tipo extraído y fechas de la lesión.
+    Retorna el jugador, el id del evento seleccionado, tipo extraído y fechas de la lesión.
     """
     
-    # CSS para personalizar el tamaño de los títulos de los filtros
-    st.markdown(
-        """
-        <style>
-        /* Títulos de los filtros más grandes */
-        .stSelectbox > label, .stTextInput > label {
-            font-size: 32px !important;
-            font-weight: 900 !important;
-            color: #fafafa !important;
-            margin-bottom: 18px !important;
-            text-transform: uppercase !important;
-            letter-spacing: 1px !important;
-        }
-        
-        /* Espaciado mejorado para los filtros */
-        .stSelectbox, .stTextInput {
-            margin-bottom: 15px !important;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
-    
-    # Leer el dataset con fechas parseadas
-    df = pd.read_csv(DATA_PATH, parse_dates=["fecha", "fecha_de_alta"])
+    # Estilos de los filtros: en static/estilos.css (cargada una vez con el header)
     
-    # Obtener lista de jugadores únicos
-    jugadores = sorted(df["jugador"].dropna().unique())
+    # Lista ordenada de jugadores (índice construido una vez por versión del dataset)
+    jugadores = listar_jugadores(path)
     
     # Crear una fila de columnas para los filtros
     col1, col2, col3, col4, col5 = st.columns([1.2, 2.0, 1.1, 0.85, 0.85])
@@ -52,35 +62,27 @@ def mostrar_filtros_principales():
             help="Selecciona un jugador para visualizar sus lesiones."
         )
     
-    # 🔹 Filtrar por jugador seleccionado
-    df_eventos = df[df["jugador"] == selected_player].copy()
-
-    # 🔹 Crear columna combinada para mostrar los eventos de forma descriptiva
-    df_eventos["evento_lesion"] = (
-        df_eventos["fecha"].dt.strftime("%Y-%m-%d") + " — " +
-        df_eventos["tipo_de_lesion"].astype(str) + " (" + df_eventos["region"].astype(str) + ")"
-    )
-
-    # 🔹 Ordenar los eventos de más reciente a más antiguo
-    df_eventos = df_eventos.sort_values("fecha", ascending=False)
-
-    # 🔹 Eliminar duplicados manteniendo el orden actual
-    df_eventos = df_eventos.drop_duplicates(subset="evento_lesion", keep="first")
+    # 🔹 Ids de las lesiones del jugador (ya ordenadas por fecha en el índice por jugador)
+    # 🔹 Invertir para mostrarlas de más reciente a más antigua
+    eventos = obtener_lesiones_jugador(selected_player, path)["id_evento"].tolist()[::-1]
 
-    # 🔹 Obtener la lista de eventos en orden descendente real
-    eventos = df_eventos["evento_lesion"].tolist()
+    # 🔹 El id guardado en la sesión puede no ser del jugador en esta partición o versión
+    # 🔹 del dataset: en ese caso el selector vuelve a la lesión más reciente
+    if st.session_state.get("filtro_evento_lesion") not in eventos:
+        st.session_state.pop("filtro_evento_lesion", None)
 
     with col2:
-        # 🔹 Filtro: Evento de lesión
+        # 🔹 Filtro: Evento de lesión (el valor es el id, la etiqueta viene precalculada)
         selected_event = st.selectbox(
             "Evento de lesión",
             eventos,
+            format_func=lambda id_evento: obtener_etiqueta_evento(id_evento, path),
             key="filtro_evento_lesion",
             help="Selecciona un evento de lesión para ver sus detalles."
         )
     
-    # Buscar la fila del evento seleccionado
-    evento_row = df_eventos[df_eventos["evento_lesion"] == selected_event].iloc[0]
+    # Fila del evento seleccionado (acceso posicional por id)
+    evento_row = obtener_evento(selected_event, path)
     tipo_lesion = evento_row["tipo_de_lesion"]
     fecha_inicio = evento_row["fecha"]
     fecha_fin = evento_row["fecha_de_alta"]
@@ -1,5 +1,5 @@
 """
-Configuración general de la aplicación - Solo elementos visuales
+Configuración general de la aplicación - Rutas, dataset y elementos visuales
 """
 
 # ========= CONFIGURACIÓN DE RUTAS ==========
@@ -7,7 +7,70 @@ import os
 
 # Rutas básicas
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-ESCUDO_PATH = os.path.join(BASE_DIR, "data", "escudo.png")
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+# ========= ARCHIVOS ESTÁTICOS ==========
+# Servidos por Streamlit (server.enableStaticServing) desde static/ junto a app.py:
+# el navegador los pide una vez y los cachea, en lugar de reenviarlos en cada rerun
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+STATIC_URL = "app/static"
+ESCUDO_PATH = os.path.join(STATIC_DIR, "escudo.png")
+ESTILOS_PATH = os.path.join(STATIC_DIR, "estilos.css")
+
+# ========= CONFIGURACIÓN DEL DATASET ==========
+# Dataset limpio de lesiones (generado a partir del Excel del plantel).
+# LESIONES_DATA_PATH permite apuntar el dashboard a otro CSV (p. ej. datasets de benchmark)
+DATA_PATH = os.environ.get("LESIONES_DATA_PATH", os.path.join(DATA_DIR, "lesiones_clean.csv"))
+COLUMNAS_FECHA = ["fecha", "fecha_de_alta"]
+# Textos de baja cardinalidad: en memoria se guardan como categóricas (códigos enteros).
+# diagnostico es texto libre: queda como string (en el snapshot, sin copia del buffer mapeado)
+COLUMNAS_CATEGORICAS = ["jugador", "jugador_original", "tipo_de_lesion", "region", "lateralidad"]
+# Snapshot Arrow IPC junto al CSV, compartido entre procesos vía memory map
+SNAPSHOT_EXT = ".arrow"
+# Último change set de la ingesta incremental (filas insertadas, eliminadas y actualizadas)
+CAMBIOS_EXT = ".cambios.pkl"
+
+# ========= CONFIGURACIÓN DEL BACKEND DE DATOS ==========
+# "pandas": dataset en memoria (snapshot Arrow / CSV) con agregados incrementales
+# "sqlite": base SQLite indexada junto al CSV, consultas puntuales por jugador y conteo
+BACKEND_DATOS = os.environ.get("LESIONES_BACKEND", "pandas")
+SQLITE_EXT = ".sqlite"
+# Conexiones ociosas que conserva el pool de cada base (por proceso del servidor)
+SQLITE_POOL = 8
+
+# ========= CONFIGURACIÓN DE PARTICIONES ==========
+# Archivo histórico particionado por temporada y categoría (un CSV limpio por partición):
+# data/particiones/temporada=2025/categoria=primera/lesiones_clean.csv
+PARTICIONES_DIR = os.environ.get("LESIONES_PARTICIONES_DIR", os.path.join(DATA_DIR, "particiones"))
+# Categorías del club (clave de la partición -> nombre visible), en el orden del selector
+CATEGORIAS = {
+	"primera": "Primera",
+	"reserva": "Reserva",
+	"cuarta": "Cuarta división",
+	"quinta": "Quinta división",
+	"sexta": "Sexta división",
+}
+CATEGORIA_POR_DEFECTO = "primera"
+
+# ========= CONFIGURACIÓN DEL PIPELINE ETL ==========
+# Planilla fuente del staff médico y cache de etapas del pipeline
+EXCEL_PATH = os.path.join(BASE_DIR, "analisis_exploratorio", "ACTUALES LESIONES PLANTEL 2026.xlsx")
+ETL_CACHE_DIR = os.path.join(DATA_DIR, ".etl_cache")
+
+# ========= CONFIGURACIÓN DE PROFILING ==========
+# Trazas por rerun y dumps de cProfile del modo profiling (LESIONES_PROFILING / ?profiling=)
+PROFILING_DIR = os.path.join(DATA_DIR, ".profiling")
+
+# ========= CONFIGURACIÓN DE REPORTES ==========
+# Reportes HTML por jugador de la exportación por lotes (python -m reportes.exportar)
+REPORTES_DIR = os.environ.get("LESIONES_REPORTES_DIR", os.path.join(DATA_DIR, "reportes"))
+# Procesos de la exportación (por defecto, uno por núcleo)
+REPORTES_PROCESOS = int(os.environ.get("LESIONES_REPORTES_PROCESOS", os.cpu_count() or 1))
+
+# ========= CONFIGURACIÓN DE LA API LOCAL ==========
+# API JSON de solo lectura (python api.py); por defecto escucha solo en la máquina local
+API_HOST = os.environ.get("LESIONES_API_HOST", "127.0.0.1")
+API_PUERTO = int(os.environ.get("LESIONES_API_PUERTO", 8502))
 
 # ========= CONFIGURACIÓN DE COLORES CORPORATIVOS ==========
 COLORES = {
@@ -19,3 +82,9 @@ COLORES = {
 	'naranja_alerta': 'rgba(255, 165, 0, 0.9)',
 	'rojo_riesgo': 'rgba(255, 69, 0, 0.9)'
 }
+
+# Paleta para desgloses por región (rojo Colón primero, luego tonos que contrastan en fondo oscuro)
+COLORES_REGION = [
+	"#dc2626", "#f97316", "#facc15", "#22c55e", "#14b8a6", "#3b82f6",
+	"#8b5cf6", "#ec4899", "#f87171", "#a3e635", "#94a3b8", "#fb923c",
+]
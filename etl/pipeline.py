@@ -0,0 +1,314 @@
+"""
+Pipeline ETL - Planilla de lesiones del plantel -> data/lesiones_clean.csv
+Port reproducible de analisis_exploratorio/eda_profundo.ipynb.
+
+Uso:
+	python -m etl.pipeline [--entrada planilla.xlsx] [--salida lesiones_clean.csv]
+
+Cada etapa guarda su resultado en ETL_CACHE_DIR con una clave derivada del hash de
+su entrada: al volver a correr tras una edición de la planilla solo se re-ejecutan
+las etapas cuya entrada cambió.
+
+Con --incremental se compara el resultado contra el CSV anterior por huella de fila:
+si solo hay filas nuevas se agregan al final del CSV, y en todos los casos se publica
+el change set para que el dashboard actualice solo los jugadores y meses afectados.
+
+Con --categoria la salida se escribe particionada por temporada dentro del archivo
+histórico (PARTICIONES_DIR/temporada=AAAA/categoria=<categoria>/lesiones_clean.csv).
+Las temporadas fuera del rango de la planilla se conservan; --podar las borra.
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import shutil
+from datetime import date
+
+import pandas as pd
+
+from config.settings import DATA_PATH, EXCEL_PATH, ETL_CACHE_DIR, COLUMNAS_FECHA, PARTICIONES_DIR, CATEGORIAS, BACKEND_DATOS
+from utils.data_utils import escribir_snapshot, obtener_version_dataset
+from utils.cambios_utils import calcular_cambios, guardar_cambios, hay_cambios
+from utils.particiones_utils import listar_particiones, ruta_particion, temporada_de
+
+# Columnas que debe tener la planilla una vez normalizados los nombres
+COLUMNAS_ESPERADAS = {
+	"jugador", "fecha", "fecha_de_alta", "tipo_de_lesion",
+	"region", "diagnostico", "lateralidad", "dias_fuera",
+}
+
+# ========= ETAPAS ==========
+
+def leer_planilla(path):
+	"""
+	Lee la primera hoja de la planilla con openpyxl en modo read-only (streaming).
+	Replica pd.read_excel: se descartan solo las filas vacías al final de la hoja.
+	"""
+	from openpyxl import load_workbook
+
+	libro = load_workbook(path, read_only=True, data_only=True)
+	try:
+		filas = libro.worksheets[0].iter_rows(values_only=True)
+		encabezado = [str(celda) if celda is not None else "" for celda in next(filas, ())]
+		ancho = len(encabezado)
+
+		datos = []
+		ultima_con_datos = 0
+		for fila in filas:
+			fila = (tuple(fila) + (None,) * ancho)[:ancho]
+			datos.append(fila)
+			if any(celda is not None for celda in fila):
+				ultima_con_datos = len(datos)
+	finally:
+		libro.close()
+
+	return pd.DataFrame(datos[:ultima_con_datos], columns=encabezado)
+
+def normalizar_columnas(df):
+	"""Nombres de columnas en minúscula, sin tildes ni espacios, y control de estructura"""
+	df = df.copy()
+	df.columns = (
+		df.columns
+		.str.strip()
+		.str.lower()
+		.str.replace(" ", "_")
+		.str.replace("á", "a")
+		.str.replace("é", "e")
+		.str.replace("í", "i")
+		.str.replace("ó", "o")
+		.str.replace("ú", "u")
+	)
+	faltantes = COLUMNAS_ESPERADAS - set(df.columns)
+	if faltantes:
+		raise ValueError(f"⚠️ Columnas inesperadas. Faltan {sorted(faltantes)}, el archivo tiene: {list(df.columns)}")
+
+	df["fecha"] = pd.to_datetime(df["fecha"])
+	df["fecha_de_alta"] = pd.to_datetime(df["fecha_de_alta"])
+	return df
+
+def normalizar_jugadores(df):
+	"""Guarda el nombre original y normaliza el formato del jugador ('Apellido Nombre')"""
+	df = df.copy()
+	df["jugador_original"] = df["jugador"]
+	df["jugador"] = df["jugador"].str.title().str.strip()
+	return df
+
+def calcular_dias_fuera(df, hoy):
+	"""Días de baja hasta el alta (o hasta hoy si sigue activa); negativos quedan nulos"""
+	df = df.copy()
+	df["dias_fuera"] = (df["fecha_de_alta"].fillna(pd.Timestamp(hoy)) - df["fecha"]).dt.days
+	df.loc[df["dias_fuera"] < 0, "dias_fuera"] = None
+	return df
+
+# ========= MEMOIZACIÓN POR ETAPA ==========
+
+def _hash_df(df):
+	"""Hash estable del contenido de un DataFrame (columnas, tipos y valores)"""
+	sha = hashlib.sha1()
+	sha.update(repr(list(df.columns)).encode())
+	sha.update(repr([str(tipo) for tipo in df.dtypes]).encode())
+	sha.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+	return sha.hexdigest()
+
+def _ejecutar_etapa(nombre, funcion, clave_entrada, argumentos, cache_dir, reporte):
+	"""
+	Ejecuta una etapa o reutiliza su resultado si ya se calculó para la misma entrada.
+	Devuelve (resultado, clave de salida), donde la clave de salida es el hash del
+	resultado: si una etapa produce lo mismo que antes, las siguientes no se re-ejecutan.
+	"""
+	clave = hashlib.sha1(f"{nombre}|{clave_entrada}".encode()).hexdigest()
+	ruta = os.path.join(cache_dir, f"{nombre}-{clave}.pkl")
+
+	if os.path.exists(ruta):
+		with open(ruta, "rb") as archivo:
+			resultado, clave_salida = pickle.load(archivo)
+		reporte.append((nombre, "cache"))
+		return resultado, clave_salida
+
+	resultado = funcion(*argumentos)
+	clave_salida = _hash_df(resultado)
+
+	os.makedirs(cache_dir, exist_ok=True)
+	temporal = f"{ruta}.{os.getpid()}.tmp"
+	with open(temporal, "wb") as archivo:
+		pickle.dump((resultado, clave_salida), archivo, protocol=pickle.HIGHEST_PROTOCOL)
+	os.replace(temporal, ruta)
+	reporte.append((nombre, "ejecutada"))
+	return resultado, clave_salida
+
+def construir_dataset(entrada=EXCEL_PATH, hoy=None, cache_dir=ETL_CACHE_DIR, reporte=None):
+	"""
+	Corre las etapas del pipeline y devuelve el DataFrame limpio.
+	`reporte` (lista opcional) recibe (etapa, 'cache' | 'ejecutada') por cada etapa.
+	"""
+	hoy = hoy or date.today()
+	reporte = [] if reporte is None else reporte
+
+	df, clave = _ejecutar_etapa(
+		"leer_planilla", leer_planilla, obtener_version_dataset(entrada), (entrada,), cache_dir, reporte
+	)
+	df, clave = _ejecutar_etapa("normalizar_columnas", normalizar_columnas, clave, (df,), cache_dir, reporte)
+	df, clave = _ejecutar_etapa("normalizar_jugadores", normalizar_jugadores, clave, (df,), cache_dir, reporte)
+	df, clave = _ejecutar_etapa(
+		"calcular_dias_fuera", calcular_dias_fuera, f"{clave}|{hoy.isoformat()}", (df, hoy), cache_dir, reporte
+	)
+	return df
+
+def _publicar_derivados(salida):
+	"""
+	Regenera los archivos derivados del CSV: el snapshot Arrow (si pyarrow está
+	disponible) y la base SQLite si el dashboard usa ese backend.
+	"""
+	try:
+		escribir_snapshot(salida)
+	except ImportError:
+		pass  # Sin pyarrow el dashboard lee directamente el CSV
+	if BACKEND_DATOS == "sqlite":
+		from utils.sqlite_utils import escribir_sqlite
+		escribir_sqlite(salida)
+
+def exportar_csv(df, salida=DATA_PATH):
+	"""
+	Escribe el CSV limpio (y sus archivos derivados: snapshot Arrow y base SQLite).
+	Si el contenido no cambió, no se toca el archivo para no invalidar los caches del dashboard.
+	"""
+	contenido = df.to_csv(index=False).encode("utf-8")
+	if os.path.exists(salida) and obtener_version_dataset(salida) == hashlib.sha1(contenido).hexdigest():
+		return False
+
+	temporal = f"{salida}.{os.getpid()}.tmp"
+	with open(temporal, "wb") as archivo:
+		archivo.write(contenido)
+	os.replace(temporal, salida)
+	_publicar_derivados(salida)
+	return True
+
+def exportar_incremental(df, salida=DATA_PATH):
+	"""
+	Ingesta incremental: calcula el change set contra el CSV actual y lo publica junto a él.
+	Si solo hay inserciones, las filas nuevas se agregan al final (append-only); si hay
+	actualizaciones o eliminaciones se reescribe el CSV. Devuelve el change set (o None
+	si no había CSV previo y se hizo una exportación completa).
+	"""
+	if not os.path.exists(salida):
+		exportar_csv(df, salida)
+		return None
+
+	anterior = pd.read_csv(salida, parse_dates=COLUMNAS_FECHA)
+	cambios = calcular_cambios(anterior, df)
+	if not hay_cambios(cambios):
+		return cambios
+
+	version_anterior = obtener_version_dataset(salida)
+	solo_inserciones = not (
+		len(cambios["eliminadas"]) or len(cambios["actualizadas_antes"]) or len(cambios["actualizadas_despues"])
+	)
+
+	if solo_inserciones:
+		with open(salida, "rb") as archivo:
+			archivo.seek(-1, os.SEEK_END)
+			termina_en_salto = archivo.read(1) == b"\n"
+		with open(salida, "a", encoding="utf-8", newline="") as archivo:
+			if not termina_en_salto:
+				archivo.write("\n")
+			cambios["insertadas"].to_csv(archivo, index=False, header=False)
+	else:
+		exportar_csv(df, salida)
+
+	guardar_cambios(salida, cambios, version_anterior, obtener_version_dataset(salida))
+	if solo_inserciones:
+		_publicar_derivados(salida)
+	return cambios
+
+def _eliminar_particion(ruta):
+	"""Borra la partición (CSV y derivados) y el directorio de la temporada si queda vacío"""
+	directorio = os.path.dirname(ruta)
+	shutil.rmtree(directorio)
+	try:
+		os.rmdir(os.path.dirname(directorio))
+	except OSError:
+		pass  # La temporada tiene otras categorías
+
+def exportar_particiones(df, categoria, base=PARTICIONES_DIR, incremental=False, eliminadas=None, podar=False):
+	"""
+	Escribe una partición por temporada para la `categoria` dada y devuelve
+	{temporada: ruta}. Cada partición se exporta como un dataset independiente
+	(completa o incremental), así que las temporadas sin cambios no se tocan.
+	Las filas sin fecha de inicio no pertenecen a ninguna temporada y se descartan.
+
+	Se borran las particiones existentes de la categoría que se quedaron sin filas (p. ej.
+	tras corregir fechas), pero solo las de temporadas dentro del rango que cubre la
+	planilla: una planilla de la temporada actual no borra el archivo histórico. Con
+	`podar` se borran todas las que no están en la planilla. Las temporadas borradas se
+	agregan a `eliminadas` si es una lista.
+	"""
+	rutas = {}
+	for temporada, filas in df.groupby(temporada_de(df["fecha"]), sort=True):
+		salida = ruta_particion(temporada, categoria, base)
+		os.makedirs(os.path.dirname(salida), exist_ok=True)
+		filas = filas.reset_index(drop=True)
+		if incremental:
+			exportar_incremental(filas, salida)
+		else:
+			exportar_csv(filas, salida)
+		rutas[int(temporada)] = salida
+
+	temporadas = temporada_de(df["fecha"]).dropna()
+	for (temporada, categoria_existente), ruta in listar_particiones(base).items():
+		if categoria_existente != categoria or temporada in rutas:
+			continue
+		cubierta = len(temporadas) > 0 and temporadas.min() <= temporada <= temporadas.max()
+		if podar or cubierta:
+			_eliminar_particion(ruta)
+			if eliminadas is not None:
+				eliminadas.append(temporada)
+	return rutas
+
+def main(argv=None):
+	"""Punto de entrada de línea de comandos"""
+	parser = argparse.ArgumentParser(description="Genera lesiones_clean.csv a partir de la planilla del plantel.")
+	parser.add_argument("--entrada", default=EXCEL_PATH, help="Planilla .xlsx de lesiones")
+	parser.add_argument("--salida", default=DATA_PATH, help="CSV limpio de salida")
+	parser.add_argument("--cache-dir", default=ETL_CACHE_DIR, help="Directorio del cache de etapas")
+	parser.add_argument("--incremental", action="store_true", help="Ingesta incremental con change set por huella de fila")
+	parser.add_argument("--categoria", choices=list(CATEGORIAS), help="Exportar particionado por temporada para esta categoría")
+	parser.add_argument("--particiones-dir", default=PARTICIONES_DIR, help="Raíz del archivo particionado")
+	parser.add_argument(
+		"--podar", action="store_true",
+		help="Con --categoria, borrar también las particiones de temporadas fuera de la planilla"
+	)
+	args = parser.parse_args(argv)
+
+	reporte = []
+	df = construir_dataset(args.entrada, cache_dir=args.cache_dir, reporte=reporte)
+	for etapa, estado in reporte:
+		print(f"{etapa:<22} {estado}")
+
+	if args.categoria:
+		eliminadas = []
+		rutas = exportar_particiones(
+			df, args.categoria, args.particiones_dir, args.incremental, eliminadas, podar=args.podar
+		)
+		for temporada, ruta in rutas.items():
+			print(f"✅ temporada {temporada} ({args.categoria}) -> {ruta}")
+		for temporada in eliminadas:
+			print(f"🗑️ temporada {temporada} ({args.categoria}) sin lesiones: partición eliminada")
+		return
+
+	if args.incremental:
+		cambios = exportar_incremental(df, args.salida)
+		if cambios is not None:
+			resumen = ", ".join(
+				f"{parte}: {len(cambios[parte])}" for parte in ("insertadas", "eliminadas", "actualizadas_despues")
+			)
+			print(f"Cambios -> {resumen}")
+		print(f"✅ {len(df)} filas -> {args.salida}")
+		return
+
+	escrito = exportar_csv(df, args.salida)
+	print(f"✅ {len(df)} filas -> {args.salida}" + ("" if escrito else " (sin cambios)"))
+
+
+if __name__ == "__main__":
+	main()
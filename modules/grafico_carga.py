@@ -0,0 +1,133 @@
+from datetime import date
+
+import plotly.graph_objects as go
+import streamlit as st
+from config.settings import DATA_PATH, COLORES_REGION
+from utils.carga_utils import obtener_carga_jugador, obtener_carga_regiones
+from utils.chart_utils import figura_cacheada
+
+@figura_cacheada
+def construir_figura_carga(path=DATA_PATH, hoy=None):
+    """
+    Construye el gráfico de carga lesional: días perdidos por mes, apilados por región
+    (None si no hay datos). Se cachea por partición, versión del dataset y fecha de
+    referencia (las lesiones activas suman días hasta hoy).
+    """
+    # Matriz región × mes (cada lesión reparte sus días entre los meses que abarca)
+    carga = obtener_carga_regiones(path, hoy)
+
+    if carga.empty:
+        return None
+
+    meses = carga.columns.strftime("%b %Y").tolist()
+    fig = go.Figure()
+
+    # Una barra apilada por región, de la de mayor carga a la de menor
+    for posicion, region in enumerate(carga.sum(axis=1).sort_values(ascending=False).index):
+        fig.add_trace(go.Bar(
+            x=meses,
+            y=carga.loc[region].to_numpy(),
+            name=str(region),
+            marker_color=COLORES_REGION[posicion % len(COLORES_REGION)],
+            hovertemplate="%{x}: %{y} días<extra>%{fullData.name}</extra>"
+        ))
+
+    # Personalización visual
+    fig.update_layout(
+        title="Carga lesional: días perdidos por mes",
+        barmode="stack",
+        xaxis_title="Mes",
+        yaxis_title="Días perdidos",
+        plot_bgcolor="#111827",
+        paper_bgcolor="#111827",
+        font=dict(size=14, color="white"),        # tamaño de texto general
+        title_font=dict(size=20, color="white"),  # tamaño del título principal
+        xaxis=dict(
+            showgrid=False,
+            tickangle=-35,
+            title_font=dict(size=14, color="white"),  # título del eje X
+            tickfont=dict(size=12, color="white"),    # valores del eje X
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor="#333333",
+            zeroline=False,
+            title_font=dict(size=14, color="white"),  # título del eje Y
+            tickfont=dict(size=12, color="white"),    # valores del eje Y
+        ),
+        height=450,
+        margin=dict(l=40, r=40, t=60, b=80),
+        legend=dict(font=dict(size=11, color="white"), bgcolor="rgba(0,0,0,0)"),
+    )
+
+    return fig
+
+@figura_cacheada
+def construir_figura_franja_jugador(path=DATA_PATH, jugador=None, hoy=None):
+    """
+    Construye la franja de carga del jugador: un mapa de calor de una fila con los días
+    perdidos en cada mes del dataset (None si no hay datos).
+    """
+    carga = obtener_carga_jugador(jugador, path, hoy)
+
+    if carga.empty:
+        return None
+
+    fig = go.Figure(go.Heatmap(
+        z=[carga.to_numpy()],
+        x=carga.index.strftime("%b %Y").tolist(),
+        y=["Días perdidos"],
+        zmin=0,
+        zmax=31,
+        colorscale=[[0, "#1f2937"], [0.01, "#7f1d1d"], [1, "#dc2626"]],
+        xgap=2,
+        showscale=False,
+        hovertemplate="%{x}: %{z} días<extra></extra>"
+    ))
+
+    # Personalización visual
+    fig.update_layout(
+        plot_bgcolor="#111827",
+        paper_bgcolor="#111827",
+        font=dict(size=12, color="white"),
+        xaxis=dict(showgrid=False, tickangle=-35, tickfont=dict(size=11, color="white")),
+        yaxis=dict(showgrid=False, showticklabels=False),
+        height=130,
+        margin=dict(l=10, r=10, t=10, b=50),
+    )
+
+    return fig
+
+def mostrar_grafico_carga(path=DATA_PATH):
+    """
+    Gráfico de carga lesional mensual (días perdidos, no inicios de lesión).
+    - Las lesiones que cruzan un fin de mes reparten sus días entre ambos meses.
+    - Apilado por región corporal.
+    """
+    fig = construir_figura_carga(path, date.today())
+
+    if fig is None:
+        st.warning("⚠️ No hay datos disponibles para generar el gráfico.")
+        return
+
+    # Mostrar en Streamlit
+    st.plotly_chart(fig, use_container_width=True)
+
+def mostrar_franja_carga_jugador(selected_player: str, path: str = DATA_PATH):
+    """
+    Franja de carga del jugador seleccionado: días perdidos en cada mes, en la misma
+    escala de meses que el resto del dataset.
+    """
+    if not selected_player:
+        return
+
+    fig = construir_figura_franja_jugador(path, selected_player, date.today())
+
+    if fig is None:
+        return
+
+    st.markdown(
+        "<p style='color:#d1d5db; font-size:16px; font-weight:500; margin:20px 0 0 0;'>Días perdidos por mes</p>",
+        unsafe_allow_html=True
+    )
+    st.plotly_chart(fig, use_container_width=True)
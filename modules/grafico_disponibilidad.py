@@ -0,0 +1,96 @@
+from datetime import date
+
+import plotly.graph_objects as go
+import streamlit as st
+from config.settings import DATA_PATH, COLORES_REGION
+from utils.chart_utils import figura_cacheada
+from utils.intervalos_utils import obtener_lesionados_por_dia
+
+@figura_cacheada
+def construir_figura_disponibilidad(path=DATA_PATH, por_region=False, hoy=None):
+    """
+    Construye la línea de tiempo de jugadores lesionados por día (None si no hay datos).
+    Se cachea por partición, versión del dataset, desglose y fecha de referencia
+    (las lesiones sin alta siguen abiertas hasta hoy).
+    """
+    # Conteos diarios calculados con un barrido sobre inicios y altas
+    lesionados = obtener_lesionados_por_dia(path, hoy, por_region)
+
+    if lesionados.empty:
+        return None
+
+    fig = go.Figure()
+
+    if por_region:
+        # Áreas apiladas por región, de la más frecuente a la menos frecuente
+        for posicion, region in enumerate(lesionados.sum().sort_values(ascending=False).index):
+            fig.add_trace(go.Scatter(
+                x=lesionados.index,
+                y=lesionados[region],
+                mode="lines",
+                line=dict(width=0.8, shape="hv", color=COLORES_REGION[posicion % len(COLORES_REGION)]),
+                stackgroup="regiones",
+                name=str(region),
+                hovertemplate="%{x|%Y-%m-%d}: %{y} lesionados<extra>%{fullData.name}</extra>"
+            ))
+    else:
+        fig.add_trace(go.Scatter(
+            x=lesionados.index,
+            y=lesionados["lesionados"],
+            mode="lines",
+            line=dict(color="#dc2626", width=2, shape="hv"),
+            fill="tozeroy",
+            fillcolor="rgba(220,38,38,0.15)",
+            name="Lesionados",
+            hovertemplate="%{x|%Y-%m-%d}: %{y} lesionados<extra></extra>"
+        ))
+
+    # Personalización visual
+    fig.update_layout(
+        title="Jugadores lesionados por día",
+        xaxis_title="Fecha",
+        yaxis_title="Jugadores lesionados",
+        plot_bgcolor="#111827",
+        paper_bgcolor="#111827",
+        font=dict(size=14, color="white"),        # tamaño de texto general
+        title_font=dict(size=20, color="white"),  # tamaño del título principal
+        xaxis=dict(
+            showgrid=False,
+            type="date",
+            title_font=dict(size=14, color="white"),  # título del eje X
+            tickfont=dict(size=12, color="white"),    # valores del eje X
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor="#333333",
+            zeroline=False,
+            rangemode="tozero",
+            title_font=dict(size=14, color="white"),  # título del eje Y
+            tickfont=dict(size=12, color="white"),    # valores del eje Y
+        ),
+        height=450,
+        margin=dict(l=40, r=40, t=60, b=80),
+        showlegend=por_region,
+        legend=dict(font=dict(size=11, color="white"), bgcolor="rgba(0,0,0,0)"),
+        hovermode="x unified" if por_region else "closest",
+    )
+
+    return fig
+
+def mostrar_grafico_disponibilidad(path=DATA_PATH):
+    """
+    Línea de tiempo de indisponibilidad del plantel: cuántos jugadores estaban
+    lesionados a la vez en cada día, con desglose opcional por región corporal.
+    - Un jugador con lesiones superpuestas cuenta una sola vez (por región).
+    - Las lesiones activas se extienden hasta hoy.
+    """
+    por_region = st.toggle("Desglosar por región", key="disponibilidad_por_region")
+
+    fig = construir_figura_disponibilidad(path, por_region, date.today())
+
+    if fig is None:
+        st.warning("⚠️ No hay datos disponibles para generar el gráfico.")
+        return
+
+    # Mostrar en Streamlit
+    st.plotly_chart(fig, use_container_width=True)
@@ -1,74 +1,82 @@
-import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
+from config.settings import DATA_PATH
+from utils.evolucion_utils import RESOLUCIONES, obtener_evolucion, resolucion_efectiva
+from utils.chart_utils import figura_cacheada
 
-# Ruta al dataset
-DATA_PATH = "data/lesiones_clean.csv"
+# Por encima de estos puntos: sin etiquetas de valor, WebGL (Scattergl) y, como tope
+# del payload, se pasa a la resolución más gruesa siguiente
+_MAX_ETIQUETAS = 40
+_MIN_WEBGL = 1000
+_MAX_PUNTOS = 5000
 
-def mostrar_grafico_evolutivo():
+# Formato de fecha por resolución: hover y marcas del eje (None: automático de plotly)
+_FORMATOS = {
+    "dia": ("%d %b %Y", None),
+    "semana": ("semana del %d %b %Y", None),
+    "mes": ("%b %Y", "%b %Y"),
+    "temporada": ("temporada %Y", "%Y"),
+}
+
+@figura_cacheada
+def construir_figura_evolutivo(path=DATA_PATH, resolucion="mes"):
     """
-    Gráfico evolutivo mensual de lesiones (total general).
-    - No depende de filtros.
-    - Muestra la cantidad total de lesiones por mes en orden cronológico.
-    - Estilo consistente con el dashboard.
+    Construye la figura del gráfico evolutivo en la resolución pedida (None si no hay datos).
+    Los conteos se remuestrean en el servidor a partir del conteo diario cacheado.
+    Se cachea por partición, versión del dataset y resolución: no depende de filtros.
     """
+    # Resolución acotada por cantidad de puntos, y su serie con calendario completo
+    resolucion = resolucion_efectiva(path, resolucion, _MAX_PUNTOS)
+    conteos = obtener_evolucion(path, resolucion)
 
-    # Leer dataset
-    df = pd.read_csv(DATA_PATH, parse_dates=["fecha"])
-
-    if df.empty:
-        st.warning("⚠️ No hay datos disponibles para generar el gráfico.")
-        return
-
-    # Agrupar por mes (total lesiones por mes)
-    df["mes"] = df["fecha"].dt.to_period("M").dt.to_timestamp()
-    resumen = (
-        df.groupby("mes")
-        .size()
-        .reset_index(name="cantidad_lesiones")
-        .sort_values("mes")
-    )
+    if conteos.empty:
+        return None
 
-    # Etiquetas formateadas: "Ene 2024"
-    resumen["mes_formato"] = resumen["mes"].dt.strftime("%b %Y")
+    n_puntos = len(conteos)
+    formato_hover, formato_eje = _FORMATOS[resolucion]
+    max_lesiones = int(conteos.max())
 
-    # Eje Y con números enteros
-    max_lesiones = int(resumen["cantidad_lesiones"].max())
-    y_range = [0, max_lesiones + 1]
+    # Pocos puntos: línea con marcadores y etiquetas; muchos: solo la línea, en WebGL
+    if n_puntos <= _MAX_ETIQUETAS:
+        modo = "lines+markers+text"
+    elif n_puntos < _MIN_WEBGL:
+        modo = "lines+markers"
+    else:
+        modo = "lines"
+    traza = go.Scattergl if n_puntos >= _MIN_WEBGL else go.Scatter
 
     # Crear figura
     fig = go.Figure()
 
-    fig.add_trace(go.Scatter(
-        x=resumen["mes_formato"],
-        y=resumen["cantidad_lesiones"],
-        mode="lines+markers+text",
-        line=dict(color="#dc2626", width=3),
-        marker=dict(size=8, color="#dc2626"),
-        text=resumen["cantidad_lesiones"],
+    fig.add_trace(traza(
+        x=conteos.index.to_numpy(),
+        y=conteos.to_numpy(),
+        mode=modo,
+        line=dict(color="#dc2626", width=3 if n_puntos <= _MAX_ETIQUETAS else 1.5),
+        marker=dict(size=8 if n_puntos <= _MAX_ETIQUETAS else 4, color="#dc2626"),
+        text=conteos.to_numpy() if n_puntos <= _MAX_ETIQUETAS else None,
         textposition="top center",
         fill="tozeroy",
         fillcolor="rgba(220,38,38,0.15)",
-        name="Lesiones"
+        name="Lesiones",
+        hovertemplate=f"%{{x|{formato_hover}}}: %{{y}} lesiones<extra></extra>"
     ))
 
     # Personalización visual
     fig.update_layout(
-        title="Evolución mensual de lesiones (total general)",
-        xaxis_title="Mes",
+        title=f"Evolución de lesiones por {RESOLUCIONES[resolucion].lower()} (total general)",
+        xaxis_title=RESOLUCIONES[resolucion],
         yaxis_title="Cantidad de lesiones",
         plot_bgcolor="#111827",
         paper_bgcolor="#111827",
         font=dict(size=14, color="white"),        # tamaño de texto general
         title_font=dict(size=20, color="white"),  # tamaño del título principal
         xaxis=dict(
+            type="date",
             showgrid=False,
             tickangle=-35,
-            tickmode="array",
-            tickvals=resumen["mes_formato"].tolist(),
-            ticktext=resumen["mes_formato"].tolist(),
-            range=[-0.5, len(resumen["mes_formato"]) - 0.5],  # deja espacio en los extremos
-            fixedrange=True,
+            tickformat=formato_eje,
+            dtick="M12" if resolucion == "temporada" else None,
             title_font=dict(size=14, color="white"),  # título del eje X
             tickfont=dict(size=12, color="white"),    # valores del eje X
         ),
@@ -76,9 +84,9 @@ def mostrar_grafico_evolutivo():
             showgrid=True,
             gridcolor="#333333",
             zeroline=False,
-            tickmode="linear",
-            dtick=1,
-            range=y_range,
+            rangemode="tozero",
+            dtick=1 if max_lesiones <= 10 else None,  # enteros cuando hay pocas lesiones por tramo
+            range=[0, max_lesiones * 1.15 + 1] if n_puntos <= _MAX_ETIQUETAS else None,  # aire para las etiquetas
             title_font=dict(size=14, color="white"),  # título del eje Y
             tickfont=dict(size=12, color="white"),    # valores del eje Y
         ),
@@ -87,5 +95,39 @@ def mostrar_grafico_evolutivo():
         showlegend=False,
     )
 
+    return fig
+
+def mostrar_grafico_evolutivo(path=DATA_PATH):
+    """
+    Gráfico evolutivo de lesiones (total general), con resolución día/semana/mes/temporada.
+    - No depende de filtros.
+    - Muestra la cantidad total de lesiones por tramo en orden cronológico, sobre un
+      eje de fechas, incluyendo los tramos sin lesiones.
+    - Si la resolución pedida supera el tope de puntos se usa la siguiente más gruesa.
+    - Estilo consistente con el dashboard.
+    """
+    resolucion = st.radio(
+        "Resolución",
+        list(RESOLUCIONES),
+        index=list(RESOLUCIONES).index("mes"),
+        format_func=RESOLUCIONES.get,
+        horizontal=True,
+        key="evolutivo_resolucion",
+        label_visibility="collapsed"
+    )
+
+    fig = construir_figura_evolutivo(path, resolucion)
+
+    if fig is None:
+        st.warning("⚠️ No hay datos disponibles para generar el gráfico.")
+        return
+
+    efectiva = resolucion_efectiva(path, resolucion, _MAX_PUNTOS)
+    if efectiva != resolucion:
+        st.caption(
+            f"El archivo abarca demasiados tramos por {RESOLUCIONES[resolucion].lower()}: "
+            f"se muestra por {RESOLUCIONES[efectiva].lower()}."
+        )
+
     # Mostrar en Streamlit
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
@@ -1,34 +1,36 @@
-import pandas as pd
-import plotly.express as px
-import streamlit as st
+from datetime import date
 
-DATA_PATH = "data/lesiones_clean.csv"
+import plotly.graph_objects as go
+import streamlit as st
+from config.settings import DATA_PATH
+from utils.ranking_utils import METRICAS, obtener_opciones_ranking, obtener_ranking_filtrado
+from utils.chart_utils import figura_cacheada
 
-def mostrar_grafico_ranking_lesionados():
+@figura_cacheada
+def construir_figura_ranking_lesionados(
+    path=DATA_PATH, n=10, metrica="cantidad_lesiones",
+    regiones=None, tipos=None, desde=None, hasta=None, hoy=None
+):
     """
-    Muestra un gráfico de barras horizontales con el ranking de jugadores según
-    la cantidad total de lesiones registradas (de mayor a menor).
-    Mantiene el estilo visual corporativo del Club Atlético Colón.
+    Construye la figura del ranking de jugadores más lesionados (None si ningún
+    jugador tiene lesiones con esos filtros). Regiones y tipos van como tuplas.
+    Se cachea por partición, versión del dataset, N, métrica y filtros.
     """
-    # Leer dataset
-    df = pd.read_csv(DATA_PATH)
+    # Top N desde los conteos por jugador cacheados para cada valor de filtro
+    ranking = obtener_ranking_filtrado(path, n, metrica, regiones, tipos, desde, hasta, hoy)
 
-    # Agrupar por jugador y contar lesiones
-    ranking = df.groupby("jugador").size().reset_index(name="cantidad_lesiones")
-
-    # Ordenar de mayor a menor y tomar top 10
-    ranking = ranking.sort_values(by="cantidad_lesiones", ascending=False).head(10)
+    if ranking.empty:
+        return None
 
     # Crear gráfico de barras horizontales
-    fig = px.bar(
-        ranking,
-        x="cantidad_lesiones",
-        y="jugador",
+    fig = go.Figure(go.Bar(
+        x=ranking.to_numpy(),
+        y=ranking.index.tolist(),
         orientation="h",
-        text="cantidad_lesiones",
-        title="Ranking de jugadores más lesionados",
-        color_discrete_sequence=["#dc2626"]  # Rojo Colón
-    )
+        text=ranking.to_numpy(),
+        marker_color="#dc2626",  # Rojo Colón
+        hovertemplate=f"{METRICAS[metrica]}=%{{text}}<br>jugador=%{{y}}<extra></extra>"
+    ))
 
     # Personalización visual corporativa
     fig.update_traces(
@@ -39,13 +41,14 @@ def mostrar_grafico_ranking_lesionados():
     )
 
     fig.update_layout(
+        title="Ranking de jugadores más lesionados",
         plot_bgcolor="#111827",      # Fondo oscuro
         paper_bgcolor="#111827",     # Fondo del papel oscuro
         font=dict(size=14, color="white"),        # tamaño de texto general
         title_font=dict(size=20, color="white"),  # tamaño del título principal
         xaxis=dict(
             showgrid=False, 
-            title="Cantidad de lesiones",
+            title=METRICAS[metrica],
             title_font=dict(size=14, color="white"),  # título del eje X
             tickfont=dict(size=12, color="white")     # valores del eje X
         ),
@@ -56,10 +59,62 @@ def mostrar_grafico_ranking_lesionados():
             tickfont=dict(size=12, color="white"),    # valores del eje Y
             categoryorder="total ascending"  # Orden ascendente para barras horizontales
         ),
-        height=500,
+        height=max(500, 28 * len(ranking) + 120),  # crece con N para no apretar las barras
         margin=dict(l=20, r=20, t=60, b=20),
         showlegend=False  # Sin leyenda para diseño limpio
     )
 
+    return fig
+
+def leer_filtros_ranking():
+    """
+    Argumentos de construir_figura_ranking_lesionados (sin `path`) según los controles
+    del ranking en la sesión, sin leer el dataset (sirve para precalcular la figura).
+    Las multiselecciones vacías equivalen a no filtrar; la fecha de hoy solo cuenta
+    para los días perdidos.
+    """
+    estado = st.session_state
+    metrica = estado.get("ranking_metrica", "cantidad_lesiones")
+    regiones = tuple(estado.get("ranking_regiones", ())) or None
+    tipos = tuple(estado.get("ranking_tipos", ())) or None
+    rango = tuple(estado.get("ranking_fechas", ()))
+    desde = rango[0] if len(rango) > 0 else None
+    hasta = rango[1] if len(rango) > 1 else None
+    hoy = date.today() if metrica == "dias_perdidos" else None
+    return estado.get("ranking_n", 10), metrica, regiones, tipos, desde, hasta, hoy
+
+def mostrar_grafico_ranking_lesionados(path=DATA_PATH):
+    """
+    Muestra un gráfico de barras horizontales con el ranking de jugadores según la
+    cantidad de lesiones o los días perdidos (de mayor a menor), con N ajustable y
+    filtros por región corporal, tipo de lesión y rango de fechas de inicio.
+    Mantiene el estilo visual corporativo del Club Atlético Colón.
+    """
+    regiones, tipos, primera, ultima = obtener_opciones_ranking(path)
+
+    col_metrica, col_n = st.columns([3, 2])
+    with col_metrica:
+        st.radio(
+            "Métrica", list(METRICAS), format_func=METRICAS.get,
+            horizontal=True, key="ranking_metrica", label_visibility="collapsed"
+        )
+    with col_n:
+        st.slider("Jugadores", min_value=5, max_value=30, value=10, key="ranking_n")
+
+    with st.expander("Filtros del ranking"):
+        st.multiselect("Región", regiones, key="ranking_regiones", placeholder="Todas")
+        st.multiselect("Tipo de lesión", tipos, key="ranking_tipos", placeholder="Todos")
+        if primera is not None:
+            st.date_input(
+                "Lesiones iniciadas entre", value=(primera, ultima),
+                min_value=primera, max_value=ultima, format="DD/MM/YYYY", key="ranking_fechas"
+            )
+
+    fig = construir_figura_ranking_lesionados(path, *leer_filtros_ranking())
+
+    if fig is None:
+        st.warning("⚠️ Ningún jugador tiene lesiones con los filtros elegidos.")
+        return
+
     # Mostrar en Streamlit
     st.plotly_chart(fig, use_container_width=True)
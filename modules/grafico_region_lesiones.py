@@ -1,35 +1,29 @@
-import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
+from config.settings import DATA_PATH
+from utils.fuente_utils import obtener_conteos_region
+from utils.chart_utils import figura_cacheada
 
-DATA_PATH = "data/lesiones_clean.csv"
-
-def mostrar_grafico_region_lesiones():
+@figura_cacheada
+def construir_figura_region_lesiones(path=DATA_PATH):
     """
-    Muestra un gráfico de barras verticales con la cantidad total de lesiones por región corporal.
-    Mantiene el estilo visual corporativo del Club Atlético Colón.
+    Construye la figura de distribución de lesiones por región corporal.
+    Se cachea por partición y versión del dataset.
     """
-    # Leer dataset
-    df = pd.read_csv(DATA_PATH)
-
-    # Limpiar datos nulos en región si existen
-    df = df.dropna(subset=["region"])
-
-    # Agrupar por región y contar lesiones
-    regiones = df.groupby("region").size().reset_index(name="cantidad_lesiones")
+    # Lesiones por región (agregado mantenido incrementalmente, sin regiones nulas)
+    conteos = obtener_conteos_region(path)
 
     # Ordenar de mayor a menor cantidad de lesiones
-    regiones = regiones.sort_values(by="cantidad_lesiones", ascending=False)
+    regiones = conteos.sort_values(ascending=False)
 
     # Crear gráfico de barras verticales
-    fig = px.bar(
-        regiones,
-        x="region",
-        y="cantidad_lesiones",
-        text="cantidad_lesiones",
-        title="Distribución de lesiones por región corporal",
-        color_discrete_sequence=["#dc2626"]  # Rojo Colón
-    )
+    fig = go.Figure(go.Bar(
+        x=regiones.index.tolist(),
+        y=regiones.to_numpy(),
+        text=regiones.to_numpy(),
+        marker_color="#dc2626",  # Rojo Colón
+        hovertemplate="region=%{x}<br>cantidad_lesiones=%{text}<extra></extra>"
+    ))
 
     # Personalización visual corporativa
     fig.update_traces(
@@ -40,6 +34,7 @@ def mostrar_grafico_region_lesiones():
     )
 
     fig.update_layout(
+        title="Distribución de lesiones por región corporal",
         plot_bgcolor="#111827",      # Fondo oscuro
         paper_bgcolor="#111827",     # Fondo del papel oscuro
         font=dict(size=14, color="white"),        # tamaño de texto general
@@ -63,5 +58,14 @@ def mostrar_grafico_region_lesiones():
         showlegend=False  # Sin leyenda para diseño limpio
     )
 
+    return fig
+
+def mostrar_grafico_region_lesiones(path=DATA_PATH):
+    """
+    Muestra un gráfico de barras verticales con la cantidad total de lesiones por región corporal.
+    Mantiene el estilo visual corporativo del Club Atlético Colón.
+    """
+    fig = construir_figura_region_lesiones(path)
+
     # Mostrar en Streamlit
     st.plotly_chart(fig, use_container_width=True)
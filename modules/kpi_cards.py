@@ -1,22 +1,16 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime
+from config.settings import DATA_PATH
+from utils.fuente_utils import obtener_kpis_jugador, obtener_dias_evento
 
-DATA_PATH = "data/lesiones_clean.csv"
-
-def mostrar_kpi_cantidad_lesiones(selected_player: str):
+def mostrar_kpi_cantidad_lesiones(selected_player: str, path: str = DATA_PATH):
     """
     Muestra una card con la cantidad total de lesiones del jugador seleccionado.
     Respetar estilo visual del proyecto (tema oscuro, rojo Colón, fuentes y proporciones).
     """
 
-    # Cargar dataset
-    df = pd.read_csv(DATA_PATH)
-
-    # Calcular cantidad de lesiones por jugador
+    # KPIs precalculados para todo el plantel (solo lookup)
     if selected_player:
-        lesiones_jugador = df[df["jugador"] == selected_player]
-        cantidad_lesiones = len(lesiones_jugador)
+        cantidad_lesiones = obtener_kpis_jugador(selected_player, path)["cantidad_lesiones"]
     else:
         cantidad_lesiones = 0
 
@@ -42,32 +36,15 @@ def mostrar_kpi_cantidad_lesiones(selected_player: str):
         unsafe_allow_html=True
     )
 
-def mostrar_kpi_dias_lesionado(selected_player: str):
+def mostrar_kpi_dias_lesionado(selected_player: str, path: str = DATA_PATH):
     """
     Muestra una card con el total acumulado de días lesionado del jugador seleccionado.
     Suma todas las lesiones (dadas de alta o activas).
     Respeta estilo visual y colores corporativos del proyecto.
     """
 
-    df = pd.read_csv(DATA_PATH, parse_dates=["fecha", "fecha_de_alta"])
-
     if selected_player:
-        df_jugador = df[df["jugador"] == selected_player].copy()
-
-        total_dias = 0
-        hoy = datetime.today()
-
-        for _, row in df_jugador.iterrows():
-            fecha_inicio = row["fecha"]
-            fecha_alta = row["fecha_de_alta"]
-
-            if pd.notna(fecha_alta):
-                dias = (fecha_alta - fecha_inicio).days
-            else:
-                dias = (hoy - fecha_inicio).days
-
-            total_dias += max(dias, 0)  # evita valores negativos
-
+        total_dias = obtener_kpis_jugador(selected_player, path)["dias_lesionado"]
     else:
         total_dias = 0
 
@@ -92,46 +69,16 @@ def mostrar_kpi_dias_lesionado(selected_player: str):
         unsafe_allow_html=True
     )
 
-def mostrar_kpi_dias_lesion_seleccionada(selected_player: str, selected_event: str):
+def mostrar_kpi_dias_lesion_seleccionada(selected_player: str, selected_event: int, path: str = DATA_PATH):
     """
     Muestra días de la lesión seleccionada.
-    selected_event viene del selectbox 'Evento de lesión' y tiene formato:
-    'YYYY-MM-DD — <tipo_de_lesion> (<region>)'
+    selected_event viene del selectbox 'Evento de lesión' y es el id_evento entero
+    de la lesión, que se resuelve por acceso posicional directo.
     """
-    df = pd.read_csv(DATA_PATH, parse_dates=["fecha", "fecha_de_alta"])
-
     dias_lesion = 0
 
-    if selected_player and selected_event:
-        # Filtrar por jugador
-        df_j = df[df["jugador"] == selected_player].copy()
-
-        # Construir la MISMA clave que usa el filtro de eventos
-        df_j["evento_lesion"] = (
-            df_j["fecha"].dt.strftime("%Y-%m-%d") + " — " +
-            df_j["tipo_de_lesion"] + " (" + df_j["region"] + ")"
-        )
-
-        # Buscar el evento exacto (si hay duplicados, tomar el más reciente)
-        match = (
-            df_j[df_j["evento_lesion"] == selected_event]
-            .sort_values("fecha", ascending=False)
-            .head(1)
-        )
-
-        if not match.empty:
-            row = match.iloc[0]
-            fecha_inicio = row["fecha"]
-            fecha_alta = row["fecha_de_alta"]
-
-            if pd.notna(fecha_alta):
-                dias_lesion = (fecha_alta - fecha_inicio).days
-            else:
-                from datetime import datetime
-                hoy = pd.Timestamp(datetime.today().date())
-                dias_lesion = (hoy - fecha_inicio).days
-
-            dias_lesion = max(int(dias_lesion), 0)
+    if selected_player and selected_event is not None:
+        dias_lesion = obtener_dias_evento(selected_event, path)
 
     st.markdown(
         f"""
@@ -154,17 +101,14 @@ def mostrar_kpi_dias_lesion_seleccionada(selected_player: str, selected_event: s
         unsafe_allow_html=True
     )
 
-def mostrar_kpi_lesiones_activas(selected_player: str):
+def mostrar_kpi_lesiones_activas(selected_player: str, path: str = DATA_PATH):
     """
     Muestra una card con la cantidad de lesiones activas (sin fecha de alta) del jugador seleccionado.
     Respeta el estilo visual y colores corporativos del proyecto.
     """
 
-    df = pd.read_csv(DATA_PATH, parse_dates=["fecha", "fecha_de_alta"])
-
     if selected_player:
-        df_jugador = df[df["jugador"] == selected_player]
-        lesiones_activas = df_jugador["fecha_de_alta"].isna().sum()
+        lesiones_activas = obtener_kpis_jugador(selected_player, path)["lesiones_activas"]
     else:
         lesiones_activas = 0
 
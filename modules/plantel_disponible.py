@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+
+import pandas as pd
+import streamlit as st
+from config.settings import DATA_PATH
+from utils.fuente_utils import listar_jugadores
+from utils.intervalos_utils import obtener_lesionados_en_fecha, obtener_lesionados_en_rango, obtener_rango_fechas
+
+def _card_plantel(titulo: str, valor: int, color: str):
+    """Card con el mismo estilo que las KPI del jugador"""
+    st.markdown(
+        f"""
+        <div style="
+            background-color:#1f2937;
+            padding:12px 20px;
+            border-radius:10px;
+            text-align:center;
+            box-shadow: 0 0 8px rgba(0,0,0,0.3);
+            margin-top:10px;
+        ">
+            <p style="color:#d1d5db; font-size:20px; font-weight:500; margin-bottom:8px;">
+                {titulo}
+            </p>
+            <p style="color:{color}; font-size:30px; font-weight:bold; margin:0;">
+                {valor}
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+def _tabla_lesionados(lesiones: pd.DataFrame, referencia: pd.Timestamp) -> pd.DataFrame:
+    """Tabla para mostrar: una fila por lesión en curso, con los días de baja hasta la referencia (o el alta)"""
+    alta = lesiones["fecha_de_alta"]
+    fin = alta.fillna(referencia).clip(upper=referencia)
+    return pd.DataFrame({
+        "Jugador": lesiones["jugador"].astype(str).to_numpy(),
+        "Tipo de lesión": lesiones["tipo_de_lesion"].astype(object).fillna("N/A").to_numpy(),
+        "Región": lesiones["region"].astype(object).fillna("N/A").to_numpy(),
+        "Desde": lesiones["fecha"].dt.strftime("%Y-%m-%d").to_numpy(),
+        "Hasta": alta.dt.strftime("%Y-%m-%d").fillna("Activa").to_numpy(),
+        "Días de baja": (fin - lesiones["fecha"]).dt.days.to_numpy(),
+    })
+
+def mostrar_plantel_disponible(path: str = DATA_PATH):
+    """
+    Vista "plantel disponible en fecha": jugadores lesionados y disponibles en el día
+    elegido (o en algún día de un rango), resuelto con el índice de intervalos de baja
+    [fecha, fecha_de_alta) en tiempo logarítmico.
+    Los disponibles son los jugadores del registro que no estaban de baja.
+    """
+    rango = obtener_rango_fechas(path)
+    if rango is None:
+        st.warning("⚠️ No hay datos disponibles para consultar el plantel.")
+        return
+
+    # Por defecto hoy, o el último día con datos si la partición es de una temporada pasada
+    ultimo_dia = max(rango[1].date(), rango[0].date())
+    por_defecto = min(date.today(), ultimo_dia)
+
+    col_fecha, col_rango, col_hasta = st.columns([1.2, 0.8, 1.2])
+    with col_fecha:
+        fecha = st.date_input(
+            "Fecha",
+            value=por_defecto,
+            format="YYYY-MM-DD",
+            key="plantel_fecha",
+            help="Día a consultar: lesiones con inicio hasta ese día y alta posterior."
+        )
+    with col_rango:
+        st.markdown("<div style='height:28px'></div>", unsafe_allow_html=True)
+        usar_rango = st.checkbox("Rango de fechas", key="plantel_usar_rango")
+    hasta = fecha
+    if usar_rango:
+        with col_hasta:
+            hasta = st.date_input(
+                "Hasta",
+                value=fecha + timedelta(days=7),
+                format="YYYY-MM-DD",
+                key="plantel_hasta",
+                help="Se listan las lesiones en curso en algún día del rango."
+            )
+
+    if hasta < fecha:
+        st.warning("⚠️ La fecha final del rango es anterior a la inicial.")
+        return
+
+    if usar_rango:
+        lesiones = obtener_lesionados_en_rango(fecha, hasta, path)
+    else:
+        lesiones = obtener_lesionados_en_fecha(fecha, path)
+
+    jugadores = listar_jugadores(path)
+    lesionados = lesiones["jugador"].dropna().astype(str).unique()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        _card_plantel("Jugadores lesionados", len(lesionados), "#dc2626" if len(lesionados) else "#9ca3af")
+    with col2:
+        _card_plantel("Jugadores disponibles", len(jugadores) - len(lesionados), "#d1d5db")
+
+    st.markdown("<div style='height:15px'></div>", unsafe_allow_html=True)
+    if lesiones.empty:
+        st.info("✅ Ningún jugador del registro estaba lesionado en esa fecha.")
+        return
+
+    st.dataframe(
+        _tabla_lesionados(lesiones, pd.Timestamp(hasta)),
+        hide_index=True,
+        use_container_width=True
+    )
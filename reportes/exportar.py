@@ -0,0 +1,269 @@
+"""
+Exportación por lotes - Un reporte HTML autocontenido por jugador
+
+Uso:
+	python -m reportes.exportar [--jugadores "Apellido Nombre" ...] [--data lesiones_clean.csv]
+	                            [--salida data/reportes] [--procesos N] [--hoy AAAA-MM-DD]
+
+Cada reporte trae las KPIs del jugador (las mismas de las cards del dashboard, vía
+fuente_utils), la tabla de sus lesiones y una línea de tiempo en SVG; no depende de
+Streamlit ni de recursos externos. Los jugadores se reparten entre un pool de procesos:
+cada proceso carga el dataset una vez y renderiza su lote sin sesión de Streamlit.
+"""
+
+import argparse
+import hashlib
+import html
+import multiprocessing
+import os
+import re
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import pandas as pd
+
+from config.settings import DATA_PATH, REPORTES_DIR, REPORTES_PROCESOS
+from utils.fuente_utils import listar_jugadores, obtener_lesiones_jugador, obtener_kpis_jugador
+
+# Línea de tiempo: ancho del área de barras, alto de cada fila y del eje (px)
+_ANCHO_SVG = 900
+_ALTO_FILA = 16
+_ALTO_EJE = 22
+
+# Estado de cada proceso del pool (dataset, carpeta de salida y fecha de referencia)
+_trabajo = {}
+
+_PLANTILLA = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>Reporte de lesiones - {jugador}</title>
+<style>
+	body {{ background:#111827; color:#fafafa; font-family:'Inter', sans-serif; margin:30px; }}
+	.header {{ background:linear-gradient(90deg, #7f1d1d, #111827); border:1px solid rgba(220,38,38,0.3);
+		border-radius:8px; padding:12px 20px; }}
+	.header h1 {{ margin:0; font-size:32px; text-transform:uppercase; }}
+	.header p {{ margin:4px 0 0 0; color:#d1d5db; }}
+	h2 {{ color:#9ca3af; font-size:13px; text-transform:uppercase; letter-spacing:1px; margin:30px 0 4px 0; }}
+	hr {{ border:none; height:2px; background:linear-gradient(to right, #dc2626, #1f2937); margin:8px 0 20px 0; }}
+	.kpis {{ display:flex; gap:15px; }}
+	.kpi {{ flex:1; background:#1f2937; padding:12px 20px; border-radius:10px; text-align:center;
+		box-shadow:0 0 8px rgba(0,0,0,0.3); }}
+	.kpi p {{ margin:0; }}
+	.kpi .titulo {{ color:#d1d5db; font-size:18px; margin-bottom:8px; }}
+	.kpi .valor {{ font-size:30px; font-weight:bold; }}
+	table {{ border-collapse:collapse; width:100%; font-size:14px; }}
+	th, td {{ border-bottom:1px solid #333333; padding:6px 8px; text-align:left; }}
+	th {{ color:#9ca3af; }}
+</style>
+</head>
+<body>
+<div class="header">
+	<h1>{jugador}</h1>
+	<p>Reporte de lesiones - Club Atlético Colón · al {hoy}</p>
+</div>
+<h2>Indicadores del jugador</h2><hr>
+<div class="kpis">{kpis}</div>
+<h2>Línea de tiempo</h2><hr>
+{linea_de_tiempo}
+<h2>Lesiones</h2><hr>
+{tabla}
+</body>
+</html>
+"""
+
+def _slug(jugador):
+	"""El jugador sin acentos, mayúsculas ni signos (p. ej. castet_facundo)"""
+	ascii_ = unicodedata.normalize("NFKD", jugador).encode("ascii", "ignore").decode()
+	return re.sub(r"[^a-z0-9]+", "_", ascii_.lower()).strip("_") or "jugador"
+
+def nombres_archivo(plantel):
+	"""
+	Nombre de archivo del reporte de cada jugador del `plantel` (p. ej. castet_facundo.html).
+	Si varios nombres dan el mismo slug (acentos, mayúsculas o signos), todos llevan un
+	hash corto del nombre: ningún reporte pisa a otro y el nombre no depende del orden
+	ni de qué jugadores se exporten.
+	"""
+	slugs = {jugador: _slug(jugador) for jugador in plantel}
+	repetidos = {slug for slug, cantidad in Counter(slugs.values()).items() if cantidad > 1}
+	return {
+		jugador: (
+			f"{slug}_{hashlib.sha1(jugador.encode('utf-8')).hexdigest()[:6]}" if slug in repetidos else slug
+		) + ".html"
+		for jugador, slug in slugs.items()
+	}
+
+def _card_kpi(titulo, valor, color="#dc2626"):
+	"""Card de KPI con el mismo estilo que kpi_cards.py"""
+	return (
+		f"<div class='kpi'><p class='titulo'>{titulo}</p>"
+		f"<p class='valor' style='color:{color};'>{valor}</p></div>"
+	)
+
+def _svg_linea_de_tiempo(lesiones, dias):
+	"""
+	Línea de tiempo del jugador en SVG: una barra por lesión desde su fecha hasta el alta
+	(o hasta hoy si sigue activa), con el mismo largo en días que el KPI.
+	"""
+	inicios = pd.to_datetime(lesiones["fecha"]).reset_index(drop=True)
+	fines = inicios + pd.to_timedelta(dias, unit="D")
+	activas = lesiones["fecha_de_alta"].isna().to_numpy()
+	validas = inicios.notna().to_numpy()
+	if not validas.any():
+		return "<p>Sin fechas registradas.</p>"
+
+	desde = inicios[validas].min()
+	hasta = max(fines[validas].max(), desde + pd.Timedelta(days=1))
+	escala = _ANCHO_SVG / (hasta - desde).days
+
+	# Eje: inicio de cada año (o de cada mes si el rango es corto)
+	frecuencia = "MS" if (hasta - desde).days <= 400 else "YS"
+	formato = "%b %Y" if frecuencia == "MS" else "%Y"
+	marcas = []
+	for marca in pd.date_range(desde, hasta, freq=frecuencia):
+		x = (marca - desde).days * escala
+		marcas.append(
+			f"<line x1='{x:.1f}' x2='{x:.1f}' y1='0' y2='100%' stroke='#333333'/>"
+			f"<text x='{x + 3:.1f}' y='14' fill='#9ca3af' font-size='11'>{marca.strftime(formato)}</text>"
+		)
+
+	barras = []
+	tipos, regiones = _columna_texto(lesiones["tipo_de_lesion"]), _columna_texto(lesiones["region"])
+	for fila, (inicio, fin, activa) in enumerate(zip(inicios, fines, activas)):
+		if pd.isna(inicio):
+			continue
+		x = (inicio - desde).days * escala
+		ancho = max((fin - inicio).days * escala, 2)
+		y = _ALTO_EJE + fila * _ALTO_FILA
+		detalle = f"{inicio:%Y-%m-%d} · {tipos[fila]} ({regiones[fila]})"
+		barras.append(
+			f"<rect x='{x:.1f}' y='{y + 3}' width='{ancho:.1f}' height='{_ALTO_FILA - 6}' rx='2' "
+			f"fill='{'#f97316' if activa else '#dc2626'}'><title>{detalle}: {int(dias[fila])} días</title></rect>"
+		)
+
+	alto = _ALTO_EJE + len(inicios) * _ALTO_FILA
+	return (
+		f"<svg width='100%' viewBox='0 0 {_ANCHO_SVG} {alto}' preserveAspectRatio='none' "
+		f"style='background:#1f2937; border-radius:8px; height:{alto}px;'>"
+		+ "".join(marcas) + "".join(barras) + "</svg>"
+	)
+
+def _columna_texto(serie, vacio="N/A"):
+	"""Columna como lista de textos escapados para HTML (sin recorrer filas del DataFrame)"""
+	return [vacio if pd.isna(valor) else html.escape(str(valor)) for valor in serie.astype(object)]
+
+def _tabla_lesiones(lesiones, dias):
+	"""Tabla HTML de las lesiones del jugador (de la más reciente a la más antigua)"""
+	columnas = zip(
+		lesiones["fecha"].dt.strftime("%Y-%m-%d").fillna("N/A"),
+		lesiones["fecha_de_alta"].dt.strftime("%Y-%m-%d").fillna("Activa"),
+		dias,
+		_columna_texto(lesiones["tipo_de_lesion"]),
+		_columna_texto(lesiones["region"]),
+		_columna_texto(lesiones["lateralidad"]),
+		_columna_texto(lesiones["diagnostico"]),
+	)
+	filas = [
+		f"<tr><td>{desde}</td><td>{hasta}</td><td>{int(dias_evento)}</td><td>{tipo}</td>"
+		f"<td>{region}</td><td>{lateralidad}</td><td>{diagnostico}</td></tr>"
+		for desde, hasta, dias_evento, tipo, region, lateralidad, diagnostico in columnas
+	]
+	return (
+		"<table><tr><th>Desde</th><th>Hasta</th><th>Días</th><th>Tipo de lesión</th>"
+		"<th>Región</th><th>Lateralidad</th><th>Diagnóstico</th></tr>" + "".join(reversed(filas)) + "</table>"
+	)
+
+def renderizar_reporte(jugador, path=DATA_PATH, hoy=None):
+	"""HTML autocontenido del reporte de un jugador (KPIs, línea de tiempo y tabla de lesiones)"""
+	hoy = date.today() if hoy is None else hoy
+	kpis = obtener_kpis_jugador(jugador, path, hoy)
+	lesiones = obtener_lesiones_jugador(jugador, path)
+	dias = kpis["dias_por_evento"]
+
+	cards = "".join([
+		_card_kpi("Cantidad de lesiones", kpis["cantidad_lesiones"]),
+		_card_kpi("Días lesionado", kpis["dias_lesionado"]),
+		_card_kpi(
+			"Lesiones activas", kpis["lesiones_activas"],
+			"#dc2626" if kpis["lesiones_activas"] > 0 else "#9ca3af"
+		),
+	])
+	return _PLANTILLA.format(
+		jugador=html.escape(jugador),
+		hoy=f"{hoy:%Y-%m-%d}",
+		kpis=cards,
+		linea_de_tiempo=_svg_linea_de_tiempo(lesiones, dias),
+		tabla=_tabla_lesiones(lesiones, dias),
+	)
+
+def _inicializar_trabajador(path, salida, hoy):
+	"""Inicializador de cada proceso del pool: guarda el contexto y carga el dataset una vez"""
+	_trabajo.update(path=path, salida=salida, hoy=hoy)
+	listar_jugadores(path)
+
+def _exportar_jugador(jugador, nombre):
+	"""Renderiza y escribe el reporte de un jugador en `nombre` (se ejecuta dentro del pool)"""
+	ruta = os.path.join(_trabajo["salida"], nombre)
+	with open(ruta, "w", encoding="utf-8") as archivo:
+		archivo.write(renderizar_reporte(jugador, _trabajo["path"], _trabajo["hoy"]))
+	return ruta
+
+def exportar_reportes(jugadores=None, path=DATA_PATH, salida=REPORTES_DIR, hoy=None, procesos=REPORTES_PROCESOS):
+	"""
+	Exporta un reporte HTML por jugador (todos, o la lista indicada) en `salida`.
+	Con más de un proceso los jugadores se reparten en lotes entre un pool; todos los
+	reportes usan la misma fecha de referencia. Devuelve las rutas escritas.
+	"""
+	hoy = date.today() if hoy is None else hoy
+	# Carga (y deja al día los derivados: snapshot o base SQLite) antes de lanzar el pool
+	plantel = listar_jugadores(path)
+	if jugadores is None:
+		jugadores = plantel
+	else:
+		desconocidos = sorted(set(jugadores) - set(plantel))
+		if desconocidos:
+			raise ValueError(f"⚠️ Jugadores sin lesiones registradas en {path}: {', '.join(desconocidos)}")
+
+	# Nombres resueltos sobre todo el plantel antes de repartir: los slugs repetidos se desambiguan
+	nombres = nombres_archivo(plantel)
+	archivos = [nombres[jugador] for jugador in jugadores]
+
+	os.makedirs(salida, exist_ok=True)
+	procesos = max(1, min(procesos, len(jugadores)))
+	if procesos == 1:
+		_inicializar_trabajador(path, salida, hoy)
+		return [_exportar_jugador(jugador, nombre) for jugador, nombre in zip(jugadores, archivos)]
+
+	# "spawn": cada proceso abre sus propios archivos y conexiones (nada heredado del padre)
+	with ProcessPoolExecutor(
+		max_workers=procesos,
+		mp_context=multiprocessing.get_context("spawn"),
+		initializer=_inicializar_trabajador,
+		initargs=(path, salida, hoy),
+	) as pool:
+		lote = max(1, len(jugadores) // (procesos * 4))
+		return list(pool.map(_exportar_jugador, jugadores, archivos, chunksize=lote))
+
+def main(argv=None):
+	"""Punto de entrada de línea de comandos"""
+	parser = argparse.ArgumentParser(description="Exporta un reporte HTML de lesiones por jugador.")
+	parser.add_argument("--jugadores", nargs="+", help="Jugadores a exportar (por defecto, todo el plantel)")
+	parser.add_argument("--data", default=DATA_PATH, help="CSV limpio (o partición) de lesiones")
+	parser.add_argument("--salida", default=REPORTES_DIR, help="Carpeta de los reportes")
+	parser.add_argument("--procesos", type=int, default=REPORTES_PROCESOS, help="Procesos del pool")
+	parser.add_argument("--hoy", type=date.fromisoformat, help="Fecha de referencia de las lesiones activas (AAAA-MM-DD)")
+	args = parser.parse_args(argv)
+
+	inicio = time.perf_counter()
+	try:
+		rutas = exportar_reportes(args.jugadores, args.data, args.salida, args.hoy, args.procesos)
+	except ValueError as error:
+		parser.error(str(error))
+	print(f"✅ {len(rutas)} reportes -> {args.salida} ({time.perf_counter() - inicio:.1f} s)")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,67 @@
+"""
+Tests del ETL - Exportación particionada por temporada
+
+Uso:
+	python -m unittest tests.test_pipeline
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from etl.pipeline import exportar_particiones
+from utils.particiones_utils import listar_particiones
+
+def _planilla(*fechas):
+	"""Dataset limpio mínimo con una lesión por fecha de inicio"""
+	fechas = pd.to_datetime(list(fechas))
+	return pd.DataFrame({
+		"jugador": [f"Jugador {indice}" for indice in range(len(fechas))],
+		"fecha": fechas,
+		"fecha_de_alta": fechas + pd.Timedelta(days=10),
+		"tipo_de_lesion": "MUSCULOTENDINOSA",
+		"region": "ISQUIOTIBIALES",
+		"diagnostico": "DESGARRO",
+		"lateralidad": "DERECHO",
+		"dias_fuera": 10.0,
+		"jugador_original": [f"JUGADOR {indice}" for indice in range(len(fechas))],
+	})
+
+class ExportarParticionesTest(unittest.TestCase):
+	def setUp(self):
+		self.base = tempfile.mkdtemp(prefix="particiones_")
+		self.addCleanup(shutil.rmtree, self.base, ignore_errors=True)
+
+	def temporadas(self):
+		return sorted(temporada for temporada, _ in listar_particiones(self.base))
+
+	def test_planilla_de_la_temporada_actual_conserva_el_historico(self):
+		exportar_particiones(_planilla("2024-03-01", "2024-08-15"), "primera", self.base)
+		eliminadas = []
+		exportar_particiones(_planilla("2025-02-10"), "primera", self.base, eliminadas=eliminadas)
+
+		self.assertEqual(self.temporadas(), [2024, 2025])
+		self.assertEqual(eliminadas, [])
+		self.assertTrue(os.path.exists(listar_particiones(self.base)[(2024, "primera")]))
+
+	def test_temporada_cubierta_sin_filas_se_elimina(self):
+		exportar_particiones(_planilla("2023-05-01", "2024-03-01", "2025-02-10"), "primera", self.base)
+		eliminadas = []
+		exportar_particiones(_planilla("2023-05-01", "2025-02-10"), "primera", self.base, eliminadas=eliminadas)
+
+		self.assertEqual(self.temporadas(), [2023, 2025])
+		self.assertEqual(eliminadas, [2024])
+
+	def test_podar_elimina_las_temporadas_fuera_de_la_planilla(self):
+		exportar_particiones(_planilla("2024-03-01"), "primera", self.base)
+		exportar_particiones(_planilla("2024-03-01"), "reserva", self.base)
+		exportar_particiones(_planilla("2025-02-10"), "primera", self.base, podar=True)
+
+		self.assertEqual(sorted(listar_particiones(self.base)), [(2024, "reserva"), (2025, "primera")])
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,403 @@
+"""
+Agregados materializados del dataset - Conteos mantenidos incrementalmente por versión
+"""
+
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_PATH
+from utils.data_utils import cargar_lesiones, obtener_intervalos_eventos, obtener_version_dataset
+from utils.cambios_utils import filas_entrantes, filas_salientes, obtener_cambios_desde
+
+# Estado por (agregado, archivo): {"version", "tamano", "valor"} (compartido entre sesiones)
+_agregados = {}
+_lock_agregados = threading.Lock()
+
+# El cubo del ranking se actualiza en el lugar: actualizaciones y consultas lo toman con este lock
+_lock_cubo = threading.Lock()
+
+def _agregado_incremental(nombre, path, construir, aplicar):
+	"""
+	Devuelve el agregado `nombre` para la versión actual del dataset.
+	Si ya existe para una versión anterior y hay un change set hacia la actual (ingesta
+	incremental o filas agregadas al final del CSV), se aplica `aplicar(valor, cambios)`
+	tocando solo las claves afectadas; si no, se reconstruye con `construir(df)`.
+	"""
+	version = obtener_version_dataset(path)
+	with _lock_agregados:
+		estado = _agregados.get((nombre, path))
+		if estado is not None and estado["version"] == version:
+			return estado["valor"]
+
+		cambios = None
+		if estado is not None:
+			cambios = obtener_cambios_desde(path, estado["version"], estado["tamano"])
+
+		if cambios is not None:
+			valor = aplicar(estado["valor"], cambios)
+		else:
+			valor = construir(cargar_lesiones(path))
+
+		_agregados[(nombre, path)] = {"version": version, "tamano": os.stat(path).st_size, "valor": valor}
+		return valor
+
+# ========= CONTEOS POR CALENDARIO (MES, DÍA) ==========
+
+def _meses(fechas):
+	"""Inicio de mes de cada fecha (los nulos se descartan)"""
+	return fechas.dropna().dt.to_period("M").dt.to_timestamp()
+
+def _dias(fechas):
+	"""Día de cada fecha, sin hora (los nulos se descartan)"""
+	return fechas.dropna().dt.normalize()
+
+def _recortar_extremos(conteos):
+	"""
+	Quita los períodos en cero al principio y al final (tras restar filas eliminadas),
+	para que el calendario sea el mismo que el de una reconstrucción completa.
+	"""
+	con_lesiones = np.flatnonzero(conteos.to_numpy())
+	if not len(con_lesiones):
+		return conteos.iloc[:0]
+	return conteos.iloc[con_lesiones[0]:con_lesiones[-1] + 1]
+
+def _actualizar_calendario(conteos, periodos, signo, frecuencia):
+	"""
+	Suma o resta las apariciones de `periodos` a conteos con calendario completo de
+	`frecuencia`. Solo toca los períodos afectados; si caen fuera del rango actual, se
+	extiende el calendario completando con ceros, y los extremos en cero se recortan.
+	"""
+	delta = periodos.value_counts()
+	if delta.empty:
+		return conteos
+
+	inicio = min(conteos.index.min(), delta.index.min()) if len(conteos) else delta.index.min()
+	fin = max(conteos.index.max(), delta.index.max()) if len(conteos) else delta.index.max()
+	if len(conteos) == 0 or inicio < conteos.index.min() or fin > conteos.index.max():
+		calendario = pd.date_range(inicio, fin, freq=frecuencia, name=conteos.index.name)
+		conteos = conteos.reindex(calendario, fill_value=0)
+	else:
+		conteos = conteos.copy()
+
+	conteos.loc[delta.index] += signo * delta.to_numpy()
+	return _recortar_extremos(conteos)
+
+def actualizar_conteos_mensuales(conteos, fechas, signo=1):
+	"""Suma (signo=1) o resta (signo=-1) las lesiones de `fechas` a los conteos mensuales"""
+	return _actualizar_calendario(conteos, _meses(pd.Series(fechas)), signo, "MS")
+
+def actualizar_conteos_diarios(conteos, fechas, signo=1):
+	"""Suma (signo=1) o resta (signo=-1) las lesiones de `fechas` a los conteos diarios"""
+	return _actualizar_calendario(conteos, _dias(pd.Series(fechas)), signo, "D")
+
+def _conteos_calendario(nombre_indice, actualizar):
+	"""Par (construir, aplicar) para el conteo de lesiones iniciadas por período"""
+	def construir(df):
+		vacio = pd.Series(dtype="int64", index=pd.DatetimeIndex([], name=nombre_indice), name="cantidad_lesiones")
+		return actualizar(vacio, df["fecha"])
+
+	def aplicar(conteos, cambios):
+		conteos = actualizar(conteos, pd.to_datetime(filas_salientes(cambios)["fecha"]), signo=-1)
+		return actualizar(conteos, pd.to_datetime(filas_entrantes(cambios)["fecha"]))
+
+	return construir, aplicar
+
+def obtener_conteos_mensuales(path=DATA_PATH):
+	"""
+	Devuelve la serie de lesiones por mes (índice: inicio de mes, calendario completo).
+	Se construye una vez por versión del dataset; ante un change set solo se
+	actualizan los meses afectados. Solo lectura.
+	"""
+	return _agregado_incremental("mensual", path, *_conteos_calendario("mes", actualizar_conteos_mensuales))
+
+def obtener_conteos_diarios(path=DATA_PATH):
+	"""
+	Lesiones iniciadas por día (índice: día, calendario completo), mantenidas como los
+	conteos mensuales: ante un change set solo se actualizan los días afectados.
+	Solo lectura.
+	"""
+	return _agregado_incremental("diario", path, *_conteos_calendario("dia", actualizar_conteos_diarios))
+
+# ========= CONTEOS POR CATEGORÍA (JUGADOR, REGIÓN, TIPO) ==========
+
+def _contar_valores(valores):
+	"""
+	Apariciones de cada valor (sin nulos). Si `valores` es categórica se cuenta sobre
+	sus códigos enteros con bincount, sin hashear ni comparar strings.
+	"""
+	valores = pd.Series(valores)
+	if not isinstance(valores.dtype, pd.CategoricalDtype):
+		return valores.dropna().astype(object).value_counts()
+
+	codigos = valores.cat.codes.to_numpy()
+	categorias = valores.cat.categories
+	cantidades = np.bincount(codigos[codigos >= 0], minlength=len(categorias))
+	presentes = cantidades > 0
+	return pd.Series(cantidades[presentes], index=pd.Index(categorias[presentes].astype(object)))
+
+def actualizar_conteos(conteos, valores, signo=1):
+	"""
+	Suma o resta las apariciones de `valores` a una serie de conteos por clave.
+	Solo toca las claves afectadas; las que quedan en cero se eliminan.
+	"""
+	delta = _contar_valores(valores)
+	if delta.empty:
+		return conteos
+	nombre, nombre_indice = conteos.name, conteos.index.name
+	conteos = conteos.add(signo * delta, fill_value=0).astype("int64")
+	conteos = conteos[conteos > 0].rename(nombre)
+	conteos.index.name = nombre_indice
+	return conteos
+
+def _conteos_por_columna(columna):
+	"""Par (construir, aplicar) para el conteo de lesiones por `columna`"""
+	def construir(df):
+		vacio = pd.Series(dtype="int64", index=pd.Index([], dtype=object, name=columna), name="cantidad_lesiones")
+		return actualizar_conteos(vacio, df[columna]).sort_index()
+
+	def aplicar(conteos, cambios):
+		conteos = actualizar_conteos(conteos, filas_salientes(cambios)[columna], signo=-1)
+		return actualizar_conteos(conteos, filas_entrantes(cambios)[columna]).sort_index()
+
+	return construir, aplicar
+
+def obtener_conteos_jugador(path=DATA_PATH):
+	"""Cantidad de lesiones por jugador, mantenida incrementalmente (solo lectura)"""
+	return _agregado_incremental("jugador", path, *_conteos_por_columna("jugador"))
+
+def obtener_conteos_region(path=DATA_PATH):
+	"""Cantidad de lesiones por región corporal, mantenida incrementalmente (solo lectura)"""
+	return _agregado_incremental("region", path, *_conteos_por_columna("region"))
+
+def obtener_conteos_tipo(path=DATA_PATH):
+	"""Cantidad de lesiones por tipo de lesión, mantenida incrementalmente (solo lectura)"""
+	return _agregado_incremental("tipo_de_lesion", path, *_conteos_por_columna("tipo_de_lesion"))
+
+def seleccionar_top(valores, n):
+	"""
+	Posiciones de los `n` valores mayores (solo positivos), de mayor a menor y, ante
+	empates, por posición: np.argpartition acota los candidatos y solo ellos se ordenan.
+	"""
+	positivos = int((valores > 0).sum())
+	k = min(int(n), positivos)
+	if k <= 0:
+		return np.empty(0, dtype=np.int64)
+	umbral = valores[np.argpartition(valores, len(valores) - k)[len(valores) - k]]
+	# Todos los empatados con el k-ésimo entran como candidatos para desempatar por posición
+	candidatos = np.flatnonzero(valores >= umbral)
+	return candidatos[np.lexsort((candidatos, -valores[candidatos]))][:k]
+
+def obtener_ranking_jugadores(path=DATA_PATH, n=10):
+	"""Top `n` de jugadores por cantidad de lesiones (desempate alfabético: los conteos están ordenados por jugador)"""
+	conteos = obtener_conteos_jugador(path)
+	return conteos.iloc[seleccionar_top(conteos.to_numpy(), n)]
+
+# ========= RANKING FILTRABLE (CUBO JUGADOR × REGIÓN × TIPO) ==========
+
+def _posiciones(eje, valores):
+	"""
+	Posición de cada valor en `eje` (dict nombre -> posición, None para los nulos); los
+	valores nuevos se agregan al final del eje, así las posiciones existentes no cambian.
+	"""
+	codigos, unicos = pd.factorize(pd.Series(valores).astype(object), use_na_sentinel=False)
+	mapeo = np.array(
+		[eje.setdefault(None if pd.isna(valor) else valor, len(eje)) for valor in unicos], dtype=np.int64
+	)
+	return mapeo[codigos]
+
+def _reservar(cubo, forma):
+	"""
+	Asegura que los arreglos del cubo alcancen para `forma` (largo de cada eje). El eje
+	que se queda chico duplica su capacidad, así que agregar valores nuevos cuesta O(1)
+	amortizado; las posiciones sobrantes quedan en cero.
+	"""
+	actual = cubo["cantidad_lesiones"].shape
+	capacidad = tuple(largo if necesario <= largo else max(necesario, 2 * largo) for largo, necesario in zip(actual, forma))
+	if capacidad == actual:
+		return
+	for clave in ("cantidad_lesiones", "dias_perdidos"):
+		ampliado = np.zeros(capacidad, dtype=np.int64)
+		ampliado[tuple(slice(0, largo) for largo in actual)] = cubo[clave]
+		cubo[clave] = ampliado
+
+def actualizar_cubo(cubo, filas, signo=1):
+	"""
+	Suma o resta en el lugar el aporte de `filas` (con jugador) al cubo del ranking:
+	lesiones y días de las lesiones con alta por celda (jugador, región, tipo), y las
+	lesiones activas por celda y día de inicio, cuyos días dependen de la fecha de la
+	consulta. Cuesta lo que las filas más las lesiones activas (pocas); el orden
+	alfabético de los jugadores se recalcula solo si aparecen jugadores nuevos.
+	Quien llama debe tener _lock_cubo si el cubo ya es visible para las consultas.
+	"""
+	filas = filas[filas["jugador"].notna()]
+	if filas.empty:
+		return cubo
+
+	ejes = cubo["ejes"]
+	jugadores_antes = len(ejes[0])
+	celdas = tuple(
+		_posiciones(eje, filas[columna]) for eje, columna in zip(ejes, ("jugador", "region", "tipo_de_lesion"))
+	)
+	_reservar(cubo, tuple(len(eje) for eje in ejes))
+
+	inicios = pd.to_datetime(filas["fecha"]).to_numpy(dtype="datetime64[D]")
+	altas = pd.to_datetime(filas["fecha_de_alta"]).to_numpy(dtype="datetime64[D]")
+	sin_inicio, sin_alta = np.isnat(inicios), np.isnat(altas)
+	duracion = (altas - inicios).astype(np.int64)
+	np.add.at(cubo["cantidad_lesiones"], celdas, signo)
+	np.add.at(cubo["dias_perdidos"], celdas, signo * np.where(sin_inicio | sin_alta, 0, np.maximum(duracion, 0)))
+
+	es_activa = sin_alta & ~sin_inicio
+	if es_activa.any():
+		delta = pd.DataFrame({
+			"jugador": celdas[0][es_activa],
+			"region": celdas[1][es_activa],
+			"tipo_de_lesion": celdas[2][es_activa],
+			"inicio": inicios[es_activa].astype(np.int64),
+		}).value_counts()
+		activas = cubo["activas"].add(signo * delta, fill_value=0).astype("int64")
+		cubo["activas"] = activas[activas > 0]
+
+	if len(ejes[0]) != jugadores_antes:
+		nombres = np.array(list(ejes[0]), dtype=object)
+		cubo["orden_jugadores"] = np.argsort(nombres, kind="stable")
+		cubo["jugadores_ordenados"] = nombres[cubo["orden_jugadores"]].tolist()
+	return cubo
+
+def _construir_cubo(df):
+	"""Cubo del ranking a partir de todas las filas"""
+	vacio = {
+		"ejes": ({}, {}, {}),
+		"cantidad_lesiones": np.zeros((0, 0, 0), dtype=np.int64),
+		"dias_perdidos": np.zeros((0, 0, 0), dtype=np.int64),
+		"activas": pd.Series(dtype="int64", index=pd.MultiIndex.from_arrays(
+			[np.array([], dtype=np.int64)] * 4, names=["jugador", "region", "tipo_de_lesion", "inicio"]
+		)),
+		"orden_jugadores": np.empty(0, dtype=np.int64),
+		"jugadores_ordenados": [],
+	}
+	return actualizar_cubo(vacio, df)
+
+def _aplicar_cambios_cubo(cubo, cambios):
+	"""Actualiza en el lugar solo las celdas de las filas del change set"""
+	with _lock_cubo:
+		actualizar_cubo(cubo, filas_salientes(cambios), signo=-1)
+		return actualizar_cubo(cubo, filas_entrantes(cambios))
+
+def obtener_cubo_ranking(path=DATA_PATH):
+	"""Cubo del ranking filtrable, mantenido incrementalmente (leer con _lock_cubo)"""
+	return _agregado_incremental("cubo_ranking", path, _construir_cubo, _aplicar_cambios_cubo)
+
+def _seleccion(eje, elegidos):
+	"""Posiciones del eje para los valores elegidos (None: todas, incluidos los nulos)"""
+	if elegidos is None:
+		return np.arange(len(eje))
+	return np.array(sorted(eje[nombre] for nombre in elegidos if nombre in eje), dtype=np.int64)
+
+@lru_cache(maxsize=64)
+def _totales_cubo(path, version, metrica, dia_hoy, regiones, tipos):
+	"""Métrica por jugador (jugadores y valores en orden alfabético) sumando celdas del cubo"""
+	cubo = obtener_cubo_ranking(path)
+	with _lock_cubo:
+		eje_jugadores, eje_regiones, eje_tipos = cubo["ejes"]
+		filas_region = _seleccion(eje_regiones, regiones)
+		filas_tipo = _seleccion(eje_tipos, tipos)
+		valores = cubo[metrica][:len(eje_jugadores)][:, filas_region][:, :, filas_tipo].sum(axis=(1, 2))
+
+		if metrica == "dias_perdidos":
+			# Las lesiones activas suman los días hasta hoy desde su inicio
+			activas = cubo["activas"]
+			jugadores, regiones_activas, tipos_activas, inicios = (
+				activas.index.get_level_values(nivel).to_numpy() for nivel in range(4)
+			)
+			dentro = np.isin(regiones_activas, filas_region) & np.isin(tipos_activas, filas_tipo)
+			dias = np.maximum(dia_hoy - inicios[dentro], 0) * activas.to_numpy()[dentro]
+			valores = valores + np.bincount(jugadores[dentro], weights=dias, minlength=len(valores)).astype(np.int64)
+
+		# Orden alfabético precalculado con el cubo: la consulta no ordena jugadores
+		return cubo["jugadores_ordenados"], valores[cubo["orden_jugadores"]]
+
+@lru_cache(maxsize=8)
+def _eventos_por_inicio(path, version):
+	"""
+	Lesiones con jugador y fecha de inicio, ordenadas por inicio: jugador, región y tipo
+	como códigos (en orden alfabético; los nulos en la última posición de cada eje),
+	inicio y alta en días. Se arma por versión, solo para las consultas con rango de fechas.
+	"""
+	eventos = obtener_intervalos_eventos(path)
+	eventos = eventos[eventos["jugador"].notna() & eventos["fecha"].notna()]
+	inicios = eventos["fecha"].to_numpy(dtype="datetime64[D]").astype(np.int64)
+	orden = np.argsort(inicios, kind="stable")
+	altas = eventos["fecha_de_alta"].to_numpy(dtype="datetime64[D]")[orden]
+
+	resultado = {"inicio": inicios[orden], "alta": altas.astype(np.int64), "sin_alta": np.isnat(altas)}
+	for columna in ("jugador", "region", "tipo_de_lesion"):
+		codigos, nombres = pd.factorize(eventos[columna].astype(object), sort=True)
+		eje = {nombre: posicion for posicion, nombre in enumerate(nombres)}
+		eje[None] = len(nombres)
+		resultado[columna] = np.where(codigos >= 0, codigos, len(nombres))[orden]
+		resultado[f"eje_{columna}"] = eje
+	return resultado
+
+@lru_cache(maxsize=64)
+def _totales_rango(path, version, metrica, dia_hoy, regiones, tipos, desde, hasta):
+	"""
+	Métrica por jugador (en orden alfabético) de las lesiones iniciadas en [desde, hasta]:
+	un tramo contiguo del orden por inicio, recortado con búsqueda binaria.
+	"""
+	eventos = _eventos_por_inicio(path, version)
+	primera = 0 if desde is None else np.searchsorted(eventos["inicio"], desde, side="left")
+	ultima = len(eventos["inicio"]) if hasta is None else np.searchsorted(eventos["inicio"], hasta, side="right")
+	tramo = slice(primera, ultima)
+
+	dentro = np.ones(ultima - primera, dtype=bool)
+	for columna, elegidos in (("region", regiones), ("tipo_de_lesion", tipos)):
+		eje = eventos[f"eje_{columna}"]
+		elegido = np.zeros(len(eje), dtype=bool)
+		elegido[_seleccion(eje, elegidos)] = True
+		dentro &= elegido[eventos[columna][tramo]]
+
+	if metrica == "cantidad_lesiones":
+		valores = np.ones(int(dentro.sum()), dtype=np.int64)
+	else:
+		fin = np.where(eventos["sin_alta"][tramo], dia_hoy, eventos["alta"][tramo])
+		valores = np.maximum(fin - eventos["inicio"][tramo], 0)[dentro]
+
+	nombres = [nombre for nombre in eventos["eje_jugador"] if nombre is not None]
+	return nombres, np.bincount(
+		eventos["jugador"][tramo][dentro], weights=valores, minlength=len(nombres) + 1
+	).astype(np.int64)[:len(nombres)]
+
+def obtener_top_filtrado(
+	path=DATA_PATH, n=10, metrica="cantidad_lesiones",
+	regiones=None, tipos=None, desde=None, hasta=None, hoy=None,
+):
+	"""
+	Top `n` de jugadores por `metrica` con filtros ya normalizados (ver
+	utils/ranking_utils.py). Sin rango de fechas se suman celdas del cubo incremental;
+	con rango, el tramo de lesiones iniciadas en él. Desempate alfabético.
+	"""
+	from utils.intervalos_utils import fecha_a_dia  # import diferido: intervalos_utils usa fuente_utils
+
+	version = obtener_version_dataset(path)
+	dia_hoy = fecha_a_dia(hoy) if metrica == "dias_perdidos" else None
+	if desde is None and hasta is None:
+		jugadores, valores = _totales_cubo(path, version, metrica, dia_hoy, regiones, tipos)
+	else:
+		jugadores, valores = _totales_rango(
+			path, version, metrica, dia_hoy, regiones, tipos,
+			None if desde is None else fecha_a_dia(desde),
+			None if hasta is None else fecha_a_dia(hasta),
+		)
+
+	top = seleccionar_top(valores, n)
+	return pd.Series(
+		valores[top],
+		index=pd.Index([jugadores[posicion] for posicion in top], dtype=object, name="jugador"),
+		dtype="int64",
+		name=metrica,
+	)
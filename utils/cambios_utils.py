@@ -0,0 +1,148 @@
+"""
+Utilidades de cambios del dataset - Huellas por fila y change sets entre versiones
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_PATH, CAMBIOS_EXT
+from utils.data_utils import leer_filas_agregadas, obtener_version_dataset
+
+# Campos que identifican una lesión y campos que pueden actualizarse sin cambiar su identidad
+COLUMNAS_HUELLA = ["jugador", "fecha", "tipo_de_lesion", "region", "diagnostico"]
+COLUMNAS_CONTENIDO = ["fecha_de_alta", "lateralidad", "dias_fuera", "jugador_original"]
+
+PARTES_CAMBIOS = ["insertadas", "eliminadas", "actualizadas_antes", "actualizadas_despues"]
+
+def _normalizar(df, columnas):
+	"""Tipos canónicos para que el hash no dependa de cómo se leyó el archivo"""
+	normalizado = {}
+	for columna in columnas:
+		serie = df[columna] if columna in df.columns else pd.Series(index=df.index, dtype="object")
+		if columna in ("fecha", "fecha_de_alta"):
+			normalizado[columna] = pd.to_datetime(serie).astype("datetime64[ns]")
+		elif columna == "dias_fuera":
+			normalizado[columna] = pd.to_numeric(serie).astype("float64")
+		else:
+			normalizado[columna] = serie.astype("string")
+	return pd.DataFrame(normalizado, index=df.index)
+
+def _huella_identidad(df):
+	"""Huella uint64 de la lesión de cada fila (ver calcular_huellas)"""
+	claves = _normalizar(df, COLUMNAS_HUELLA)
+	base = pd.util.hash_pandas_object(claves, index=False)
+	ocurrencia = base.groupby(base.to_numpy()).cumcount()
+	return pd.util.hash_pandas_object(
+		pd.DataFrame({"base": base.to_numpy(), "ocurrencia": ocurrencia.to_numpy()}), index=False
+	).to_numpy()
+
+def calcular_huellas(df):
+	"""
+	Devuelve (huella, huella_contenido) por fila como arreglos uint64.
+	La huella identifica la lesión (jugador + fecha + tipo + región + diagnóstico; si hay
+	filas idénticas se distinguen por su número de aparición). La huella de contenido
+	detecta actualizaciones del resto de los campos (p. ej. la fecha de alta).
+	"""
+	contenido = pd.util.hash_pandas_object(_normalizar(df, COLUMNAS_CONTENIDO), index=False)
+	return _huella_identidad(df), contenido.to_numpy()
+
+def calcular_ids_evento(df):
+	"""
+	id_evento de cada fila: la huella de la lesión como entero de 64 bits con signo (entra
+	en un INTEGER de SQLite). No depende de la posición de la fila: agregar lesiones o
+	cambiar de partición no renumera las existentes, y ambos backends dan el mismo id.
+	Las filas idénticas se numeran por aparición, así que `df` debe venir ordenado por
+	(jugador, fecha).
+	"""
+	return _huella_identidad(df).view(np.int64)
+
+def calcular_cambios(df_anterior, df_nuevo):
+	"""
+	Compara dos versiones del dataset por huella de fila y devuelve el change set:
+	insertadas, eliminadas y actualizadas (antes y después), como DataFrames.
+	"""
+	huella_ant, contenido_ant = calcular_huellas(df_anterior)
+	huella_nue, contenido_nue = calcular_huellas(df_nuevo)
+
+	anterior = pd.Series(contenido_ant, index=huella_ant)
+	nuevo = pd.Series(contenido_nue, index=huella_nue)
+
+	en_nuevo = pd.Index(huella_ant).isin(huella_nue)
+	en_anterior = pd.Index(huella_nue).isin(huella_ant)
+	comunes = anterior.index[en_nuevo]
+	modificadas = comunes[anterior.loc[comunes].to_numpy() != nuevo.loc[comunes].to_numpy()]
+
+	return {
+		"insertadas": df_nuevo[~en_anterior],
+		"eliminadas": df_anterior[~en_nuevo],
+		"actualizadas_antes": df_anterior[pd.Index(huella_ant).isin(modificadas)],
+		"actualizadas_despues": df_nuevo[pd.Index(huella_nue).isin(modificadas)],
+	}
+
+def hay_cambios(cambios):
+	"""True si el change set contiene al menos una fila"""
+	return any(len(cambios[parte]) for parte in PARTES_CAMBIOS)
+
+def filas_salientes(cambios):
+	"""Filas cuyo aporte hay que restar de los agregados (eliminadas y versión previa de las actualizadas)"""
+	return pd.concat([cambios["eliminadas"], cambios["actualizadas_antes"]], ignore_index=True)
+
+def filas_entrantes(cambios):
+	"""Filas cuyo aporte hay que sumar a los agregados (insertadas y versión nueva de las actualizadas)"""
+	return pd.concat([cambios["insertadas"], cambios["actualizadas_despues"]], ignore_index=True)
+
+def jugadores_afectados(cambios):
+	"""Jugadores con alguna fila insertada, eliminada o actualizada"""
+	jugadores = pd.concat([cambios[parte]["jugador"] for parte in PARTES_CAMBIOS])
+	return set(jugadores.dropna())
+
+def ruta_cambios(path=DATA_PATH):
+	"""Ruta del último change set, junto al CSV"""
+	return os.path.splitext(path)[0] + CAMBIOS_EXT
+
+def guardar_cambios(path, cambios, version_anterior, version_nueva):
+	"""Persiste el change set entre dos versiones para que los procesos del dashboard lo apliquen"""
+	registro = {parte: cambios[parte] for parte in PARTES_CAMBIOS}
+	registro["version_anterior"] = version_anterior
+	registro["version_nueva"] = version_nueva
+
+	destino = ruta_cambios(path)
+	temporal = f"{destino}.{os.getpid()}.tmp"
+	with open(temporal, "wb") as archivo:
+		pickle.dump(registro, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+	os.replace(temporal, destino)
+
+def obtener_cambios_desde(path, version_anterior, tamano_anterior):
+	"""
+	Change set que lleva de `version_anterior` a la versión actual del archivo, o None.
+	Usa el change set persistido por la ingesta incremental si corresponde a esas
+	versiones; si no, detecta filas agregadas al final del CSV.
+	"""
+	version = obtener_version_dataset(path)
+	destino = ruta_cambios(path)
+	if os.path.exists(destino):
+		try:
+			with open(destino, "rb") as archivo:
+				registro = pickle.load(archivo)
+		except (OSError, pickle.UnpicklingError, EOFError):
+			registro = None
+		if registro and registro["version_anterior"] == version_anterior and registro["version_nueva"] == version:
+			return registro
+
+	agregadas = leer_filas_agregadas(path, version_anterior, tamano_anterior)
+	if agregadas is None or agregadas[1] != version:
+		return None
+
+	filas = agregadas[0]
+	vacio = filas.iloc[:0]
+	return {
+		"insertadas": filas,
+		"eliminadas": vacio,
+		"actualizadas_antes": vacio,
+		"actualizadas_despues": vacio,
+		"version_anterior": version_anterior,
+		"version_nueva": version,
+	}
@@ -0,0 +1,100 @@
+"""
+Carga lesional - Días perdidos por mes calendario (jugador × mes y región × mes)
+
+Cada lesión aporta los días de su intervalo [fecha, fecha_de_alta) (hasta hoy si sigue
+activa, igual que el KPI de días lesionado) al mes en que transcurren: una lesión de
+32 días que cruza un fin de mes reparte sus días entre ambos meses. El reparto es
+vectorizado (cada intervalo se parte en tramos por mes sin bucles de Python) y las
+matrices se calculan una vez por versión del dataset y fecha de referencia.
+"""
+
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_PATH
+from utils.data_utils import obtener_version_dataset
+from utils.fuente_utils import obtener_intervalos_eventos
+from utils.intervalos_utils import fecha_a_dia, fechas_a_dias
+
+def _mes_de_dia(dias):
+	"""Índice de mes (meses desde 1970-01) de cada día entero"""
+	return dias.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+
+def _dia_de_mes(meses):
+	"""Primer día (entero de días) de cada índice de mes"""
+	return meses.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+def repartir_por_mes(inicios, fines):
+	"""
+	Parte cada intervalo [inicio, fin) en enteros de días en tramos por mes calendario.
+	Devuelve (posición del intervalo, índice de mes, días del tramo) por tramo.
+	Los intervalos vacíos no generan tramos.
+	"""
+	inicios = np.asarray(inicios, dtype=np.int64)
+	fines = np.asarray(fines, dtype=np.int64)
+	validos = np.flatnonzero(fines > inicios)
+	inicios, fines = inicios[validos], fines[validos]
+
+	mes_inicio = _mes_de_dia(inicios)
+	tramos = _mes_de_dia(fines - 1) - mes_inicio + 1
+
+	# Cada intervalo se repite una vez por mes que toca; el desplazamiento es 0, 1, 2, ...
+	posicion = np.repeat(np.arange(len(inicios)), tramos)
+	desplazamiento = np.arange(int(tramos.sum())) - np.repeat(np.cumsum(tramos) - tramos, tramos)
+	mes = mes_inicio[posicion] + desplazamiento
+
+	dias = (
+		np.minimum(fines[posicion], _dia_de_mes(mes + 1))
+		- np.maximum(inicios[posicion], _dia_de_mes(mes))
+	)
+	return validos[posicion], mes, dias
+
+def _matriz(claves, nombres, meses, dias, mes_desde, n_meses, nombre_indice):
+	"""Suma los días por (clave, mes) con un bincount y arma el DataFrame clave × mes"""
+	matriz = np.bincount(
+		claves * n_meses + (meses - mes_desde), weights=dias, minlength=len(nombres) * n_meses
+	).astype(np.int64).reshape(len(nombres), n_meses)
+	columnas = pd.DatetimeIndex(_dia_de_mes(np.arange(mes_desde, mes_desde + n_meses)).astype("datetime64[D]"), name="mes")
+	return pd.DataFrame(matriz, index=pd.Index(list(nombres), dtype=object, name=nombre_indice), columns=columnas)
+
+@lru_cache(maxsize=8)
+def _carga_mensual(path, version, dia_hoy):
+	"""Matrices (jugador × mes, región × mes) de la versión `version` con referencia `dia_hoy`"""
+	eventos = obtener_intervalos_eventos(path)
+	inicios, sin_inicio = fechas_a_dias(eventos["fecha"])
+	fines, sin_alta = fechas_a_dias(eventos["fecha_de_alta"])
+	fines = np.where(sin_alta, dia_hoy, fines)
+
+	jugadores, nombres_jugadores = pd.factorize(eventos["jugador"], sort=True)
+	regiones, nombres_regiones = pd.factorize(eventos["region"].astype(object).fillna("Sin dato"), sort=True)
+	con_inicio = np.flatnonzero(~sin_inicio & (jugadores >= 0))
+
+	posicion, meses, dias = repartir_por_mes(inicios[con_inicio], fines[con_inicio])
+	if not len(meses):
+		vacio = pd.DataFrame(columns=pd.DatetimeIndex([], name="mes"), dtype="int64")
+		return vacio.rename_axis("jugador"), vacio.rename_axis("region")
+
+	filas = con_inicio[posicion]
+	mes_desde = int(meses.min())
+	n_meses = int(meses.max()) - mes_desde + 1
+	por_jugador = _matriz(jugadores[filas], nombres_jugadores, meses, dias, mes_desde, n_meses, "jugador")
+	por_region = _matriz(regiones[filas], nombres_regiones, meses, dias, mes_desde, n_meses, "region")
+	return por_jugador, por_region
+
+def obtener_carga_jugadores(path=DATA_PATH, hoy=None):
+	"""Matriz jugador × mes de días perdidos (columnas: inicio de mes, calendario completo). Solo lectura."""
+	return _carga_mensual(path, obtener_version_dataset(path), fecha_a_dia(hoy or date.today()))[0]
+
+def obtener_carga_regiones(path=DATA_PATH, hoy=None):
+	"""Matriz región × mes de días perdidos (columnas: inicio de mes, calendario completo). Solo lectura."""
+	return _carga_mensual(path, obtener_version_dataset(path), fecha_a_dia(hoy or date.today()))[1]
+
+def obtener_carga_jugador(jugador, path=DATA_PATH, hoy=None):
+	"""Días perdidos por mes de un jugador (serie con todos los meses del dataset; ceros si no tiene lesiones)"""
+	carga = obtener_carga_jugadores(path, hoy)
+	if jugador in carga.index:
+		return carga.loc[jugador]
+	return pd.Series(0, index=carga.columns, dtype="int64", name=jugador)
@@ -0,0 +1,33 @@
+"""
+Utilidades de gráficos - Cache de figuras Plotly por versión del dataset
+
+Los módulos de gráficos arman sus figuras con plotly.graph_objects, que Streamlit
+ya importa al arrancar (tema de Plotly), y no con plotly.express: importar express
+agregaba ~100 ms al import de app.py sin cambiar las figuras.
+"""
+
+from functools import lru_cache, wraps
+
+from config.settings import DATA_PATH
+from utils.data_utils import obtener_version_dataset
+
+def figura_cacheada(construir):
+	"""
+	Decorador para funciones que construyen una figura Plotly a partir del dataset.
+	La función recibe la ruta del dataset (o de la partición) como primer argumento.
+	Guarda la especificación serializada (fig.to_dict()) por versión del dataset y
+	parámetros del gráfico, compartida entre reruns y sesiones. La especificación es
+	de solo lectura y se pasa tal cual a st.plotly_chart.
+	Si la función devuelve None (sin datos), también se cachea None.
+	"""
+	@lru_cache(maxsize=32)
+	def _especificacion(version, path, *args, **kwargs):
+		fig = construir(path, *args, **kwargs)
+		return fig.to_dict() if fig is not None else None
+
+	@wraps(construir)
+	def envoltura(path=DATA_PATH, *args, **kwargs):
+		return _especificacion(obtener_version_dataset(path), path, *args, **kwargs)
+
+	envoltura.cache_clear = _especificacion.cache_clear
+	return envoltura
@@ -0,0 +1,285 @@
+"""
+Utilidades de acceso a datos - Carga única y compartida del dataset de lesiones
+"""
+
+import hashlib
+import io
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_PATH, COLUMNAS_FECHA, COLUMNAS_CATEGORICAS, SNAPSHOT_EXT
+
+# pyarrow es opcional: sin él se lee siempre el CSV
+try:
+	import pyarrow as pa
+except ImportError:
+	pa = None
+
+# Clave de metadata del snapshot con la versión del CSV del que proviene
+_META_VERSION = b"version_fuente"
+
+# Esquema compacto en memoria (pandas no admite datetime64[D]: segundos es la resolución mínima)
+TIPO_FECHA = "datetime64[s]"
+TIPO_DIAS = "Int16"
+
+@lru_cache(maxsize=32)
+def _hash_contenido(path, mtime_ns, size):
+	"""Calcula el hash del contenido del archivo (cacheado por mtime y tamaño)"""
+	sha = hashlib.sha1()
+	with open(path, "rb") as archivo:
+		for bloque in iter(lambda: archivo.read(1 << 20), b""):
+			sha.update(bloque)
+	return sha.hexdigest()
+
+def obtener_version_dataset(path=DATA_PATH):
+	"""
+	Devuelve la versión del dataset: el hash de su contenido.
+	El hash solo se recalcula cuando cambian mtime o tamaño del archivo, por lo que
+	en cada rerun el costo es un único os.stat().
+	"""
+	info = os.stat(path)
+	return _hash_contenido(path, info.st_mtime_ns, info.st_size)
+
+def aplicar_esquema(df):
+	"""
+	Tipa el dataset con el esquema compacto: categóricas (categorías ordenadas) para los
+	textos, fechas en segundos y dias_fuera como entero chico con nulos.
+	Las columnas que ya tienen el tipo correcto no se copian.
+	"""
+	tipos = {}
+	for columna in df.columns:
+		if columna in COLUMNAS_CATEGORICAS and not isinstance(df[columna].dtype, pd.CategoricalDtype):
+			tipos[columna] = "category"
+		elif columna in COLUMNAS_FECHA and df[columna].dtype != TIPO_FECHA:
+			tipos[columna] = TIPO_FECHA
+		elif columna == "dias_fuera" and df[columna].dtype != TIPO_DIAS:
+			tipos[columna] = TIPO_DIAS
+	if not tipos:
+		return df
+	df = df.copy(deep=False)
+	for columna, tipo in tipos.items():
+		serie = df[columna]
+		if tipo == TIPO_FECHA:
+			serie = pd.to_datetime(serie)
+		elif tipo == TIPO_DIAS:
+			serie = pd.to_numeric(serie).round()
+		df[columna] = serie.astype(tipo)
+	return df
+
+def ruta_snapshot(path=DATA_PATH):
+	"""Ruta del snapshot Arrow IPC que acompaña al CSV (mismo nombre, extensión .arrow)"""
+	return os.path.splitext(path)[0] + SNAPSHOT_EXT
+
+def _tipo_pandas_arrow(tipo):
+	"""Mantiene los textos como strings respaldados por Arrow (sin copiar el buffer mapeado)"""
+	if pa.types.is_string(tipo) or pa.types.is_large_string(tipo):
+		return pd.StringDtype("pyarrow")
+	if pa.types.is_int16(tipo):
+		return pd.Int16Dtype()  # dias_fuera con nulos, sin pasar por float64
+	return None
+
+def escribir_snapshot(path=DATA_PATH):
+	"""
+	Paso de ingesta: escribe un snapshot columnar Arrow IPC (Feather v2) junto al CSV.
+	Se escribe sin compresión para poder mapearlo en memoria sin copias, y guarda en
+	la metadata la versión del CSV de origen para detectar snapshots desactualizados.
+	Las categóricas se guardan como columnas diccionario, que se leen sin decodificar.
+	También guarda el id_evento de cada lesión, para no recalcular sus huellas al cargar.
+	"""
+	if pa is None:
+		raise ImportError("pyarrow es necesario para generar el snapshot Arrow")
+
+	version = obtener_version_dataset(path)
+	df = aplicar_esquema(pd.read_csv(path, parse_dates=COLUMNAS_FECHA))
+	# Se guarda ya ordenado por (jugador, fecha) para que el índice por jugador no reordene
+	df = df.take(_orden_jugador_fecha(df)).reset_index(drop=True)
+	df["id_evento"] = _calcular_ids_evento(df)
+	tabla = pa.Table.from_pandas(df, preserve_index=False)
+	metadata = dict(tabla.schema.metadata or {})
+	metadata[_META_VERSION] = version.encode()
+	tabla = tabla.replace_schema_metadata(metadata)
+
+	# Escritura atómica: los procesos que estén leyendo nunca ven un archivo a medias
+	destino = ruta_snapshot(path)
+	temporal = f"{destino}.{os.getpid()}.tmp"
+	with pa.OSFile(temporal, "wb") as salida:
+		with pa.ipc.new_file(salida, tabla.schema) as writer:
+			writer.write_table(tabla)
+	os.replace(temporal, destino)
+	return destino
+
+def _leer_snapshot(path, version):
+	"""
+	Mapea en memoria el snapshot Arrow si existe y corresponde a la versión del CSV.
+	Todos los procesos del servidor comparten las mismas páginas del page cache.
+	Devuelve None si el snapshot falta, está desactualizado o no se puede leer.
+	"""
+	destino = ruta_snapshot(path)
+	if pa is None or not os.path.exists(destino):
+		return None
+	try:
+		lector = pa.ipc.open_file(pa.memory_map(destino, "r"))
+		metadata = lector.schema.metadata or {}
+		if metadata.get(_META_VERSION) != version.encode():
+			return None
+		tabla = lector.read_all()
+	except (OSError, pa.ArrowInvalid):
+		return None
+	return tabla.to_pandas(types_mapper=_tipo_pandas_arrow)
+
+def leer_filas_agregadas(path, version_anterior, tamano_anterior):
+	"""
+	Detecta si el archivo actual es la versión anterior con filas agregadas al final.
+	Devuelve (filas nuevas, versión actual, tamaño actual) leyendo solo la cola del CSV,
+	o None si el archivo cambió de otra forma y hay que recalcular todo.
+	"""
+	sha = hashlib.sha1()
+	with open(path, "rb") as archivo:
+		encabezado = archivo.readline()
+		archivo.seek(0)
+		restante = tamano_anterior
+		ultimo_byte = b""
+		while restante > 0:
+			bloque = archivo.read(min(1 << 20, restante))
+			if not bloque:
+				return None
+			sha.update(bloque)
+			restante -= len(bloque)
+			ultimo_byte = bloque[-1:]
+		if sha.hexdigest() != version_anterior or ultimo_byte != b"\n":
+			return None
+		cola = archivo.read()
+
+	if not cola:
+		return None
+	sha.update(cola)
+	filas = aplicar_esquema(pd.read_csv(io.BytesIO(encabezado + cola), parse_dates=COLUMNAS_FECHA))
+	return filas, sha.hexdigest(), tamano_anterior + len(cola)
+
+@lru_cache(maxsize=4)
+def _leer_lesiones(path, version):
+	"""Lee y tipa el dataset una sola vez por versión del archivo (snapshot Arrow o CSV)"""
+	df = _leer_snapshot(path, version)
+	if df is None:
+		df = pd.read_csv(path, parse_dates=COLUMNAS_FECHA)
+	return aplicar_esquema(df)
+
+def cargar_lesiones(path=DATA_PATH):
+	"""
+	Devuelve el DataFrame de lesiones compartido por todos los módulos del dashboard.
+	El mismo objeto se reutiliza entre reruns y sesiones mientras el archivo no cambie:
+	es de solo lectura, los consumidores no deben modificarlo (usar .copy() o .assign()).
+	"""
+	return _leer_lesiones(path, obtener_version_dataset(path))
+
+def _orden_jugador_fecha(df):
+	"""Permutación que ordena por (jugador, fecha), con nulos al final como sort_values"""
+	if isinstance(df["jugador"].dtype, pd.CategoricalDtype) and df["jugador"].cat.categories.is_monotonic_increasing:
+		codigos = df["jugador"].cat.codes.to_numpy().astype(np.int64)
+	else:
+		codigos, _ = pd.factorize(df["jugador"], sort=True)
+	codigos = np.where(codigos < 0, np.iinfo(np.int64).max, codigos)
+	fechas = df["fecha"].to_numpy(dtype="datetime64[ns]")
+	claves_fecha = np.where(np.isnat(fechas), np.iinfo(np.int64).max, fechas.view("i8"))
+	return np.lexsort((claves_fecha, codigos))
+
+def _calcular_ids_evento(df):
+	"""id_evento de cada fila a partir de su huella (ver cambios_utils.calcular_ids_evento)"""
+	# Import local: cambios_utils importa este módulo
+	from utils.cambios_utils import calcular_ids_evento
+	return calcular_ids_evento(df)
+
+@lru_cache(maxsize=4)
+def _construir_indice_jugadores(path, version):
+	"""
+	Construye, una vez por versión del dataset, la tabla ordenada por (jugador, fecha)
+	y el índice jugador -> (inicio, fin) con el rango contiguo de sus filas.
+	Cada lesión tiene un id_evento entero derivado de su huella (el mismo en ambos
+	backends, y no cambia al agregar filas ni al cambiar de partición; viene del snapshot
+	si existe) y su etiqueta descriptiva precalculada, para no reconstruir strings en
+	cada rerun.
+	"""
+	df = _leer_lesiones(path, version)
+	orden = _orden_jugador_fecha(df)
+	if not np.array_equal(orden, np.arange(len(df))):
+		df = df.take(orden)
+	df = df.reset_index(drop=True)
+
+	if "id_evento" not in df.columns:
+		df["id_evento"] = _calcular_ids_evento(df)
+	df["evento_lesion"] = (
+		df["fecha"].dt.strftime("%Y-%m-%d").fillna("") + " — " +
+		df["tipo_de_lesion"].astype(str) + " (" + df["region"].astype(str) + ")"
+	)
+
+	# Rangos por jugador sobre los códigos de la categórica (sin comparar strings)
+	codigos = df["jugador"].cat.codes.to_numpy()
+	jugadores = df["jugador"].cat.categories
+	cortes = np.flatnonzero(np.diff(codigos)) + 1
+	inicios = np.concatenate(([0], cortes))
+	fines = np.concatenate((cortes, [len(df)]))
+
+	indice = {
+		jugadores[codigos[inicio]]: (int(inicio), int(fin))
+		for inicio, fin in zip(inicios[:len(df)], fines[:len(df)])
+		if codigos[inicio] >= 0
+	}
+	return df, indice
+
+def obtener_indice_jugadores(path=DATA_PATH):
+	"""Devuelve (tabla ordenada por jugador y fecha, índice jugador -> (inicio, fin))"""
+	return _construir_indice_jugadores(path, obtener_version_dataset(path))
+
+def listar_jugadores(path=DATA_PATH):
+	"""Lista ordenada de jugadores con al menos una lesión registrada"""
+	_, indice = obtener_indice_jugadores(path)
+	return list(indice)
+
+def obtener_lesiones_jugador(jugador, path=DATA_PATH):
+	"""
+	Devuelve las lesiones del jugador ordenadas por fecha, sin recorrer toda la tabla:
+	búsqueda O(1) en el índice y un slice de sus filas contiguas (solo lectura).
+	"""
+	df, indice = obtener_indice_jugadores(path)
+	inicio, fin = indice.get(jugador, (0, 0))
+	return df.iloc[inicio:fin]
+
+@lru_cache(maxsize=4)
+def _posiciones_eventos(path, version):
+	"""Índice hash id_evento -> posición de la lesión en la tabla ordenada"""
+	df, _ = _construir_indice_jugadores(path, version)
+	return pd.Index(df["id_evento"].to_numpy())
+
+def obtener_posicion_evento(id_evento, path=DATA_PATH):
+	"""Posición de la lesión en la tabla ordenada (KeyError si el id no existe en `path`)"""
+	return _posiciones_eventos(path, obtener_version_dataset(path)).get_loc(int(id_evento))
+
+def obtener_evento(id_evento, path=DATA_PATH):
+	"""Fila de la lesión con ese id_evento (búsqueda O(1) en el índice de ids)"""
+	df, _ = obtener_indice_jugadores(path)
+	return df.iloc[obtener_posicion_evento(id_evento, path)]
+
+def obtener_etiqueta_evento(id_evento, path=DATA_PATH):
+	"""Etiqueta precalculada 'YYYY-MM-DD — <tipo_de_lesion> (<region>)' del evento"""
+	df, _ = obtener_indice_jugadores(path)
+	return df["evento_lesion"].iat[obtener_posicion_evento(id_evento, path)]
+
+def obtener_eventos(ids, path=DATA_PATH):
+	"""Filas de varias lesiones por id_evento, sin repetidos y ordenadas por (jugador, fecha)"""
+	df, _ = obtener_indice_jugadores(path)
+	posiciones = _posiciones_eventos(path, obtener_version_dataset(path)).get_indexer(np.asarray(ids, dtype=np.int64))
+	return df.take(np.unique(posiciones[posiciones >= 0]))
+
+def obtener_intervalos_eventos(path=DATA_PATH):
+	"""id_evento, jugador, region, tipo_de_lesion, fecha y fecha_de_alta de todas las lesiones (índices, líneas de tiempo y ranking)"""
+	df, _ = obtener_indice_jugadores(path)
+	return df[["id_evento", "jugador", "region", "tipo_de_lesion", "fecha", "fecha_de_alta"]]
+
+
+if __name__ == "__main__":
+	# Ingesta: python -m utils.data_utils [ruta_csv]
+	import sys
+	print(escribir_snapshot(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH))
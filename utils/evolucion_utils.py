@@ -0,0 +1,76 @@
+"""
+Evolución de lesiones - Conteo diario de inicios y remuestreo por resolución
+
+Las resoluciones del gráfico evolutivo (día, semana, temporada) se obtienen en el
+servidor de los conteos diarios de lesiones iniciadas (calendario completo, días sin
+lesiones en 0) con una suma por tramos contiguos, sin volver a recorrer las filas. La
+resolución mensual es directamente el agregado de conteos mensuales. Ambos agregados
+se mantienen incrementalmente: ante un change set solo se actualizan los días y meses
+afectados.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_PATH
+from utils.data_utils import obtener_version_dataset
+from utils.fuente_utils import obtener_conteos_diarios, obtener_conteos_mensuales
+
+# Resoluciones del gráfico evolutivo, de la más fina a la más gruesa (clave -> nombre visible)
+RESOLUCIONES = OrderedDict([
+	("dia", "Día"),
+	("semana", "Semana"),
+	("mes", "Mes"),
+	("temporada", "Temporada"),
+])
+
+def inicio_de_tramo(dias, resolucion):
+	"""
+	Primer día (entero de días) del tramo de cada día: el mismo día, el lunes de su
+	semana, el día 1 de su mes o el 1 de enero de su temporada (año calendario).
+	"""
+	if resolucion == "dia":
+		return dias
+	if resolucion == "semana":
+		# 1970-01-01 fue jueves: (día + 3) % 7 es 0 los lunes
+		return dias - (dias + 3) % 7
+	unidad = {"mes": "datetime64[M]", "temporada": "datetime64[Y]"}[resolucion]
+	return dias.astype("datetime64[D]").astype(unidad).astype("datetime64[D]").astype(np.int64)
+
+@lru_cache(maxsize=32)
+def _remuestrear(path, version, resolucion):
+	"""Conteos por tramo de la resolución pedida (índice: inicio de cada tramo)"""
+	diarios = obtener_conteos_diarios(path)
+	conteos = diarios.to_numpy()
+	tramos = inicio_de_tramo(diarios.index.to_numpy().astype("datetime64[D]").astype(np.int64), resolucion)
+	# Los días son consecutivos: cada tramo es un bloque contiguo del arreglo diario
+	inicios_tramo, cortes = np.unique(tramos, return_index=True)
+	valores = np.add.reduceat(conteos, cortes) if len(conteos) else conteos
+	return pd.Series(
+		valores,
+		index=pd.DatetimeIndex(inicios_tramo.astype("datetime64[D]"), name=resolucion),
+		name="cantidad_lesiones",
+	)
+
+def obtener_evolucion(path=DATA_PATH, resolucion="mes"):
+	"""Lesiones iniciadas por tramo de `resolucion` (calendario completo), cacheado por versión"""
+	if resolucion not in RESOLUCIONES:
+		raise ValueError(f"⚠️ Resolución desconocida: {resolucion!r} (usar {', '.join(RESOLUCIONES)})")
+	if resolucion == "mes":
+		# El agregado mensual ya es esta serie: no se remuestrea desde los días
+		return obtener_conteos_mensuales(path)
+	return _remuestrear(path, obtener_version_dataset(path), resolucion)
+
+def resolucion_efectiva(path=DATA_PATH, resolucion="mes", max_puntos=None):
+	"""
+	La resolución pedida, o la primera más gruesa cuya serie no supera `max_puntos`
+	(sin límite si es None): acota el tamaño de lo que se envía al navegador.
+	"""
+	claves = list(RESOLUCIONES)
+	for clave in claves[claves.index(resolucion):]:
+		if max_puntos is None or len(obtener_evolucion(path, clave)) <= max_puntos:
+			return clave
+	return claves[-1]
@@ -0,0 +1,51 @@
+"""
+Fuente de datos del dashboard - Interfaz única sobre el backend configurado
+
+Filtros, KPIs y gráficos consultan los datos solo a través de estas funciones.
+BACKEND_DATOS (config/settings.py o LESIONES_BACKEND) elige la implementación:
+- "pandas": data_utils, kpi_utils y aggregate_utils sobre el dataset en memoria
+- "sqlite": sqlite_utils, consultas indexadas sobre la base local derivada del CSV
+Todas las funciones reciben la ruta del CSV (o de la partición) como `path`.
+"""
+
+from config.settings import BACKEND_DATOS
+
+if BACKEND_DATOS == "sqlite":
+	from utils.sqlite_utils import (
+		listar_jugadores,
+		obtener_lesiones_jugador,
+		obtener_evento,
+		obtener_etiqueta_evento,
+		obtener_eventos,
+		obtener_intervalos_eventos,
+		obtener_kpis_jugador,
+		obtener_dias_evento,
+		obtener_conteos_mensuales,
+		obtener_conteos_diarios,
+		obtener_conteos_jugador,
+		obtener_conteos_region,
+		obtener_conteos_tipo,
+		obtener_ranking_jugadores,
+		obtener_top_filtrado,
+	)
+elif BACKEND_DATOS == "pandas":
+	from utils.data_utils import (
+		listar_jugadores,
+		obtener_lesiones_jugador,
+		obtener_evento,
+		obtener_etiqueta_evento,
+		obtener_eventos,
+		obtener_intervalos_eventos,
+	)
+	from utils.kpi_utils import obtener_kpis_jugador, obtener_dias_evento
+	from utils.aggregate_utils import (
+		obtener_conteos_mensuales,
+		obtener_conteos_diarios,
+		obtener_conteos_jugador,
+		obtener_conteos_region,
+		obtener_conteos_tipo,
+		obtener_ranking_jugadores,
+		obtener_top_filtrado,
+	)
+else:
+	raise ValueError(f"⚠️ Backend de datos desconocido: {BACKEND_DATOS!r} (usar 'pandas' o 'sqlite')")
@@ -0,0 +1,255 @@
+"""
+Índice de intervalos de baja - ¿Quién estaba lesionado en una fecha o un rango?
+
+Cada lesión es el intervalo semiabierto [fecha, fecha_de_alta) en días; las lesiones
+sin alta quedan abiertas hacia el futuro. El índice es un árbol de intervalos centrado
+guardado en arreglos de NumPy y se construye una vez por versión del dataset:
+- consulta puntual (stabbing): O(log n + k), una búsqueda binaria por nivel del árbol
+- consulta de superposición con [desde, hasta): O(log n + k)
+donde k es la cantidad de lesiones devueltas. Funciona con cualquier backend de datos.
+
+La línea de tiempo de bajas (jugadores lesionados por día) se calcula con un barrido
+sobre los eventos +1 en cada inicio y -1 en cada fin, sin recorrer día por lesión.
+"""
+
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_PATH
+from utils.data_utils import obtener_version_dataset
+from utils.fuente_utils import obtener_eventos, obtener_intervalos_eventos
+
+# Fin de las lesiones activas (sin fecha de alta): abiertas hacia el futuro
+_SIN_ALTA = np.iinfo(np.int64).max
+
+def fechas_a_dias(fechas):
+	"""Fechas como enteros de días desde 1970-01-01, más la máscara de nulos (NaT)"""
+	dias = pd.Series(fechas).to_numpy(dtype="datetime64[D]")
+	return dias.astype(np.int64), np.isnat(dias)
+
+def fecha_a_dia(fecha):
+	"""Una fecha (date, Timestamp o string) como entero de días"""
+	return int(np.datetime64(pd.Timestamp(fecha).date(), "D").astype(np.int64))
+
+def construir_indice_intervalos(ids, inicios, fines):
+	"""
+	Construye el árbol de intervalos centrado sobre [inicios, fines) (enteros de días).
+	Se descartan los intervalos vacíos (alta el mismo día o antes del inicio).
+
+	Cada nodo guarda las lesiones que contienen su centro, ordenadas por inicio
+	ascendente y por fin descendente, en tramos contiguos de arreglos globales; a la
+	izquierda quedan las que terminan antes del centro y a la derecha las que empiezan
+	después. El centro es la mediana de los inicios, así que cada hijo tiene a lo
+	sumo la mitad de las lesiones y la profundidad es O(log n).
+	"""
+	ids = np.asarray(ids, dtype=np.int64)
+	inicios = np.asarray(inicios, dtype=np.int64)
+	fines = np.asarray(fines, dtype=np.int64)
+	validos = fines > inicios
+	ids, inicios, fines = ids[validos], inicios[validos], fines[validos]
+
+	centros, izquierdos, derechos, desdes, hastas = [], [], [], [], []
+	por_inicio, ids_por_inicio, por_fin, ids_por_fin = [], [], [], []
+	offset = 0
+
+	# Pila de (posiciones del subconjunto, nodo padre, lado); lado 0 = izquierdo, 1 = derecho
+	pila = [(np.arange(len(ids)), -1, 0)] if len(ids) else []
+	while pila:
+		posiciones, padre, lado = pila.pop()
+		nodo = len(centros)
+		if padre >= 0:
+			(izquierdos if lado == 0 else derechos)[padre] = nodo
+
+		inicio_sub, fin_sub = inicios[posiciones], fines[posiciones]
+		centro = int(np.partition(inicio_sub, len(inicio_sub) // 2)[len(inicio_sub) // 2])
+		contiene = (inicio_sub <= centro) & (fin_sub > centro)
+
+		aqui = posiciones[contiene]
+		orden_inicio = aqui[np.argsort(inicios[aqui], kind="stable")]
+		orden_fin = aqui[np.argsort(-fines[aqui], kind="stable")]
+		por_inicio.append(inicios[orden_inicio])
+		ids_por_inicio.append(ids[orden_inicio])
+		por_fin.append(-fines[orden_fin])  # Negado: fin descendente como arreglo ascendente
+		ids_por_fin.append(ids[orden_fin])
+
+		centros.append(centro)
+		izquierdos.append(-1)
+		derechos.append(-1)
+		desdes.append(offset)
+		offset += len(aqui)
+		hastas.append(offset)
+
+		antes = posiciones[fin_sub <= centro]
+		despues = posiciones[inicio_sub > centro]
+		if len(antes):
+			pila.append((antes, nodo, 0))
+		if len(despues):
+			pila.append((despues, nodo, 1))
+
+	vacio = np.empty(0, dtype=np.int64)
+	orden_global = np.argsort(inicios, kind="stable")
+	return {
+		"centro": np.array(centros, dtype=np.int64),
+		"izquierdo": np.array(izquierdos, dtype=np.int64),
+		"derecho": np.array(derechos, dtype=np.int64),
+		"desde": np.array(desdes, dtype=np.int64),
+		"hasta": np.array(hastas, dtype=np.int64),
+		"por_inicio": np.concatenate(por_inicio) if por_inicio else vacio,
+		"ids_por_inicio": np.concatenate(ids_por_inicio) if ids_por_inicio else vacio,
+		"por_fin": np.concatenate(por_fin) if por_fin else vacio,
+		"ids_por_fin": np.concatenate(ids_por_fin) if ids_por_fin else vacio,
+		# Todos los inicios ordenados, para la parte "empieza dentro del rango" de la superposición
+		"inicios": inicios[orden_global],
+		"ids": ids[orden_global],
+		"rango": (int(inicios.min()), int(np.where(fines == _SIN_ALTA, inicios, fines).max())) if len(ids) else None,
+	}
+
+def consultar_en_dia(indice, dia):
+	"""Ids de las lesiones que contienen el día `dia` (entero de días), sin orden"""
+	resultados = []
+	nodo = 0 if len(indice["centro"]) else -1
+	while nodo >= 0:
+		desde, hasta = indice["desde"][nodo], indice["hasta"][nodo]
+		if dia < indice["centro"][nodo]:
+			# Todas terminan después del centro: basta con que hayan empezado
+			cantidad = np.searchsorted(indice["por_inicio"][desde:hasta], dia, side="right")
+			resultados.append(indice["ids_por_inicio"][desde:desde + cantidad])
+			nodo = indice["izquierdo"][nodo]
+		else:
+			# Todas empezaron antes del centro: basta con que terminen después del día
+			cantidad = np.searchsorted(indice["por_fin"][desde:hasta], -dia, side="left")
+			resultados.append(indice["ids_por_fin"][desde:desde + cantidad])
+			nodo = indice["derecho"][nodo]
+	return np.concatenate(resultados) if resultados else np.empty(0, dtype=np.int64)
+
+def consultar_superpuestas(indice, dia_desde, dia_hasta):
+	"""
+	Ids de las lesiones que se superponen con [dia_desde, dia_hasta): las que contienen
+	dia_desde más las que empiezan dentro del rango (conjuntos disjuntos).
+	"""
+	if dia_hasta <= dia_desde:
+		return np.empty(0, dtype=np.int64)
+	primera = np.searchsorted(indice["inicios"], dia_desde, side="right")
+	ultima = np.searchsorted(indice["inicios"], dia_hasta, side="left")
+	return np.concatenate((consultar_en_dia(indice, dia_desde), indice["ids"][primera:ultima]))
+
+@lru_cache(maxsize=8)
+def _indice_intervalos(path, version):
+	"""Índice de intervalos de la versión `version` del dataset"""
+	eventos = obtener_intervalos_eventos(path)
+	inicios, sin_inicio = fechas_a_dias(eventos["fecha"])
+	fines, sin_alta = fechas_a_dias(eventos["fecha_de_alta"])
+	fines = np.where(sin_alta, _SIN_ALTA, fines)
+	con_inicio = ~sin_inicio
+	return construir_indice_intervalos(
+		eventos["id_evento"].to_numpy()[con_inicio], inicios[con_inicio], fines[con_inicio]
+	)
+
+def obtener_indice_intervalos(path=DATA_PATH):
+	"""Índice de intervalos de la versión actual del dataset (construido una vez por versión)"""
+	return _indice_intervalos(path, obtener_version_dataset(path))
+
+def obtener_rango_fechas(path=DATA_PATH):
+	"""(primer inicio, último fin conocido) de las lesiones como Timestamps, o None si no hay"""
+	rango = obtener_indice_intervalos(path)["rango"]
+	if rango is None:
+		return None
+	return tuple(pd.Timestamp(np.datetime64(dia, "D")) for dia in rango)
+
+def obtener_lesionados_en_fecha(fecha, path=DATA_PATH):
+	"""Lesiones en curso en `fecha` (fecha <= día < fecha_de_alta), ordenadas por jugador y fecha"""
+	ids = consultar_en_dia(obtener_indice_intervalos(path), fecha_a_dia(fecha))
+	return obtener_eventos(ids, path)
+
+def obtener_lesionados_en_rango(desde, hasta, path=DATA_PATH):
+	"""Lesiones en curso en algún día entre `desde` y `hasta` (ambos inclusive)"""
+	ids = consultar_superpuestas(obtener_indice_intervalos(path), fecha_a_dia(desde), fecha_a_dia(hasta) + 1)
+	return obtener_eventos(ids, path)
+
+# ========= LÍNEA DE TIEMPO DE BAJAS (SWEEP-LINE) ==========
+
+def fusionar_por_clave(claves, inicios, fines):
+	"""
+	Une los intervalos superpuestos de una misma clave (p. ej. un jugador con dos lesiones
+	a la vez) para contarla una sola vez. Ordena por (clave, inicio) y abre un tramo nuevo
+	cuando el inicio supera el fin máximo acumulado de la clave. O(n log n).
+	Devuelve (claves, inicios, fines) de los tramos fusionados.
+	"""
+	orden = np.lexsort((inicios, claves))
+	claves, inicios, fines = claves[orden], inicios[orden], fines[orden]
+	if not len(claves):
+		return claves, inicios, fines
+
+	nueva_clave = np.concatenate(([True], claves[1:] != claves[:-1]))
+	fin_maximo = pd.Series(fines).groupby(np.cumsum(nueva_clave)).cummax().to_numpy()
+	corte = nueva_clave.copy()
+	corte[1:] |= inicios[1:] > fin_maximo[:-1]
+
+	posiciones = np.flatnonzero(corte)
+	return claves[posiciones], inicios[posiciones], np.maximum.reduceat(fines, posiciones)
+
+def barrer_intervalos(inicios, fines, dia_desde, dia_hasta, grupos=None, n_grupos=1):
+	"""
+	Intervalos activos en cada día de [dia_desde, dia_hasta) con un barrido: +1 en cada
+	inicio y -1 en cada fin, acumulados en orden de día. Los eventos se ordenan por día
+	con un conteo (bincount) y el barrido es una suma acumulada: O(n + días).
+	Devuelve una matriz (grupo, día); sin `grupos`, una sola fila.
+	"""
+	largo = max(int(dia_hasta - dia_desde), 0)
+	grupos = np.zeros(len(inicios), dtype=np.int64) if grupos is None else np.asarray(grupos, dtype=np.int64)
+	inicio_rel = np.clip(inicios - dia_desde, 0, largo)
+	fin_rel = np.clip(fines - dia_desde, 0, largo)
+
+	ancho = largo + 1
+	total = n_grupos * ancho
+	delta = (
+		np.bincount(grupos * ancho + inicio_rel, minlength=total)
+		- np.bincount(grupos * ancho + fin_rel, minlength=total)
+	)
+	return np.cumsum(delta.reshape(n_grupos, ancho), axis=1)[:, :largo]
+
+@lru_cache(maxsize=8)
+def _lesionados_por_dia(path, version, dia_hoy, por_region):
+	"""Línea de tiempo de la versión `version`; las lesiones sin alta siguen abiertas hasta `dia_hoy`"""
+	eventos = obtener_intervalos_eventos(path)
+	inicios, sin_inicio = fechas_a_dias(eventos["fecha"])
+	fines, sin_alta = fechas_a_dias(eventos["fecha_de_alta"])
+	fines = np.where(sin_alta, dia_hoy + 1, fines)
+
+	jugadores, _ = pd.factorize(eventos["jugador"])
+	validos = ~sin_inicio & (fines > inicios) & (jugadores >= 0)
+	jugadores, inicios, fines = jugadores[validos], inicios[validos], fines[validos]
+
+	if por_region:
+		regiones = eventos["region"].astype(object).fillna("Sin dato").to_numpy()[validos]
+		codigos_region, nombres = pd.factorize(regiones, sort=True)
+		columnas = list(nombres)
+	else:
+		codigos_region = np.zeros(len(jugadores), dtype=np.int64)
+		columnas = ["lesionados"]
+
+	if not len(jugadores):
+		return pd.DataFrame(columns=columnas, index=pd.DatetimeIndex([], name="dia"), dtype="int64")
+
+	# Un jugador cuenta una vez por día (y por región), aunque tenga lesiones superpuestas
+	n_jugadores = int(jugadores.max()) + 1
+	claves, inicios, fines = fusionar_por_clave(codigos_region.astype(np.int64) * n_jugadores + jugadores, inicios, fines)
+
+	dia_desde = int(inicios.min())
+	dia_hasta = max(int(fines.max()), dia_hoy + 1)
+	matriz = barrer_intervalos(inicios, fines, dia_desde, dia_hasta, claves // n_jugadores, len(columnas))
+	dias = pd.date_range(pd.Timestamp(np.datetime64(dia_desde, "D")), periods=dia_hasta - dia_desde, freq="D", name="dia")
+	return pd.DataFrame(matriz.T, index=dias, columns=columnas)
+
+def obtener_lesionados_por_dia(path=DATA_PATH, hoy=None, por_region=False):
+	"""
+	Jugadores lesionados simultáneamente en cada día, desde la primera lesión hasta hoy
+	(o el último alta cargado). Con por_region=True, una columna por región (un jugador
+	con lesiones en dos regiones a la vez cuenta en ambas). Se calcula una vez por versión
+	del dataset y fecha de referencia. Solo lectura.
+	"""
+	dia_hoy = fecha_a_dia(hoy or date.today())
+	return _lesionados_por_dia(path, obtener_version_dataset(path), dia_hoy, por_region)
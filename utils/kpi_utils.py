@@ -0,0 +1,141 @@
+"""
+Motor de KPIs por jugador - Cálculo vectorizado para todo el plantel, sin Streamlit
+"""
+
+import os
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_PATH
+from utils.data_utils import obtener_indice_jugadores, obtener_posicion_evento, obtener_version_dataset
+from utils.cambios_utils import jugadores_afectados, obtener_cambios_desde
+
+# Tabla de KPIs por (archivo, fecha de referencia): {"version", "tamano", "kpis"}
+_kpis_plantel = {}
+_lock_kpis = threading.Lock()
+_MAX_ESTADOS = 8
+
+def _hoy():
+	"""Fecha de referencia para lesiones activas (hoy, sin hora)"""
+	return pd.Timestamp(date.today())
+
+def _sumar_por_rango(valores, inicios, fines):
+	"""Suma `valores` dentro de cada rango contiguo [inicio, fin) con una suma acumulada"""
+	acumulado = np.concatenate(([0], np.cumsum(valores)))
+	return acumulado[fines] - acumulado[inicios]
+
+def calcular_dias_por_evento(df, hoy):
+	"""
+	Días de cada lesión de `df`: hasta el alta, o hasta `hoy` si sigue activa
+	(nunca negativos). Vectorizado sobre arreglos de fechas de NumPy.
+	"""
+	fecha = df["fecha"].to_numpy(dtype="datetime64[D]")
+	alta = df["fecha_de_alta"].to_numpy(dtype="datetime64[D]")
+	fin_lesion = np.where(np.isnat(alta), np.datetime64(hoy.date(), "D"), alta)
+	dias = (fin_lesion - fecha).astype("int64")
+	return np.where(np.isnat(fecha), 0, np.maximum(dias, 0))
+
+def _calcular_kpis_jugadores(df, indice, jugadores, hoy):
+	"""
+	KPIs de los `jugadores` indicados en una sola pasada vectorizada: se toman solo sus
+	filas contiguas de la tabla ordenada y se suman por rango.
+	"""
+	rangos = np.array([indice[jugador] for jugador in jugadores], dtype=np.int64).reshape(-1, 2)
+	largos = rangos[:, 1] - rangos[:, 0]
+
+	if len(jugadores) == len(indice):
+		filas, inicios, fines = df, rangos[:, 0], rangos[:, 1]
+	else:
+		posiciones = np.concatenate([np.arange(inicio, fin) for inicio, fin in rangos] or [np.empty(0, np.int64)])
+		filas = df.take(posiciones)
+		fines = np.cumsum(largos)
+		inicios = fines - largos
+
+	dias_evento = calcular_dias_por_evento(filas, hoy)
+	activa = filas["fecha_de_alta"].isna().to_numpy()
+
+	return pd.DataFrame(
+		{
+			"cantidad_lesiones": largos,
+			"dias_lesionado": _sumar_por_rango(dias_evento, inicios, fines),
+			"lesiones_activas": _sumar_por_rango(activa, inicios, fines),
+		},
+		index=pd.Index(list(jugadores), name="jugador"),
+	)
+
+def calcular_kpis_plantel(path=DATA_PATH, hoy=None):
+	"""
+	KPIs de todo el plantel (un jugador por fila): cantidad_lesiones, dias_lesionado
+	y lesiones_activas. Se calculan una vez por versión del dataset y fecha de referencia;
+	ante un change set solo se recalculan los jugadores afectados. Solo lectura.
+	"""
+	hoy = _hoy() if hoy is None else pd.Timestamp(hoy).normalize()
+	version = obtener_version_dataset(path)
+
+	with _lock_kpis:
+		estado = _kpis_plantel.get((path, hoy))
+		if estado is not None and estado["version"] == version:
+			return estado["kpis"]
+
+		df, indice = obtener_indice_jugadores(path)
+		cambios = None
+		if estado is not None:
+			cambios = obtener_cambios_desde(path, estado["version"], estado["tamano"])
+
+		if cambios is not None:
+			afectados = jugadores_afectados(cambios)
+			presentes = [jugador for jugador in indice if jugador in afectados]
+			kpis = pd.concat([
+				estado["kpis"].drop(index=list(afectados), errors="ignore"),
+				_calcular_kpis_jugadores(df, indice, presentes, hoy),
+			]).sort_index()
+		else:
+			kpis = _calcular_kpis_jugadores(df, indice, list(indice), hoy)
+
+		_kpis_plantel.pop((path, hoy), None)
+		_kpis_plantel[(path, hoy)] = {"version": version, "tamano": os.stat(path).st_size, "kpis": kpis}
+		while len(_kpis_plantel) > _MAX_ESTADOS:
+			_kpis_plantel.pop(next(iter(_kpis_plantel)))
+		return kpis
+
+def obtener_kpis_jugador(jugador, path=DATA_PATH, hoy=None):
+	"""
+	KPIs de un jugador: cantidad_lesiones, dias_lesionado, lesiones_activas y
+	dias_por_evento (días de cada lesión, en el orden por fecha de obtener_lesiones_jugador).
+	"""
+	hoy = _hoy() if hoy is None else pd.Timestamp(hoy).normalize()
+	kpis = calcular_kpis_plantel(path, hoy)
+	df, indice = obtener_indice_jugadores(path)
+
+	if jugador not in indice:
+		return {
+			"cantidad_lesiones": 0,
+			"dias_lesionado": 0,
+			"lesiones_activas": 0,
+			"dias_por_evento": np.empty(0, dtype=np.int64),
+		}
+
+	inicio, fin = indice[jugador]
+	fila = kpis.loc[jugador]
+	return {
+		"cantidad_lesiones": int(fila["cantidad_lesiones"]),
+		"dias_lesionado": int(fila["dias_lesionado"]),
+		"lesiones_activas": int(fila["lesiones_activas"]),
+		"dias_por_evento": calcular_dias_por_evento(df.iloc[inicio:fin], hoy),
+	}
+
+def obtener_dias_evento(id_evento, path=DATA_PATH, hoy=None):
+	"""Días de la lesión con ese id_evento (su fila por el índice de ids)"""
+	hoy = _hoy() if hoy is None else pd.Timestamp(hoy).normalize()
+	df, _ = obtener_indice_jugadores(path)
+	posicion = obtener_posicion_evento(id_evento, path)
+	return int(calcular_dias_por_evento(df.iloc[posicion:posicion + 1], hoy)[0])
+
+
+if __name__ == "__main__":
+	# Uso desde scripts: python -m utils.kpi_utils [ruta_csv]
+	import sys
+	print(calcular_kpis_plantel(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH).to_csv())
@@ -0,0 +1,61 @@
+"""
+Utilidades de particiones - Archivo histórico por temporada y categoría
+
+Cada partición es un dataset limpio independiente (CSV + snapshot Arrow + change set):
+	data/particiones/temporada=2025/categoria=primera/lesiones_clean.csv
+Como todos los caches del dashboard están indexados por ruta, al elegir una partición
+solo se lee (y se cachea) esa: abrir la temporada actual de primera cuesta lo mismo
+aunque el archivo tenga muchas temporadas y categorías.
+"""
+
+import os
+
+from config.settings import PARTICIONES_DIR, CATEGORIAS, CATEGORIA_POR_DEFECTO
+
+NOMBRE_ARCHIVO = "lesiones_clean.csv"
+
+def ruta_particion(temporada, categoria, base=PARTICIONES_DIR):
+	"""Ruta del CSV limpio de la partición (temporada, categoría)"""
+	return os.path.join(base, f"temporada={int(temporada)}", f"categoria={categoria}", NOMBRE_ARCHIVO)
+
+def _valor_clave(nombre, clave):
+	"""Valor de un directorio 'clave=valor' (None si no corresponde)"""
+	prefijo = f"{clave}="
+	return nombre[len(prefijo):] if nombre.startswith(prefijo) else None
+
+def listar_particiones(base=PARTICIONES_DIR):
+	"""
+	Particiones disponibles {(temporada, categoría): ruta}, de la temporada más reciente
+	a la más antigua y con las categorías en el orden de CATEGORIAS.
+	Solo recorre los nombres de directorio (no abre ningún archivo).
+	"""
+	particiones = {}
+	if not os.path.isdir(base):
+		return particiones
+
+	for directorio_temporada in os.scandir(base):
+		temporada = _valor_clave(directorio_temporada.name, "temporada")
+		if not directorio_temporada.is_dir() or temporada is None or not temporada.isdigit():
+			continue
+		for directorio_categoria in os.scandir(directorio_temporada.path):
+			categoria = _valor_clave(directorio_categoria.name, "categoria")
+			ruta = os.path.join(directorio_categoria.path, NOMBRE_ARCHIVO)
+			if categoria is not None and os.path.isfile(ruta):
+				particiones[(int(temporada), categoria)] = ruta
+
+	orden_categorias = {categoria: posicion for posicion, categoria in enumerate(CATEGORIAS)}
+	return dict(sorted(
+		particiones.items(),
+		key=lambda item: (-item[0][0], orden_categorias.get(item[0][1], len(orden_categorias)), item[0][1]),
+	))
+
+def particion_por_defecto(particiones):
+	"""Temporada más reciente de CATEGORIA_POR_DEFECTO (o la primera disponible), o None"""
+	for temporada, categoria in particiones:
+		if categoria == CATEGORIA_POR_DEFECTO:
+			return temporada, categoria
+	return next(iter(particiones), None)
+
+def temporada_de(fechas):
+	"""Temporada de cada lesión: el año calendario de su fecha de inicio"""
+	return fechas.dt.year
@@ -0,0 +1,152 @@
+"""
+Utilidades de profiling - Tiempos por sección de cada rerun (modo opcional)
+
+Se activa con la variable de entorno LESIONES_PROFILING o el query parameter
+?profiling=... con uno de estos valores:
+- "1" / "tiempos": tiempos por sección en el sidebar y en el archivo de trazas
+- "cprofile": además guarda un dump de cProfile por rerun (abrir con pstats o snakeviz)
+
+cProfile solo registra el hilo en el que se activa. Los cálculos que el render
+progresivo lanza en su pool de hilos (carga del dataset, figuras, KPIs) se perfilan
+con perfilar_hilo() en cada hilo y se suman al dump del rerun que los lanzó.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+import streamlit as st
+
+from config.settings import PROFILING_DIR
+
+TRAZAS_PATH = os.path.join(PROFILING_DIR, "trazas.jsonl")
+
+# Perfil en curso del rerun actual (cada rerun corre en el hilo del script de su sesión)
+_en_curso = threading.local()
+
+def modo_profiling():
+	"""Devuelve None (desactivado), 'tiempos' o 'cprofile'"""
+	try:
+		valor = st.query_params.get("profiling") or os.environ.get("LESIONES_PROFILING", "")
+	except Exception:
+		valor = os.environ.get("LESIONES_PROFILING", "")
+	valor = str(valor).strip().lower()
+	if valor in ("", "0", "false", "no"):
+		return None
+	return "cprofile" if valor == "cprofile" else "tiempos"
+
+def iniciar_perfil(nombre, anidar=False):
+	"""
+	Inicia el perfil de un rerun (o de un rerun parcial de fragmento).
+	Con anidar=True, si ya hay un perfil en curso en este hilo (el fragmento durante un
+	rerun completo) se reutiliza y sus secciones quedan dentro del perfil principal.
+	Devuelve None si el profiling está desactivado.
+	"""
+	actual = getattr(_en_curso, "perfil", None)
+	if anidar and actual is not None:
+		return actual
+	if actual is not None and actual["_profiler"] is not None:
+		actual["_profiler"].disable()  # Rerun anterior interrumpido antes de finalizar
+
+	modo = modo_profiling()
+	if modo is None:
+		return None
+
+	perfil = {
+		"nombre": nombre,
+		"inicio": datetime.now().isoformat(timespec="milliseconds"),
+		"modo": modo,
+		"secciones": [],
+		"_t0": time.perf_counter(),
+		"_profiler": cProfile.Profile() if modo == "cprofile" else None,
+		"_hilos": [],
+	}
+	if perfil["_profiler"] is not None:
+		perfil["_profiler"].enable()
+	_en_curso.perfil = perfil
+	return perfil
+
+@contextmanager
+def _medir(perfil, seccion):
+	inicio = time.perf_counter()
+	try:
+		yield
+	finally:
+		perfil["secciones"].append({"seccion": seccion, "ms": round((time.perf_counter() - inicio) * 1000, 2)})
+
+def medir(perfil, seccion):
+	"""Context manager que mide una sección (no hace nada si el perfil es None)"""
+	return nullcontext() if perfil is None else _medir(perfil, seccion)
+
+@contextmanager
+def _perfilar_hilo(perfil):
+	profiler = cProfile.Profile()
+	try:
+		profiler.enable()
+	except ValueError:
+		# Python 3.12+: cProfile usa sys.monitoring, global al proceso; el profiler del
+		# rerun ya registra este hilo
+		yield
+		return
+	try:
+		yield
+	finally:
+		profiler.disable()
+		perfil["_hilos"].append(profiler)
+
+def perfilar_hilo(perfil):
+	"""
+	Context manager para un cálculo que corre en otro hilo: con modo cprofile lo perfila
+	y lo suma al dump de `perfil` al finalizarlo (no hace nada en los otros modos).
+	"""
+	return nullcontext() if perfil is None or perfil["_profiler"] is None else _perfilar_hilo(perfil)
+
+def finalizar_perfil(perfil, nombre):
+	"""
+	Cierra el perfil si fue iniciado con ese `nombre`: registra el total, agrega una
+	línea al archivo de trazas y guarda el dump de cProfile si corresponde.
+	"""
+	if perfil is None or perfil["nombre"] != nombre:
+		return perfil
+
+	perfil["total_ms"] = round((time.perf_counter() - perfil["_t0"]) * 1000, 2)
+	_en_curso.perfil = None
+
+	os.makedirs(PROFILING_DIR, exist_ok=True)
+	profiler = perfil["_profiler"]
+	if profiler is not None:
+		profiler.disable()
+		marca = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+		perfil["dump"] = os.path.join(PROFILING_DIR, f"{nombre}-{marca}.prof")
+		# Hilo del script más los hilos de cálculo del rerun (ya terminados al mostrarse)
+		estadisticas = pstats.Stats(profiler)
+		for profiler_hilo in list(perfil["_hilos"]):
+			estadisticas.add(profiler_hilo)
+		perfil["hilos_perfilados"] = len(perfil["_hilos"])
+		estadisticas.dump_stats(perfil["dump"])
+
+	registro = {clave: valor for clave, valor in perfil.items() if not clave.startswith("_")}
+	with open(TRAZAS_PATH, "a", encoding="utf-8") as archivo:
+		archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+	return perfil
+
+def mostrar_perfil_sidebar(perfil):
+	"""Desglose de tiempos del último rerun en un expander del sidebar"""
+	if perfil is None:
+		return
+
+	with st.sidebar.expander(f"⏱️ Profiling: {perfil.get('total_ms', 0):.0f} ms", expanded=False):
+		for seccion in perfil["secciones"]:
+			st.markdown(
+				f"<div style='display:flex; justify-content:space-between; font-size:13px;'>"
+				f"<span>{seccion['seccion']}</span><span>{seccion['ms']:.1f} ms</span></div>",
+				unsafe_allow_html=True
+			)
+		st.caption(f"Trazas: {TRAZAS_PATH}")
+		if perfil.get("dump"):
+			st.caption(f"cProfile: {perfil['dump']} (incluye {perfil['hilos_perfilados']} hilos de cálculo)")
@@ -0,0 +1,78 @@
+"""
+Ranking de jugadores filtrable - Top N por región, tipo de lesión y rango de fechas
+
+Sin filtros, el ranking por cantidad de lesiones es el de los conteos por jugador
+(obtener_ranking_jugadores). Con filtros, el top N lo resuelve el backend
+(obtener_top_filtrado):
+- pandas: un cubo jugador × región × tipo de lesión mantenido incrementalmente con los
+  change sets; filtrar por región o tipo es sumar celdas. Con un rango de fechas se
+  recorta por búsqueda binaria el tramo de lesiones ordenadas por inicio.
+- sqlite: filtros, agrupado por jugador, orden y límite en una sola consulta.
+"""
+
+from collections import OrderedDict
+from datetime import date
+from functools import lru_cache
+
+import pandas as pd
+
+from config.settings import DATA_PATH
+from utils.data_utils import obtener_version_dataset
+from utils.fuente_utils import (
+	obtener_conteos_diarios,
+	obtener_conteos_region,
+	obtener_conteos_tipo,
+	obtener_ranking_jugadores,
+	obtener_top_filtrado,
+)
+
+# Métricas del ranking (clave -> nombre visible)
+METRICAS = OrderedDict([
+	("cantidad_lesiones", "Cantidad de lesiones"),
+	("dias_perdidos", "Días perdidos"),
+])
+
+def _fecha(valor):
+	"""date de un date, Timestamp o string"""
+	return valor if type(valor) is date else pd.Timestamp(valor).date()
+
+@lru_cache(maxsize=8)
+def _opciones(path, version):
+	"""Regiones y tipos de lesión presentes, y primera y última fecha de inicio"""
+	dias = obtener_conteos_diarios(path).index
+	primera, ultima = (dias[0].date(), dias[-1].date()) if len(dias) else (None, None)
+	return obtener_conteos_region(path).index.tolist(), obtener_conteos_tipo(path).index.tolist(), primera, ultima
+
+def obtener_opciones_ranking(path=DATA_PATH):
+	"""Regiones y tipos de lesión disponibles, y primera y última fecha de inicio"""
+	return _opciones(path, obtener_version_dataset(path))
+
+def obtener_ranking_filtrado(
+	path=DATA_PATH, n=10, metrica="cantidad_lesiones",
+	regiones=None, tipos=None, desde=None, hasta=None, hoy=None,
+):
+	"""
+	Top `n` de jugadores por `metrica` entre sus lesiones de las `regiones` y `tipos`
+	indicados (None: sin filtrar) iniciadas entre `desde` y `hasta` (inclusive; None:
+	sin límite; un límite que abarca todas las fechas de inicio no filtra). Desempate
+	alfabético, como el ranking sin filtros. Los días perdidos de las lesiones activas
+	se cuentan hasta `hoy`.
+	"""
+	if metrica not in METRICAS:
+		raise ValueError(f"⚠️ Métrica desconocida: {metrica!r} (usar {', '.join(METRICAS)})")
+
+	# Un límite que abarca todas las fechas de inicio no filtra
+	_, _, primera, ultima = obtener_opciones_ranking(path)
+	desde = None if desde is None or primera is None or _fecha(desde) <= primera else _fecha(desde)
+	hasta = None if hasta is None or ultima is None or _fecha(hasta) >= ultima else _fecha(hasta)
+
+	if metrica == "cantidad_lesiones" and regiones is None and tipos is None and desde is None and hasta is None:
+		return obtener_ranking_jugadores(path, n).rename(metrica)
+
+	return obtener_top_filtrado(
+		path, n, metrica,
+		None if regiones is None else tuple(sorted(regiones)),
+		None if tipos is None else tuple(sorted(tipos)),
+		desde, hasta,
+		_fecha(hoy or date.today()) if metrica == "dias_perdidos" else None,
+	)
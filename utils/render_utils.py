@@ -0,0 +1,69 @@
+"""
+Render progresivo - Cálculos del rerun en paralelo y secciones que se pintan al estar listas
+
+Al comienzo del rerun se lanza en un pool de hilos la carga del dataset y, detrás de
+ella, cada cálculo independiente (figuras, KPIs, índices). Las secciones ocupan su lugar
+en la página con un hueco de carga y se dibujan, en el hilo del script, apenas terminan
+sus cálculos: al llamarse, los mostrar_* encuentran el resultado en sus caches.
+Los hilos solo calculan; nunca llaman a Streamlit.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import streamlit as st
+
+from utils.profiling_utils import medir, perfilar_hilo
+
+def _en_hilo(funcion, args, perfil, nombre):
+	"""Ejecuta funcion(*args) en un hilo del pool, medida y (en modo cprofile) perfilada"""
+	with medir(perfil, f"hilo:{nombre}"), perfilar_hilo(perfil):
+		return funcion(*args)
+
+def _tras_carga(carga, funcion, args, perfil, nombre):
+	"""Ejecuta funcion(*args) cuando terminó la carga del dataset (su error se ignora aquí)"""
+	carga.exception()
+	return _en_hilo(funcion, args, perfil, nombre)
+
+def lanzar_calculos(carga, tareas, perfil=None):
+	"""
+	Lanza `carga` (función, args) y luego las `tareas` {nombre: (función, args)} en un
+	pool de hilos propio del rerun; las tareas esperan a la carga para no leer el dataset
+	varias veces a la vez. Devuelve {nombre: Future}.
+	Un error en un hilo no se propaga: la sección vuelve a calcular al mostrarse y lo
+	informa como siempre.
+	"""
+	pool = ThreadPoolExecutor(max_workers=len(tareas) + 1, thread_name_prefix="render")
+	funcion_carga, args_carga = carga
+	futuro_carga = pool.submit(_en_hilo, funcion_carga, args_carga, perfil, "dataset")
+	futuros = {
+		nombre: pool.submit(_tras_carga, futuro_carga, funcion, args, perfil, nombre)
+		for nombre, (funcion, args) in tareas.items()
+	}
+	# Los hilos terminan solos al vaciarse la cola; el rerun no espera al pool
+	pool.shutdown(wait=False)
+	return futuros
+
+def crear_hueco(alto=450):
+	"""Lugar de una sección en la página, con un esqueleto de carga del alto que ocupará"""
+	hueco = st.empty()
+	hueco.markdown(f"<div class='seccion-cargando' style='height:{alto}px;'></div>", unsafe_allow_html=True)
+	return hueco
+
+def mostrar_al_completar(secciones, futuros, perfil=None):
+	"""
+	Dibuja cada sección en su hueco apenas terminan sus cálculos, en el orden en que
+	terminan. `secciones`: lista de (nombre, hueco, [cálculos], función sin argumentos).
+	"""
+	pendientes = list(secciones)
+	while pendientes:
+		listas = [seccion for seccion in pendientes if all(futuros[nombre].done() for nombre in seccion[2])]
+		if not listas:
+			esperando = {futuros[nombre] for seccion in pendientes for nombre in seccion[2] if not futuros[nombre].done()}
+			wait(esperando, return_when=FIRST_COMPLETED)
+			continue
+
+		for seccion in listas:
+			nombre, hueco, _, mostrar = seccion
+			with hueco.container(), medir(perfil, nombre):
+				mostrar()
+			pendientes.remove(seccion)
@@ -0,0 +1,393 @@
+"""
+Backend SQLite - Consultas indexadas sobre una base local derivada del CSV limpio
+
+La base vive junto al CSV (mismo nombre, extensión .sqlite) y se reconstruye cuando
+cambia la versión del CSV. Las lesiones se guardan ordenadas por (jugador, fecha) (su
+posición es la clave primaria, `orden`) con el id_evento derivado de la huella de la
+fila (el mismo que el backend pandas) como clave única, e índices sobre
+(jugador, fecha), fecha y region. Cada consulta lee solo las filas que necesita:
+las del jugador, los conteos agrupados o el top N del ranking.
+
+Las conexiones son de solo lectura y se reutilizan desde un pool por proceso del
+servidor; cada conexión la usa un único hilo a la vez.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_PATH, COLUMNAS_FECHA, SQLITE_EXT, SQLITE_POOL
+from utils.data_utils import TIPO_FECHA, TIPO_DIAS, aplicar_esquema, obtener_version_dataset, _orden_jugador_fecha
+from utils.cambios_utils import calcular_ids_evento
+from utils.kpi_utils import _hoy, calcular_dias_por_evento
+
+COLUMNAS = [
+	"jugador", "fecha", "fecha_de_alta", "tipo_de_lesion", "region",
+	"diagnostico", "lateralidad", "dias_fuera", "jugador_original",
+]
+
+_ESQUEMA = """
+CREATE TABLE lesiones (
+	orden INTEGER PRIMARY KEY,
+	id_evento INTEGER NOT NULL UNIQUE,
+	jugador TEXT,
+	fecha TEXT,
+	fecha_de_alta TEXT,
+	tipo_de_lesion TEXT,
+	region TEXT,
+	diagnostico TEXT,
+	lateralidad TEXT,
+	dias_fuera INTEGER,
+	jugador_original TEXT
+);
+CREATE TABLE meta (clave TEXT PRIMARY KEY, valor TEXT);
+"""
+
+_INDICES = """
+CREATE INDEX idx_lesiones_jugador_fecha ON lesiones (jugador, fecha);
+CREATE INDEX idx_lesiones_fecha ON lesiones (fecha);
+CREATE INDEX idx_lesiones_region ON lesiones (region);
+"""
+
+# Misma etiqueta que data_utils ('YYYY-MM-DD — <tipo_de_lesion> (<region>)'; nulos como 'nan')
+_ETIQUETA = "COALESCE(fecha, '') || ' — ' || COALESCE(tipo_de_lesion, 'nan') || ' (' || COALESCE(region, 'nan') || ')'"
+
+# Versión del esquema de la base: una base de otro esquema se reconstruye aunque el CSV no cambie
+_VERSION_ESQUEMA = "2"
+
+# Máximo de parámetros por consulta IN (...) (límite de variables de SQLite)
+_LOTE_IDS = 900
+
+# Pool por base: {"version", "libres": LifoQueue de conexiones}
+_pools = {}
+_lock_pools = threading.Lock()
+
+def ruta_sqlite(path=DATA_PATH):
+	"""Ruta de la base SQLite que acompaña al CSV (mismo nombre, extensión .sqlite)"""
+	return os.path.splitext(path)[0] + SQLITE_EXT
+
+def _version_base(destino):
+	"""Versión del CSV con la que se construyó la base (None si no existe o no se puede leer)"""
+	if not os.path.exists(destino):
+		return None
+	try:
+		conexion = sqlite3.connect(f"file:{destino}?mode=ro", uri=True)
+		try:
+			meta = dict(conexion.execute("SELECT clave, valor FROM meta").fetchall())
+		finally:
+			conexion.close()
+	except sqlite3.Error:
+		return None
+	return meta.get("version_fuente") if meta.get("esquema") == _VERSION_ESQUEMA else None
+
+def escribir_sqlite(path=DATA_PATH):
+	"""
+	Paso de ingesta: construye la base SQLite a partir del CSV, con las filas ordenadas
+	por (jugador, fecha) y los índices de las consultas del dashboard. Se escribe en un
+	archivo temporal y se reemplaza de forma atómica.
+	"""
+	version = obtener_version_dataset(path)
+	df = aplicar_esquema(pd.read_csv(path, parse_dates=COLUMNAS_FECHA))
+	df = df.take(_orden_jugador_fecha(df)).reset_index(drop=True)
+
+	filas = pd.DataFrame({"orden": np.arange(len(df), dtype=np.int64), "id_evento": calcular_ids_evento(df)})
+	for columna in COLUMNAS:
+		serie = df[columna] if columna in df.columns else pd.Series(None, index=df.index, dtype=object)
+		if columna in COLUMNAS_FECHA:
+			serie = serie.dt.strftime("%Y-%m-%d")
+		filas[columna] = serie.astype(object).where(serie.notna(), None)
+
+	destino = ruta_sqlite(path)
+	temporal = f"{destino}.{os.getpid()}.tmp"
+	if os.path.exists(temporal):
+		os.remove(temporal)
+	conexion = sqlite3.connect(temporal)
+	try:
+		conexion.executescript(_ESQUEMA)
+		conexion.executemany(
+			f"INSERT INTO lesiones (orden, id_evento, {', '.join(COLUMNAS)}) VALUES ({', '.join('?' * (len(COLUMNAS) + 2))})",
+			filas.itertuples(index=False, name=None),
+		)
+		conexion.executescript(_INDICES)
+		conexion.execute("INSERT INTO meta VALUES ('version_fuente', ?)", (version,))
+		conexion.execute("INSERT INTO meta VALUES ('esquema', ?)", (_VERSION_ESQUEMA,))
+		conexion.commit()
+		conexion.execute("ANALYZE")
+	finally:
+		conexion.close()
+	os.replace(temporal, destino)
+	return destino
+
+def _obtener_pool(path):
+	"""
+	Pool de conexiones de la base para la versión actual del CSV. Si la base falta o
+	quedó desactualizada se reconstruye una vez; las conexiones a la versión anterior
+	se cierran a medida que se liberan.
+	"""
+	version = obtener_version_dataset(path)
+	destino = ruta_sqlite(path)
+	with _lock_pools:
+		pool = _pools.get(destino)
+		if pool is not None and pool["version"] == version:
+			return pool
+
+		if _version_base(destino) != version:
+			escribir_sqlite(path)
+
+		if pool is not None:
+			_cerrar_libres(pool)
+		pool = {"version": version, "destino": destino, "libres": queue.LifoQueue()}
+		_pools[destino] = pool
+		return pool
+
+def _cerrar_libres(pool):
+	"""Cierra las conexiones ociosas de un pool reemplazado"""
+	while True:
+		try:
+			pool["libres"].get_nowait().close()
+		except queue.Empty:
+			return
+
+@contextmanager
+def _conexion(path):
+	"""Conexión de solo lectura tomada del pool (se devuelve al terminar)"""
+	pool = _obtener_pool(path)
+	try:
+		conexion = pool["libres"].get_nowait()
+	except queue.Empty:
+		conexion = sqlite3.connect(f"file:{pool['destino']}?mode=ro", uri=True, check_same_thread=False)
+	try:
+		yield conexion
+	finally:
+		if _pools.get(pool["destino"]) is pool and pool["libres"].qsize() < SQLITE_POOL:
+			pool["libres"].put(conexion)
+		else:
+			conexion.close()
+
+def _consultar(path, sql, parametros=()):
+	"""
+	Ejecuta una consulta de pocas filas y la devuelve como DataFrame con fechas y
+	dias_fuera tipados (los textos quedan como strings: categorizar un resultado
+	chico cuesta más que lo que ahorra).
+	"""
+	with _conexion(path) as conexion:
+		cursor = conexion.execute(sql, parametros)
+		df = pd.DataFrame.from_records(cursor.fetchall(), columns=[columna[0] for columna in cursor.description])
+	for columna in COLUMNAS_FECHA:
+		if columna in df.columns:
+			df[columna] = pd.to_datetime(df[columna], format="%Y-%m-%d").astype(TIPO_FECHA)
+	if "dias_fuera" in df.columns:
+		df["dias_fuera"] = pd.to_numeric(df["dias_fuera"]).astype(TIPO_DIAS)
+	return df
+
+# ========= JUGADORES Y EVENTOS ==========
+
+def listar_jugadores(path=DATA_PATH):
+	"""Lista ordenada de jugadores con al menos una lesión (recorre solo el índice)"""
+	with _conexion(path) as conexion:
+		filas = conexion.execute(
+			"SELECT DISTINCT jugador FROM lesiones WHERE jugador IS NOT NULL ORDER BY jugador"
+		).fetchall()
+	return [jugador for (jugador,) in filas]
+
+def obtener_lesiones_jugador(jugador, path=DATA_PATH):
+	"""Lesiones del jugador ordenadas por fecha (búsqueda por el índice (jugador, fecha))"""
+	return _consultar(
+		path,
+		f"SELECT {', '.join(COLUMNAS)}, id_evento, {_ETIQUETA} AS evento_lesion "
+		"FROM lesiones WHERE jugador = ? ORDER BY orden",
+		(jugador,),
+	)
+
+def obtener_evento(id_evento, path=DATA_PATH):
+	"""Fila de la lesión con ese id_evento (búsqueda por su clave única; KeyError si no existe)"""
+	df = _consultar(
+		path,
+		f"SELECT {', '.join(COLUMNAS)}, id_evento, {_ETIQUETA} AS evento_lesion FROM lesiones WHERE id_evento = ?",
+		(int(id_evento),),
+	)
+	if df.empty:
+		raise KeyError(id_evento)
+	return df.iloc[0]
+
+def obtener_etiqueta_evento(id_evento, path=DATA_PATH):
+	"""Etiqueta 'YYYY-MM-DD — <tipo_de_lesion> (<region>)' del evento"""
+	with _conexion(path) as conexion:
+		fila = conexion.execute(f"SELECT {_ETIQUETA} FROM lesiones WHERE id_evento = ?", (int(id_evento),)).fetchone()
+	return fila[0] if fila else None
+
+def obtener_eventos(ids, path=DATA_PATH):
+	"""Filas de varias lesiones por id_evento, sin repetidos y ordenadas por (jugador, fecha)"""
+	ids = np.unique(np.asarray(ids, dtype=np.int64)).tolist()
+	consulta = f"SELECT {', '.join(COLUMNAS)}, id_evento, {_ETIQUETA} AS evento_lesion, orden FROM lesiones WHERE id_evento IN "
+	partes = [
+		_consultar(path, consulta + f"({', '.join('?' * len(lote))})", lote)
+		for lote in (ids[inicio:inicio + _LOTE_IDS] for inicio in range(0, len(ids), _LOTE_IDS))
+	]
+	if not partes:
+		return _consultar(path, consulta + "() ").drop(columns="orden")
+	# Cada lote llega en su orden: el orden (jugador, fecha) se restablece al unirlos
+	return pd.concat(partes).sort_values("orden", kind="stable").drop(columns="orden").reset_index(drop=True)
+
+def obtener_intervalos_eventos(path=DATA_PATH):
+	"""id_evento, jugador, region, tipo_de_lesion, fecha y fecha_de_alta de todas las lesiones (índices, líneas de tiempo y ranking)"""
+	return _consultar(
+		path, "SELECT id_evento, jugador, region, tipo_de_lesion, fecha, fecha_de_alta FROM lesiones ORDER BY orden"
+	)
+
+# ========= KPIs ==========
+
+def _fechas(path, sql, parametros):
+	"""Solo las columnas de fecha de la consulta, como arreglos datetime64 (sin DataFrame de SQL)"""
+	with _conexion(path) as conexion:
+		filas = conexion.execute(sql, parametros).fetchall()
+	fecha, alta = zip(*filas) if filas else ((), ())
+	return pd.DataFrame({
+		"fecha": pd.to_datetime(pd.Series(fecha, dtype=object)),
+		"fecha_de_alta": pd.to_datetime(pd.Series(alta, dtype=object)),
+	})
+
+def obtener_kpis_jugador(jugador, path=DATA_PATH, hoy=None):
+	"""KPIs del jugador calculados sobre las fechas de sus filas (mismas claves que kpi_utils)"""
+	hoy = _hoy() if hoy is None else pd.Timestamp(hoy).normalize()
+	fechas = _fechas(
+		path, "SELECT fecha, fecha_de_alta FROM lesiones WHERE jugador = ? ORDER BY orden", (jugador,)
+	)
+	dias_por_evento = calcular_dias_por_evento(fechas, hoy)
+	return {
+		"cantidad_lesiones": len(fechas),
+		"dias_lesionado": int(dias_por_evento.sum()),
+		"lesiones_activas": int(fechas["fecha_de_alta"].isna().sum()),
+		"dias_por_evento": dias_por_evento,
+	}
+
+def obtener_dias_evento(id_evento, path=DATA_PATH, hoy=None):
+	"""Días de la lesión con ese id_evento"""
+	hoy = _hoy() if hoy is None else pd.Timestamp(hoy).normalize()
+	fechas = _fechas(path, "SELECT fecha, fecha_de_alta FROM lesiones WHERE id_evento = ?", (int(id_evento),))
+	if fechas.empty:
+		raise KeyError(id_evento)
+	return int(calcular_dias_por_evento(fechas, hoy)[0])
+
+# ========= CONTEOS ==========
+
+def obtener_conteos_mensuales(path=DATA_PATH):
+	"""Lesiones por mes con calendario completo, agrupadas sobre el índice de fecha"""
+	with _conexion(path) as conexion:
+		filas = conexion.execute(
+			"SELECT substr(fecha, 1, 7) AS mes, COUNT(*) FROM lesiones "
+			"WHERE fecha IS NOT NULL GROUP BY mes ORDER BY mes"
+		).fetchall()
+
+	if not filas:
+		return pd.Series(dtype="int64", index=pd.DatetimeIndex([], name="mes"), name="cantidad_lesiones")
+	meses = pd.to_datetime([f"{mes}-01" for mes, _ in filas])
+	conteos = pd.Series([cantidad for _, cantidad in filas], index=meses, dtype="int64", name="cantidad_lesiones")
+	calendario = pd.date_range(meses.min(), meses.max(), freq="MS", name="mes")
+	return conteos.reindex(calendario, fill_value=0)
+
+def obtener_conteos_diarios(path=DATA_PATH):
+	"""Lesiones iniciadas por día con calendario completo, agrupadas sobre el índice de fecha"""
+	with _conexion(path) as conexion:
+		filas = conexion.execute(
+			"SELECT fecha, COUNT(*) FROM lesiones WHERE fecha IS NOT NULL GROUP BY fecha ORDER BY fecha"
+		).fetchall()
+
+	if not filas:
+		return pd.Series(dtype="int64", index=pd.DatetimeIndex([], name="dia"), name="cantidad_lesiones")
+	dias = pd.to_datetime([dia for dia, _ in filas], format="%Y-%m-%d")
+	conteos = pd.Series([cantidad for _, cantidad in filas], index=dias, dtype="int64", name="cantidad_lesiones")
+	calendario = pd.date_range(dias.min(), dias.max(), freq="D", name="dia")
+	return conteos.reindex(calendario, fill_value=0)
+
+def _conteos_por(path, columna):
+	"""Cantidad de lesiones por valor de `columna` (sin nulos), ordenada por clave"""
+	with _conexion(path) as conexion:
+		filas = conexion.execute(
+			f"SELECT {columna}, COUNT(*) FROM lesiones WHERE {columna} IS NOT NULL GROUP BY {columna} ORDER BY {columna}"
+		).fetchall()
+	return pd.Series(
+		[cantidad for _, cantidad in filas],
+		index=pd.Index([clave for clave, _ in filas], dtype=object, name=columna),
+		dtype="int64",
+		name="cantidad_lesiones",
+	)
+
+def obtener_conteos_jugador(path=DATA_PATH):
+	"""Cantidad de lesiones por jugador (agrupada sobre el índice (jugador, fecha))"""
+	return _conteos_por(path, "jugador")
+
+def obtener_conteos_region(path=DATA_PATH):
+	"""Cantidad de lesiones por región corporal (agrupada sobre el índice de region)"""
+	return _conteos_por(path, "region")
+
+def obtener_conteos_tipo(path=DATA_PATH):
+	"""Cantidad de lesiones por tipo de lesión"""
+	return _conteos_por(path, "tipo_de_lesion")
+
+def obtener_ranking_jugadores(path=DATA_PATH, n=10):
+	"""Top `n` de jugadores por cantidad de lesiones (desempate alfabético)"""
+	with _conexion(path) as conexion:
+		filas = conexion.execute(
+			"SELECT jugador, COUNT(*) AS cantidad FROM lesiones WHERE jugador IS NOT NULL "
+			"GROUP BY jugador ORDER BY cantidad DESC, jugador LIMIT ?",
+			(int(n),),
+		).fetchall()
+	return pd.Series(
+		[cantidad for _, cantidad in filas],
+		index=pd.Index([jugador for jugador, _ in filas], dtype=object, name="jugador"),
+		dtype="int64",
+		name="cantidad_lesiones",
+	)
+
+def obtener_top_filtrado(
+	path=DATA_PATH, n=10, metrica="cantidad_lesiones",
+	regiones=None, tipos=None, desde=None, hasta=None, hoy=None,
+):
+	"""
+	Top `n` de jugadores por `metrica` con filtros ya normalizados (ver
+	utils/ranking_utils.py): el filtro de fechas usa el índice de fecha y el agrupado,
+	el orden y el límite quedan en SQL. Desempate alfabético.
+	"""
+	condiciones, parametros = ["jugador IS NOT NULL"], []
+	for columna, elegidos in (("region", regiones), ("tipo_de_lesion", tipos)):
+		if elegidos is not None:
+			condiciones.append(f"{columna} IN ({', '.join('?' * len(elegidos))})" if elegidos else "0")
+			parametros.extend(elegidos)
+	if desde is not None:
+		condiciones.append("fecha >= ?")
+		parametros.append(desde.isoformat())
+	if hasta is not None:
+		condiciones.append("fecha <= ?")
+		parametros.append(hasta.isoformat())
+
+	if metrica == "dias_perdidos":
+		# Como en el KPI: las lesiones activas cuentan hasta hoy; sin inicio no suman días
+		total = "SUM(MAX(CAST(julianday(COALESCE(fecha_de_alta, ?)) - julianday(fecha) AS INTEGER), 0))"
+		parametros.insert(0, hoy.isoformat())
+	else:
+		total = "COUNT(*)"
+
+	with _conexion(path) as conexion:
+		filas = conexion.execute(
+			f"SELECT jugador, {total} AS total FROM lesiones WHERE {' AND '.join(condiciones)} "
+			"GROUP BY jugador HAVING total > 0 ORDER BY total DESC, jugador LIMIT ?",
+			(*parametros, int(n)),
+		).fetchall()
+	return pd.Series(
+		[total for _, total in filas],
+		index=pd.Index([jugador for jugador, _ in filas], dtype=object, name="jugador"),
+		dtype="int64",
+		name=metrica,
+	)
+
+
+if __name__ == "__main__":
+	# Ingesta: python -m utils.sqlite_utils [ruta_csv]
+	import sys
+	print(escribir_sqlite(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH))
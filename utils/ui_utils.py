@@ -2,17 +2,11 @@
 Utilidades para interfaz de usuario
 """
 
-import base64
+import hashlib
+import os
 import streamlit as st
 from functools import lru_cache
-from config.settings import ESCUDO_PATH
-
-@lru_cache(maxsize=32)
-def get_base64_image(image_path):
-	"""Convierte imagen a base64 con cache LRU"""
-	with open(image_path, "rb") as img_file:
-		encoded = base64.b64encode(img_file.read()).decode()
-	return encoded
+from config.settings import ESCUDO_PATH, ESTILOS_PATH, STATIC_URL
 
 def inicializar_session_state():
 	"""Inicializa variables del session state"""
@@ -38,77 +32,27 @@ def configurar_tema_oscuro():
 	except:
 		pass  # Si no se puede configurar, los CSS harán el trabajo
 
-def aplicar_estilos_css():
+@lru_cache(maxsize=None)
+def url_estatico(ruta):
 	"""
-	Aplica estilos mínimos y coherentes con el tema oscuro general del dashboard.
-	No modifica los componentes de Streamlit directamente.
+	URL servida por Streamlit para un archivo de static/, con la huella del contenido
+	como query: el navegador lo cachea y solo lo vuelve a pedir cuando el archivo cambia
 	"""
-	st.markdown(
-		"""
-		<style>
-		/* Alineación general y tipografía */
-		body {
-			font-family: 'Inter', sans-serif !important;
-		}
-
-		/* Header y footer coherentes con el tema */
-		header, footer {
-			background-color: transparent !important;
-		}
-		</style>
-		""",
-		unsafe_allow_html=True
-	)
+	with open(ruta, "rb") as archivo:
+		huella = hashlib.sha1(archivo.read()).hexdigest()[:10]
+	return f"{STATIC_URL}/{os.path.basename(ruta)}?v={huella}"
 
 def crear_header_principal():
-	"""Crea el header principal de la aplicación pegado arriba con títulos destacados"""
-	escudo_base64 = get_base64_image(ESCUDO_PATH)
-	
-	# CSS para eliminar padding superior global
-	st.markdown('<style>div.block-container{padding-top: 0rem;}</style>', unsafe_allow_html=True)
-	
+	"""
+	Crea el header principal de la aplicación pegado arriba con títulos destacados.
+	La hoja de estilos del dashboard y el escudo se referencian como archivos estáticos:
+	cada rerun envía solo este bloque de HTML, no el CSS ni la imagen.
+	"""
 	st.markdown(
 		f"""
-		<style>
-		.header-container {{
-			display: flex;
-			align-items: center;
-			justify-content: center;
-			background: linear-gradient(90deg, #7f1d1d, #111827);
-			border-radius: 8px;
-			padding: 5px 0px;
-			margin-top: -25px;
-			box-shadow: 0 2px 6px rgba(0,0,0,0.3);
-			border: 1px solid rgba(220, 38, 38, 0.3);
-			gap: 15px;
-		}}
-		
-		.header-logo {{
-			width: 70px;
-			filter: drop-shadow(0 2px 4px rgba(0,0,0,0.3));
-		}}
-		
-		.header-container h1 {{
-			color: white;
-			font-size: 38px;
-			font-weight: 800;
-			margin: 2px 0px;
-			text-transform: uppercase;
-			text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
-			line-height: 1;
-		}}
-		
-		.header-container h3 {{
-			color: #d1d5db;
-			font-size: 20px;
-			font-weight: 400;
-			margin: 0px;
-			line-height: 1;
-		}}
-		</style>
-		
+		<link rel='stylesheet' href='{url_estatico(ESTILOS_PATH)}'>
 		<div class='header-container'>
-			<img src='data:image/png;base64,{escudo_base64}' class='header-logo'/>
+			<img src='{url_estatico(ESCUDO_PATH)}' class='header-logo'/>
 			<div>
 				<h1>REPORTE DE LESIONES</h1>
 				<h3>Club Atlético Colón</h3>
@@ -118,15 +62,22 @@ def crear_header_principal():
 		unsafe_allow_html=True
 	)
 
+def crear_separador(titulo, margen_superior=40):
+	"""Separador visual de sección: título en mayúsculas y línea roja degradada"""
+	st.markdown(
+		f"""
+		<p class='separador-titulo' style='margin-top:{margen_superior}px;'>{titulo}</p>
+		<hr class='separador-linea'>
+		""",
+		unsafe_allow_html=True
+	)
 
 def crear_footer():
 	"""Crea el footer de la aplicación"""
 	st.markdown("<br><br>", unsafe_allow_html=True)
 	st.markdown("""
-	<div style='background: linear-gradient(135deg, rgba(220, 38, 38, 0.9), rgba(17, 24, 39, 0.9)); 
-				padding: 15px; border-radius: 10px; text-align: center; margin-top: 40px;
-				box-shadow: 0 4px 16px rgba(0,0,0,0.2);'>
-		<p style='margin: 0; color: rgba(255,255,255,0.8); font-size: 12px;'>
+	<div class='footer-container'>
+		<p>
 			© 2025 Club Atlético Colón - Sistema desarrollado para el Staff Medico | Hechor por Agustin Carpenco v1.0
 		</p>
 	</div>